@@ -0,0 +1,111 @@
+import os
+import json
+import math
+import time
+import platform
+import subprocess
+from datetime import datetime
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BENCH_DIR, ".."))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+def time_call(func, repeat=20, warmup=2):
+    """
+    Runs func() warmup + repeat times and returns the measured
+    durations in seconds (monotonic clock).
+    """
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100.0 * len(sorted_samples)) - 1)
+    return sorted_samples[rank]
+
+
+def summarize(samples):
+    """Latency percentiles (ms) and throughput (ops/s) for one benchmark."""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(total / len(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        "ops_per_s": round(len(ordered) / total, 2) if total else 0.0,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True
+        ).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def write_results(name, results, output=None):
+    """
+    Stores results as JSON (default: Benchmarks/results/<name>_<time>_<rev>.json)
+    together with enough environment data to compare runs between commits.
+    """
+    revision = git_revision()
+    if output is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{name}_{timestamp}_{revision}.json")
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "benchmark": name,
+            "revision": revision,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }, f, indent=2)
+    return output
+
+
+def compare(results, baseline_path, metric="p50_ms"):
+    """
+    Prints current vs baseline for every benchmark present in both files.
+    Ratios above 1.0 mean the current run is slower.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    print(f"\n{'benchmark':60} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for key, current in results.items():
+        if key not in baseline or metric not in current:
+            continue
+        old = baseline[key][metric]
+        new = current[metric]
+        ratio = new / old if old else float("inf")
+        flag = "  ⚠️" if ratio > 1.10 else ""
+        print(f"{key:60} {old:10.3f} {new:10.3f} {ratio:7.2f}{flag}")
+
+
+def print_results(results):
+    print(f"\n{'benchmark':60} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>9}")
+    for key, r in results.items():
+        if "p50_ms" not in r:
+            print(f"{key:60} {r.get('skipped', '')}")
+            continue
+        print(f"{key:60} {r['p50_ms']:9.3f} {r['p95_ms']:9.3f} {r['p99_ms']:9.3f} {r['ops_per_s']:9.2f}")
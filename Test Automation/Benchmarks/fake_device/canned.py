@@ -0,0 +1,89 @@
+import os
+import json
+import argparse
+from xml.sax.saxutils import quoteattr
+
+import cv2
+
+from Benchmarks.vision_benchmark import load_templates, build_screen, OCR_TEXT
+
+
+SCREEN_PNG = "screen.png"
+HIERARCHY_XML = "window_dump.xml"
+DEVICE_JSON = "device.json"
+
+# Extra UI nodes that only exist in the hierarchy (not drawn on the screen)
+EXTRA_NODES = [
+    ("Play Store", "com.android.vending:id/title", "Play Store"),
+    ("Search", "com.android.vending:id/search_bar", "Search"),
+    ("Games", "com.android.vending:id/tab_games", "Games"),
+    ("Books", "com.android.vending:id/tab_books", "Books"),
+]
+
+
+def _text_nodes(width):
+    nodes = []
+    for i, text in enumerate(OCR_TEXT):
+        (w, h), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.6, 3)
+        y = 120 + i * 90
+        nodes.append((text, f"com.android.vending:id/text_{i}", "", (40, y - h, 40 + w, y + 8)))
+
+    top = 2000 if width >= 1080 else 1300
+    for i, (text, rid, desc) in enumerate(EXTRA_NODES):
+        x1 = 40 + (i % 2) * (width // 2)
+        y1 = top + (i // 2) * 140
+        nodes.append((text, rid, desc, (x1, y1, x1 + width // 2 - 80, y1 + 110)))
+    return nodes
+
+
+def build_hierarchy(width, height):
+    """uiautomator-style XML dump matching the canned screen."""
+    lines = [
+        "<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>",
+        '<hierarchy rotation="0">',
+        f'<node index="0" text="" resource-id="" class="android.widget.FrameLayout" '
+        f'package="com.android.vending" content-desc="" clickable="false" '
+        f'bounds="[0,0][{width},{height}]">',
+    ]
+    for i, (text, rid, desc, (x1, y1, x2, y2)) in enumerate(_text_nodes(width)):
+        lines.append(
+            f'<node index="{i}" text={quoteattr(text)} resource-id={quoteattr(rid)} '
+            f'class="android.widget.TextView" package="com.android.vending" '
+            f'content-desc={quoteattr(desc)} clickable="true" '
+            f'bounds="[{x1},{y1}][{x2},{y2}]" />'
+        )
+    lines.append("</node>")
+    lines.append("</hierarchy>")
+    return "\n".join(lines) + "\n"
+
+
+def build_canned(state_dir, width=1080, height=2400):
+    """
+    Writes the canned screenshot, hierarchy dump and device description
+    used by fake_adb.py and fake_appium_server.py into state_dir.
+    """
+    os.makedirs(state_dir, exist_ok=True)
+
+    screen, positions = build_screen(width, height, load_templates())
+    cv2.imwrite(os.path.join(state_dir, SCREEN_PNG), screen)
+
+    with open(os.path.join(state_dir, HIERARCHY_XML), "w", encoding="utf-8") as f:
+        f.write(build_hierarchy(width, height))
+
+    with open(os.path.join(state_dir, DEVICE_JSON), "w", encoding="utf-8") as f:
+        json.dump({"width": width, "height": height, "templates": positions}, f, indent=2)
+
+    return state_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build canned fake-device assets")
+    parser.add_argument("--state", required=True, help="fake device state directory")
+    parser.add_argument("--width", type=int, default=1080)
+    parser.add_argument("--height", type=int, default=2400)
+    args = parser.parse_args()
+    print(build_canned(args.state, args.width, args.height))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Fake `adb` executable for benchmarks without a physical device.
+
+Implements the subset of adb used by adb_keywords / appium_keywords:
+devices, connect, pull, push, logcat, shell / exec-out (screencap, wm size,
+input, uiautomator dump, screenrecord, getprop, settings, echo, sleep, cat, rm).
+Screens and hierarchy dumps are served from canned files (see canned.py),
+input events are appended to <state>/devices/<serial>/input.log.
+
+Environment:
+    FAKE_ADB_STATE                  state directory (required)
+    FAKE_ADB_SERIALS                comma separated serials reported by `adb devices`
+    FAKE_ADB_LATENCY_MS             latency added to every invocation
+    FAKE_ADB_SCREENCAP_LATENCY_MS   extra latency per screencap
+    FAKE_ADB_LOGCAT_INTERVAL_MS     delay between streamed logcat lines (default 50)
+"""
+
+import os
+import sys
+import time
+import shlex
+import shutil
+import signal
+
+
+STATE_DIR = os.environ.get("FAKE_ADB_STATE", "")
+SERIALS = [s for s in os.environ.get("FAKE_ADB_SERIALS", "emulator-5554").split(",") if s]
+
+PROPS = {
+    "ro.build.version.release": "13",
+    "ro.product.model": "Pixel",
+    "ro.serialno": SERIALS[0] if SERIALS else "emulator-5554",
+}
+
+
+def _latency(name, default=0.0):
+    try:
+        return float(os.environ.get(name, default)) / 1000.0
+    except ValueError:
+        return default
+
+
+def _device_root(serial):
+    return os.path.join(STATE_DIR, "devices", serial or SERIALS[0])
+
+
+def _device_path(serial, path):
+    return os.path.join(_device_root(serial), path.lstrip("/"))
+
+
+def _log_input(serial, line):
+    os.makedirs(_device_root(serial), exist_ok=True)
+    with open(os.path.join(_device_root(serial), "input.log"), "a", encoding="utf-8") as f:
+        f.write(f"{time.time():.3f} {line}\n")
+
+
+def _screen_size():
+    import json
+    with open(os.path.join(STATE_DIR, "device.json"), "r", encoding="utf-8") as f:
+        device = json.load(f)
+    return device["width"], device["height"]
+
+
+def _copy_to_device(serial, src, dst):
+    target = _device_path(serial, dst)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    shutil.copyfile(src, target)
+
+
+# ----------------------------------------------------------------------
+# Device-side commands
+# ----------------------------------------------------------------------
+def sh_screencap(serial, args, out):
+    time.sleep(_latency("FAKE_ADB_SCREENCAP_LATENCY_MS"))
+    paths = [a for a in args if not a.startswith("-")]
+    src = os.path.join(STATE_DIR, "screen.png")
+    if paths:
+        _copy_to_device(serial, src, paths[0])
+    else:
+        with open(src, "rb") as f:
+            out.buffer.write(f.read())
+    return 0
+
+
+def sh_wm(serial, args, out):
+    if args[:1] == ["size"]:
+        width, height = _screen_size()
+        out.write(f"Physical size: {width}x{height}\n")
+    return 0
+
+
+def sh_input(serial, args, out):
+    _log_input(serial, "input " + " ".join(args))
+    # Real `input swipe` blocks for its duration
+    if args[:1] == ["swipe"] and len(args) >= 6:
+        time.sleep(int(args[5]) / 1000.0)
+    return 0
+
+
+def sh_uiautomator(serial, args, out):
+    if args[:1] == ["dump"]:
+        path = args[1] if len(args) > 1 else "/sdcard/window_dump.xml"
+        _copy_to_device(serial, os.path.join(STATE_DIR, "window_dump.xml"), path)
+        out.write(f"UI hierchary dumped to: {path}\n")
+    return 0
+
+
+def sh_screenrecord(serial, args, out):
+    path = args[-1]
+    target = _device_path(serial, path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "wb") as f:
+        f.write(b"\x00\x00\x00\x18ftypmp42fake-screenrecord")
+
+    limit = 180
+    if "--time-limit" in args:
+        limit = int(args[args.index("--time-limit") + 1])
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    end = time.monotonic() + limit
+    while time.monotonic() < end:
+        time.sleep(0.1)
+    return 0
+
+
+def sh_getprop(serial, args, out):
+    if args:
+        out.write(PROPS.get(args[0], "") + "\n")
+    else:
+        for key, value in PROPS.items():
+            out.write(f"[{key}]: [{value}]\n")
+    return 0
+
+
+def sh_settings(serial, args, out):
+    if args[:1] == ["get"]:
+        out.write("null\n")
+    return 0
+
+
+def sh_echo(serial, args, out):
+    out.write(" ".join(args) + "\n")
+    return 0
+
+
+def sh_sleep(serial, args, out):
+    time.sleep(float(args[0]) if args else 0)
+    return 0
+
+
+def sh_cat(serial, args, out):
+    for path in args:
+        target = _device_path(serial, path)
+        if not os.path.isfile(target):
+            sys.stderr.write(f"cat: {path}: No such file or directory\n")
+            return 1
+        with open(target, "r", encoding="utf-8", errors="replace") as f:
+            out.write(f.read())
+    return 0
+
+
+def sh_rm(serial, args, out):
+    for path in args:
+        if path.startswith("-"):
+            continue
+        target = _device_path(serial, path)
+        if os.path.isfile(target):
+            os.remove(target)
+    return 0
+
+
+SHELL_COMMANDS = {
+    "screencap": sh_screencap,
+    "wm": sh_wm,
+    "input": sh_input,
+    "uiautomator": sh_uiautomator,
+    "screenrecord": sh_screenrecord,
+    "getprop": sh_getprop,
+    "settings": sh_settings,
+    "echo": sh_echo,
+    "sleep": sh_sleep,
+    "cat": sh_cat,
+    "rm": sh_rm,
+}
+
+
+def run_shell(serial, script, out):
+    """
+    Runs a `;` / newline separated command line, returns the last exit code.
+    `{ }` groups and `2>&1` are ignored, `$?` expands to the last exit code.
+    """
+    code = 0
+    for line in script.replace("&&", ";").replace("\n", ";").split(";"):
+        parts = [
+            p for p in shlex.split(line.replace("$?", str(code)))
+            if p not in ("{", "}", "2>&1")
+        ]
+        if not parts:
+            continue
+        handler = SHELL_COMMANDS.get(parts[0])
+        if handler:
+            code = handler(serial, parts[1:], out)
+        else:
+            sys.stderr.write(f"/system/bin/sh: {parts[0]}: inaccessible or not found\n")
+            code = 127
+    return code
+
+
+# ----------------------------------------------------------------------
+# Host-side commands
+# ----------------------------------------------------------------------
+def logcat(serial, args):
+    """Streams threadtime lines (input events first, then a heartbeat) until killed."""
+    interval = _latency("FAKE_ADB_LOGCAT_INTERVAL_MS", 50)
+    input_log = os.path.join(_device_root(serial), "input.log")
+    offset = os.path.getsize(input_log) if os.path.isfile(input_log) else 0
+    count = 0
+    while True:
+        now = time.time()
+        stamp = time.strftime("%m-%d %H:%M:%S", time.localtime(now)) + f".{int(now * 1000) % 1000:03d}"
+        if os.path.isfile(input_log):
+            with open(input_log, "r", encoding="utf-8") as f:
+                f.seek(offset)
+                for line in f:
+                    sys.stdout.write(f"{stamp}  1000  1000 I InputDispatcher: {line.split(' ', 1)[-1]}")
+                offset = f.tell()
+        count += 1
+        sys.stdout.write(f"{stamp}  4242  4242 W FakeDevice: heartbeat {count}\n")
+        sys.stdout.flush()
+        time.sleep(interval)
+
+
+def main(argv):
+    time.sleep(_latency("FAKE_ADB_LATENCY_MS"))
+
+    serial = None
+    if argv[:1] == ["-s"]:
+        serial, argv = argv[1], argv[2:]
+
+    if not argv:
+        sys.stderr.write("fake adb: no command\n")
+        return 1
+
+    cmd, args = argv[0], argv[1:]
+
+    if cmd == "devices":
+        sys.stdout.write("List of devices attached\n")
+        for s in SERIALS:
+            sys.stdout.write(f"{s}\tdevice\n")
+        return 0
+
+    if cmd == "connect":
+        sys.stdout.write(f"already connected to {args[0] if args else ''}\n")
+        return 0
+
+    if cmd in ("shell", "exec-out"):
+        return run_shell(serial, " ".join(args), sys.stdout)
+
+    if cmd == "logcat":
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        return logcat(serial, args)
+
+    if cmd == "pull":
+        src = _device_path(serial, args[0])
+        if not os.path.isfile(src):
+            sys.stderr.write(f"adb: error: remote object '{args[0]}' does not exist\n")
+            return 1
+        dst = args[1] if len(args) > 1 else os.path.basename(args[0])
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, os.path.basename(args[0]))
+        shutil.copyfile(src, dst)
+        sys.stdout.write(f"{args[0]}: 1 file pulled.\n")
+        return 0
+
+    if cmd == "push":
+        _copy_to_device(serial, args[0], args[1])
+        sys.stdout.write(f"{args[0]}: 1 file pushed.\n")
+        return 0
+
+    if cmd in ("start-server", "kill-server", "wait-for-device", "forward", "reverse"):
+        return 0
+
+    sys.stderr.write(f"fake adb: unsupported command '{cmd}'\n")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,319 @@
+"""
+Minimal W3C / Appium HTTP server for benchmarks without a physical device.
+
+Serves the canned screenshot and page source from a state directory (see
+canned.py), answers find_elements / element text from the hierarchy,
+accepts mobile: gestures, mobile: shell and W3C actions, and can add a
+configurable latency to every request. Sessions created with an
+mjpegServerPort capability also get an MJPEG stream of the canned screen.
+
+Usage (from the project root):
+    python -m Benchmarks.fake_device.fake_appium_server --state <dir> --port 4723 --latency-ms 20
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import base64
+import argparse
+import threading
+import xml.etree.ElementTree as ET
+
+import cv2
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+
+class FakeDevice:
+    """State shared by all sessions of one fake Appium server."""
+
+    def __init__(self, state_dir, latency_ms=0.0, screenshot_latency_ms=0.0):
+        self.latency = latency_ms / 1000.0
+        self.screenshot_latency = screenshot_latency_ms / 1000.0
+
+        with open(os.path.join(state_dir, "screen.png"), "rb") as f:
+            self.screenshot_b64 = base64.b64encode(f.read()).decode("ascii")
+        screen = cv2.imread(os.path.join(state_dir, "screen.png"))
+        self.screen_jpeg = cv2.imencode(".jpg", screen)[1].tobytes()
+        with open(os.path.join(state_dir, "window_dump.xml"), "r", encoding="utf-8") as f:
+            self.page_source = f.read()
+        with open(os.path.join(state_dir, "device.json"), "r", encoding="utf-8") as f:
+            device = json.load(f)
+        self.width = device["width"]
+        self.height = device["height"]
+
+        self.nodes = [n.attrib for n in ET.fromstring(self.page_source.encode("utf-8")).iter("node")]
+        self.sessions = {}
+        self.elements = {}
+        self.actions = []
+        self.stats = Counter()
+        self.lock = threading.Lock()
+        self.mjpeg_fps = 10
+        self.mjpeg_servers = {}
+
+    def start_mjpeg(self, port):
+        """MJPEG stream of the canned screen, like UiAutomator2's mjpegServer."""
+        with self.lock:
+            if port in self.mjpeg_servers:
+                return
+            handler = type("BoundMjpegHandler", (MjpegHandler,), {"device": self})
+            server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+            server.daemon_threads = True
+            self.mjpeg_servers[port] = server
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def shutdown(self):
+        for server in self.mjpeg_servers.values():
+            server.shutdown()
+            server.server_close()
+        self.mjpeg_servers.clear()
+
+    def find(self, using, value):
+        if using != "xpath":
+            key = {"id": "resource-id", "accessibility id": "content-desc"}.get(using)
+            return [i for i, n in enumerate(self.nodes) if key and n.get(key) == value]
+
+        exact = re.search(r"@(text|content-desc|resource-id)\s*=\s*['\"](.*?)['\"]", value)
+        if exact:
+            attr, wanted = exact.groups()
+            return [i for i, n in enumerate(self.nodes) if n.get(attr) == wanted]
+        if "@text" in value:
+            return [i for i, n in enumerate(self.nodes) if n.get("text", "").strip()]
+        return list(range(len(self.nodes)))
+
+
+class MjpegHandler(BaseHTTPRequestHandler):
+    device = None
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+        self.end_headers()
+        try:
+            while True:
+                jpeg = self.device.screen_jpeg
+                self.wfile.write(
+                    b"--frame\r\nContent-Type: image/jpeg\r\n"
+                    + f"Content-Length: {len(jpeg)}\r\n\r\n".encode("ascii")
+                    + jpeg + b"\r\n"
+                )
+                self.wfile.flush()
+                self.device.stats["mjpeg frame"] += 1
+                time.sleep(1.0 / max(1, self.device.mjpeg_fps))
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    device = None
+
+    def log_message(self, fmt, *args):
+        pass
+
+    # -------- plumbing --------
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send(self, value, status=200):
+        payload = json.dumps({"value": value}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _error(self, error, message, status=404):
+        self._send({"error": error, "message": message, "stacktrace": ""}, status)
+
+    def _dispatch(self, method):
+        device = self.device
+        path = self.path.split("?")[0].rstrip("/")
+        parts = [p for p in path.split("/") if p]
+
+        with device.lock:
+            device.stats[f"{method} {self._route_name(parts)}"] += 1
+        time.sleep(device.latency)
+
+        if path == "/status":
+            return self._send({"ready": True, "message": "fake appium ready", "build": {"version": "fake"}})
+        if path == "/fake/stats":
+            return self._send({"requests": dict(device.stats), "actions": len(device.actions)})
+
+        if parts[:1] != ["session"]:
+            return self._error("unknown command", path)
+
+        if len(parts) == 1 and method == "POST":
+            return self._new_session(self._body())
+
+        session_id = parts[1]
+        if session_id not in device.sessions:
+            return self._error("invalid session id", f"No session {session_id}")
+        rest = parts[2:]
+
+        if not rest:
+            if method == "DELETE":
+                device.sessions.pop(session_id, None)
+                return self._send(None)
+            return self._send(device.sessions[session_id])
+
+        return self._session_command(method, rest)
+
+    def _route_name(self, parts):
+        if parts[:1] == ["session"] and len(parts) > 2:
+            return "/".join(p for p in parts[2:] if p not in self.device.elements)
+        return "/".join(parts) or "/"
+
+    def _new_session(self, body):
+        caps = body.get("capabilities", {}).get("alwaysMatch", {})
+        session_id = uuid.uuid4().hex
+        self.device.sessions[session_id] = caps
+        if caps.get("appium:mjpegServerPort"):
+            self.device.start_mjpeg(int(caps["appium:mjpegServerPort"]))
+        return self._send({"sessionId": session_id, "capabilities": caps})
+
+    def _session_command(self, method, rest):
+        device = self.device
+        head = rest[0]
+
+        if head == "screenshot":
+            time.sleep(device.screenshot_latency)
+            return self._send(device.screenshot_b64)
+
+        if head == "source":
+            return self._send(device.page_source)
+
+        if head == "window" and method == "GET":
+            return self._send({"x": 0, "y": 0, "width": device.width, "height": device.height})
+
+        if rest == ["appium", "settings"] and method == "POST":
+            settings = self._body().get("settings", {})
+            self.device.mjpeg_fps = int(settings.get("mjpegServerFramerate", self.device.mjpeg_fps))
+            return self._send(None)
+
+        if head == "timeouts":
+            return self._send({"implicit": 0, "pageLoad": 300000, "script": 30000})
+
+        if head in ("elements", "element") and method == "POST" and len(rest) == 1:
+            body = self._body()
+            found = device.find(body.get("using"), body.get("value", ""))
+            refs = []
+            for index in found:
+                element_id = uuid.uuid4().hex
+                device.elements[element_id] = index
+                refs.append({ELEMENT_KEY: element_id})
+            if head == "element":
+                if not refs:
+                    return self._error("no such element", body.get("value", ""))
+                return self._send(refs[0])
+            return self._send(refs)
+
+        if head == "element" and len(rest) >= 3:
+            node = device.nodes[device.elements.get(rest[1], 0)]
+            prop = rest[2]
+            if prop == "text":
+                return self._send(node.get("text", ""))
+            if prop == "attribute":
+                return self._send(node.get(rest[3]) if len(rest) > 3 else None)
+            if prop == "rect":
+                x1, y1, x2, y2 = map(int, re.findall(r"\d+", node.get("bounds", "[0,0][0,0]")))
+                return self._send({"x": x1, "y": y1, "width": x2 - x1, "height": y2 - y1})
+            if prop == "click":
+                return self._send(None)
+            return self._send(None)
+
+        if head == "execute":
+            return self._execute(self._body())
+
+        if head == "actions":
+            if method == "POST":
+                actions = self._body().get("actions", [])
+                with device.lock:
+                    device.actions.append(actions)
+                self._sleep_actions(actions)
+            return self._send(None)
+
+        return self._send(None)
+
+    def _execute(self, body):
+        script = body.get("script", "")
+        args = (body.get("args") or [{}])[0] or {}
+
+        if script == "mobile: shell":
+            command = " ".join([args.get("command", "")] + [str(a) for a in args.get("args", [])])
+            return self._send({"stdout": self._shell_output(command), "stderr": "", "code": 0})
+
+        with self.device.lock:
+            self.device.actions.append({"script": script, "args": args})
+        return self._send(None)
+
+    def _shell_output(self, command):
+        if command.startswith("getprop"):
+            return "13\n"
+        if command.startswith("wm size"):
+            return f"Physical size: {self.device.width}x{self.device.height}\n"
+        return ""
+
+    def _sleep_actions(self, sources):
+        """W3C actions run tick by tick; emulate their total duration."""
+        ticks = max((len(s.get("actions", [])) for s in sources), default=0)
+        total = 0
+        for i in range(ticks):
+            total += max(
+                (s["actions"][i].get("duration", 0) for s in sources if i < len(s.get("actions", []))),
+                default=0,
+            )
+        time.sleep(total / 1000.0)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+def start_server(state_dir, port=4723, latency_ms=0.0, screenshot_latency_ms=0.0, host="127.0.0.1"):
+    """Starts the fake server on a daemon thread and returns (server, device)."""
+    device = FakeDevice(state_dir, latency_ms, screenshot_latency_ms)
+    handler = type("BoundHandler", (Handler,), {"device": device})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, device
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Appium (W3C) server")
+    parser.add_argument("--state", required=True, help="fake device state directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4723)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency added to every request")
+    parser.add_argument("--screenshot-latency-ms", type=float, default=0.0, help="extra latency per screenshot")
+    args = parser.parse_args()
+
+    server, device = start_server(args.state, args.port, args.latency_ms, args.screenshot_latency_ms, args.host)
+    print(f"Fake Appium server listening on http://{args.host}:{args.port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        device.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Import-time benchmark for the keyword libraries and the listener.
+
+Every sample is a fresh Python process: Robot Framework is imported
+first (a robot run always has it loaded), then the library import is
+timed. Also records which heavy dependencies the import pulled in and
+times a `robot --dryrun` of the suites with the project listener.
+
+Usage (from the project root):
+    python -m Benchmarks.import_benchmark
+    python -m Benchmarks.import_benchmark --repeat 10 --compare Benchmarks/results/<old>.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+from Benchmarks.bench_utils import PROJECT_ROOT, summarize, write_results, compare, print_results
+
+
+MODULES = [
+    "Keywords.adb_keywords",
+    "Keywords.appium_keywords",
+    "Configurations.auto_screen_record_listener",
+]
+HEAVY = ("cv2", "numpy", "PIL", "pytesseract", "scipy", "sounddevice", "appium", "selenium")
+LISTENER = "Configurations.auto_screen_record_listener.AutoScreenRecordingListener"
+
+PROBE = """
+import sys, json, time
+import robot.api.deco, robot.libraries.BuiltIn
+start = time.perf_counter()
+try:
+    import {module}
+    error = None
+except Exception as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "error": error,
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PROJECT_ROOT, env.get("PYTHONPATH")]))
+    return env
+
+
+def probe(module):
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+        cwd=PROJECT_ROOT, env=_env(), capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def dryrun(suites, output_dir):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [
+            sys.executable, "-m", "robot", "--dryrun",
+            "--listener", LISTENER,
+            "--outputdir", output_dir,
+            "--output", "NONE", "--log", "NONE", "--report", "NONE",
+            *suites,
+        ],
+        cwd=PROJECT_ROOT, env=_env(), capture_output=True, text=True
+    )
+    return time.perf_counter() - start, proc.returncode
+
+
+def run(repeat, suites):
+    results = {}
+
+    for module in MODULES:
+        samples, last = [], None
+        for _ in range(repeat):
+            last = probe(module)
+            samples.append(last["seconds"])
+        summary = summarize(samples)
+        summary["heavy_modules_loaded"] = last["loaded"]
+        if last["error"]:
+            summary["import_error"] = last["error"]
+        results[f"import/{module}"] = summary
+
+    with tempfile.TemporaryDirectory(prefix="import_bench_") as tmp_dir:
+        samples, rc = [], 0
+        for _ in range(max(1, repeat // 2)):
+            seconds, rc = dryrun(suites, tmp_dir)
+            samples.append(seconds)
+        summary = summarize(samples)
+        summary["robot_rc"] = rc
+        results["robot_dryrun"] = summary
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Library import-time benchmark")
+    parser.add_argument("suites", nargs="*", default=["TestSuite"], help="suites for the dry run")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh processes per module")
+    parser.add_argument("--output", help="result JSON path (default: Benchmarks/results/...)")
+    parser.add_argument("--compare", help="previous result JSON to compare p50 latency against")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.suites)
+    print_results(results)
+    for key, r in results.items():
+        if r.get("heavy_modules_loaded") or r.get("import_error"):
+            print(f"  {key}: loaded {r.get('heavy_modules_loaded')} {r.get('import_error', '')}")
+
+    path = write_results("imports", results, args.output)
+    print(f"\nResults written to {path}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+End-to-end keyword throughput benchmark against simulated devices.
+
+Starts the fake Appium server, puts the fake `adb` first on PATH, runs the
+existing TestSuite flows in-process with Robot Framework and reports
+library keywords per second, per-keyword latency and time per stage
+(from the tracing spans inside the keywords).
+
+Linux / macOS only: the fake adb is a POSIX shell wrapper
+(Benchmarks/fake_device/bin/adb), and on Windows the keywords' plain
+"adb" subprocess calls would only find an adb.exe. OCR steps additionally
+need a local tesseract installation. Location priors learned on the
+canned screens go to a scratch folder, not Logs/location_priors.
+
+Usage (from the project root):
+    python -m Benchmarks.keyword_throughput
+    python -m Benchmarks.keyword_throughput --iterations 5 --adb-latency-ms 30 --appium-latency-ms 15 \
+        TestSuite/test02.robot TestSuite/test03.robot
+"""
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import configparser
+from datetime import datetime
+
+import robot
+
+from Benchmarks.bench_utils import PROJECT_ROOT, RESULTS_DIR, write_results, compare
+from Benchmarks.fake_device.canned import build_canned
+from Benchmarks.fake_device.fake_appium_server import start_server
+from Configurations.keyword_profiler import KeywordProfiler
+from Keywords import tracing
+from Keywords.location_priors import PRIORS, PRIORS_DIR
+
+
+FAKE_BIN = os.path.join(PROJECT_ROOT, "Benchmarks", "fake_device", "bin")
+CONFIG_PATH = os.path.join(PROJECT_ROOT, "Configurations", "configurations.ini")
+DEFAULT_SUITES = ["TestSuite/test02.robot", "TestSuite/test03.robot"]
+DEVICE_LIBRARIES = ("adb_keywords", "appium_keywords")
+
+
+class ThroughputListener:
+    """Collects keyword durations and tracing spans while the suites run."""
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self):
+        self.profiler = KeywordProfiler()
+        self.stages = {}
+        self.device_keywords = 0
+        self.failed_keywords = 0
+
+    def start_test(self, data, result):
+        tracing.start_trace(data.name)
+
+    def end_test(self, data, result):
+        for event in tracing.stop_trace():
+            if event["cat"] != "keyword":
+                continue
+            total, count = self.stages.get(event["name"], (0.0, 0))
+            self.stages[event["name"]] = (total + event["dur"] / 1000.0, count + 1)
+
+    def start_keyword(self, data, result):
+        self.profiler.start()
+
+    def end_keyword(self, data, result):
+        library = getattr(result, "owner", None) or getattr(result, "libname", "")
+        self.profiler.end(result.name, library, "", result.status)
+        if library in DEVICE_LIBRARIES and result.status != "NOT RUN":
+            self.device_keywords += 1
+            if result.status == "FAIL":
+                self.failed_keywords += 1
+
+
+def dut_serials():
+    config = configparser.ConfigParser()
+    config.read(CONFIG_PATH)
+    return [
+        config[s]["device_id"] for s in config.sections()
+        if s.startswith("DUT.") and "device_id" in config[s]
+    ]
+
+
+def run(suites, iterations, adb_latency_ms, appium_latency_ms, screenshot_latency_ms, port, keep):
+    state_dir = tempfile.mkdtemp(prefix="fake_device_")
+    output_root = os.path.join(
+        RESULTS_DIR, f"throughput_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    )
+
+    build_canned(state_dir)
+    priors_dir = tempfile.mkdtemp(prefix="location_priors_")
+    PRIORS.set_directory(priors_dir)
+    server, device = start_server(state_dir, port, appium_latency_ms, screenshot_latency_ms)
+
+    os.environ["PATH"] = FAKE_BIN + os.pathsep + os.environ.get("PATH", "")
+    os.environ["FAKE_ADB_STATE"] = state_dir
+    os.environ["FAKE_ADB_SERIALS"] = ",".join(dut_serials())
+    os.environ["FAKE_ADB_LATENCY_MS"] = str(adb_latency_ms)
+    os.environ["FAKE_ADB_SCREENCAP_LATENCY_MS"] = str(screenshot_latency_ms)
+    # Point the suites at the fake server instead of appium_server_url from configurations.ini
+    os.environ["APPIUM_SERVER_URL"] = f"http://127.0.0.1:{port}"
+
+    listener = ThroughputListener()
+    wall = 0.0
+    try:
+        for i in range(iterations):
+            start = time.perf_counter()
+            robot.run(
+                *[os.path.join(PROJECT_ROOT, s) for s in suites],
+                outputdir=os.path.join(output_root, f"iteration_{i + 1}"),
+                listener=[listener],
+                log="NONE",
+                report="NONE",
+                console="dotted",
+            )
+            wall += time.perf_counter() - start
+    finally:
+        server.shutdown()
+        device.shutdown()
+        shutil.rmtree(state_dir, ignore_errors=True)
+        PRIORS.set_directory(PRIORS_DIR)
+        shutil.rmtree(priors_dir, ignore_errors=True)
+        if not keep:
+            shutil.rmtree(output_root, ignore_errors=True)
+
+    results = {
+        "run": {
+            "suites": suites,
+            "iterations": iterations,
+            "wall_s": round(wall, 3),
+            "device_keywords": listener.device_keywords,
+            "failed_keywords": listener.failed_keywords,
+            "keywords_per_s": round(listener.device_keywords / wall, 3) if wall else 0.0,
+            "adb_latency_ms": adb_latency_ms,
+            "appium_latency_ms": appium_latency_ms,
+            "screenshot_latency_ms": screenshot_latency_ms,
+            "appium_requests": dict(device.stats),
+        }
+    }
+    for row in listener.profiler.rows():
+        if row["library"] in DEVICE_LIBRARIES:
+            results[f"keyword/{row['library']}.{row['keyword']}"] = {
+                "count": row["count"],
+                "failures": row["failures"],
+                "mean_ms": round(row["mean_s"] * 1000, 3),
+                "p50_ms": round(row["p50_s"] * 1000, 3),
+                "p95_ms": round(row["p95_s"] * 1000, 3),
+                "max_ms": round(row["max_s"] * 1000, 3),
+            }
+    for name, (total, count) in sorted(listener.stages.items(), key=lambda kv: -kv[1][0]):
+        results[f"stage/{name}"] = {
+            "count": count,
+            "total_ms": round(total, 3),
+            "mean_ms": round(total / count, 3),
+        }
+    return results
+
+
+def print_report(results):
+    run_info = results["run"]
+    print(
+        f"\n{run_info['device_keywords']} device keywords in {run_info['wall_s']} s "
+        f"→ {run_info['keywords_per_s']} keywords/s ({run_info['failed_keywords']} failed)"
+    )
+
+    print(f"\n{'keyword':55} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for key, r in results.items():
+        if key.startswith("keyword/"):
+            print(f"{key[8:]:55} {r['count']:6} {r['p50_ms']:9.1f} {r['p95_ms']:9.1f} {r['max_ms']:9.1f}")
+
+    print(f"\n{'stage':55} {'count':>6} {'total ms':>10} {'mean ms':>9}")
+    for key, r in results.items():
+        if key.startswith("stage/"):
+            print(f"{key[6:]:55} {r['count']:6} {r['total_ms']:10.1f} {r['mean_ms']:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword throughput against fake adb / Appium devices")
+    parser.add_argument("suites", nargs="*", default=DEFAULT_SUITES, help="suite files relative to the project root")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--adb-latency-ms", type=float, default=20.0, help="latency per adb invocation")
+    parser.add_argument("--appium-latency-ms", type=float, default=10.0, help="latency per Appium HTTP request")
+    parser.add_argument("--screenshot-latency-ms", type=float, default=150.0, help="extra latency per screenshot")
+    parser.add_argument("--port", type=int, default=4723, help="fake Appium server port")
+    parser.add_argument("--keep-output", action="store_true", help="keep the Robot output folders")
+    parser.add_argument("--output", help="result JSON path (default: Benchmarks/results/...)")
+    parser.add_argument("--compare", help="previous result JSON to compare against")
+    args = parser.parse_args()
+
+    os.chdir(PROJECT_ROOT)
+    results = run(
+        args.suites, args.iterations, args.adb_latency_ms, args.appium_latency_ms,
+        args.screenshot_latency_ms, args.port, args.keep_output,
+    )
+    print_report(results)
+
+    path = write_results("keyword_throughput", results, args.output)
+    print(f"\nResults written to {path}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Vision micro-benchmarks for the CPU-heavy paths of adb_keywords / appium_keywords.
+
+Builds synthetic device screens at several resolutions with the real
+Resources/images templates embedded, then times the operations the
+keywords perform (PNG decode/encode, reference loading from the asset
+bundle, grayscale, matchTemplate, highlight, OCR) and stores latency
+percentiles + throughput as JSON.
+
+Usage (from the project root):
+    python -m Benchmarks.vision_benchmark
+    python -m Benchmarks.vision_benchmark --repeat 50 --compare Benchmarks/results/<old>.json
+"""
+
+import os
+import shutil
+import argparse
+import tempfile
+
+import cv2
+import numpy as np
+
+from Keywords import asset_bundle
+from Benchmarks.bench_utils import (
+    PROJECT_ROOT, time_call, summarize, write_results, compare, print_results
+)
+
+
+IMAGES_DIR = os.path.join(PROJECT_ROOT, "Resources", "images")
+
+# Common Android panel sizes (width x height)
+RESOLUTIONS = [(720, 1600), (1080, 2400), (1440, 3120)]
+
+OCR_TEXT = ["Kids", "Action", "Shooter action games"]
+
+
+def load_templates():
+    templates = {}
+    for name in sorted(os.listdir(IMAGES_DIR)):
+        if name.lower().endswith(".png"):
+            img = cv2.imread(os.path.join(IMAGES_DIR, name))
+            if img is not None:
+                templates[name] = img
+    return templates
+
+
+def build_screen(width, height, templates, seed=0):
+    """
+    Synthetic screen: gradient + noise background, some text lines and
+    every template that fits pasted at a random position.
+    Returns the BGR screen and {template_name: (x, y)}.
+    """
+    rng = np.random.default_rng(seed)
+
+    gradient = np.linspace(40, 220, height, dtype=np.float32)[:, None]
+    screen = np.repeat(gradient, width, axis=1)
+    screen = np.stack([screen, screen * 0.9, screen * 0.8], axis=2)
+    screen += rng.normal(0, 6, screen.shape)
+    screen = np.clip(screen, 0, 255).astype(np.uint8)
+
+    for i, text in enumerate(OCR_TEXT):
+        cv2.putText(
+            screen, text, (40, 120 + i * 90),
+            cv2.FONT_HERSHEY_SIMPLEX, 1.6, (0, 0, 0), 3, cv2.LINE_AA
+        )
+
+    positions = {}
+    top = 450
+    for name, tpl in templates.items():
+        h, w = tpl.shape[:2]
+        if w >= width or top + h >= height:
+            continue
+        x = int(rng.integers(0, width - w))
+        y = int(rng.integers(top, min(height - h, top + 300)))
+        screen[y:y + h, x:x + w] = tpl
+        positions[name] = (x, y)
+        top = y + h + 20
+
+    return screen, positions
+
+
+def ocr_available():
+    try:
+        import pytesseract
+        return shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
+    except Exception:
+        return False
+
+
+def run(repeat, warmup, with_ocr):
+    templates = load_templates()
+    tmp_dir = tempfile.mkdtemp(prefix="vision_bench_")
+    results = {}
+
+    try:
+        # -------- Reference loading: PNG decode vs. memory-mapped bundle --------
+        bundle_dir = os.path.join(tmp_dir, "bundle")
+        asset_bundle.build(IMAGES_DIR, bundle_dir)
+        for name in templates:
+            path = os.path.join(IMAGES_DIR, name)
+
+            def load_bundle():
+                # Fresh reader each time: measures index + np.load, not the in-process cache
+                return asset_bundle.AssetBundle(bundle_dir).gray(path)
+
+            results[f"templates/png_decode_gray/{name}"] = summarize(
+                time_call(lambda: cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2GRAY), repeat, warmup)
+            )
+            results[f"templates/bundle_load_gray/{name}"] = summarize(
+                time_call(load_bundle, repeat, warmup)
+            )
+
+        for width, height in RESOLUTIONS:
+            res = f"{width}x{height}"
+            screen, positions = build_screen(width, height, templates)
+
+            screen_path = os.path.join(tmp_dir, f"screen_{res}.png")
+            cv2.imwrite(screen_path, screen)
+            png_bytes = open(screen_path, "rb").read()
+            out_path = os.path.join(tmp_dir, f"highlighted_{res}.png")
+
+            screen_gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+
+            # -------- Codec --------
+            results[f"{res}/png_decode_file"] = summarize(
+                time_call(lambda: cv2.imread(screen_path), repeat, warmup)
+            )
+            results[f"{res}/png_decode_bytes"] = summarize(
+                time_call(
+                    lambda: cv2.imdecode(np.frombuffer(png_bytes, np.uint8), cv2.IMREAD_COLOR),
+                    repeat, warmup
+                )
+            )
+            results[f"{res}/png_encode_file"] = summarize(
+                time_call(lambda: cv2.imwrite(out_path, screen), repeat, warmup)
+            )
+
+            # -------- Preprocessing / annotation --------
+            results[f"{res}/grayscale"] = summarize(
+                time_call(lambda: cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY), repeat, warmup)
+            )
+
+            def highlight():
+                highlighted = screen.copy()
+                cv2.rectangle(highlighted, (100, 100), (300, 300), (0, 0, 255), 3)
+                return highlighted
+
+            results[f"{res}/highlight"] = summarize(time_call(highlight, repeat, warmup))
+
+            # -------- Template matching --------
+            for name, (x, y) in positions.items():
+                tpl = templates[name]
+                tpl_gray = cv2.cvtColor(tpl, cv2.COLOR_BGR2GRAY)
+
+                def match_gray():
+                    result = cv2.matchTemplate(screen_gray, tpl_gray, cv2.TM_CCOEFF_NORMED)
+                    return cv2.minMaxLoc(result)
+
+                def match_color():
+                    result = cv2.matchTemplate(screen, tpl, cv2.TM_CCOEFF_NORMED)
+                    return cv2.minMaxLoc(result)
+
+                _, score, _, loc = match_gray()
+                if loc != (x, y):
+                    print(f"⚠️ {res} {name}: matched {loc} (score={score:.3f}), embedded at {(x, y)}")
+
+                results[f"{res}/match_gray/{name}"] = summarize(
+                    time_call(match_gray, repeat, warmup)
+                )
+                results[f"{res}/match_color/{name}"] = summarize(
+                    time_call(match_color, repeat, warmup)
+                )
+
+            # -------- OCR --------
+            if with_ocr:
+                import pytesseract
+                results[f"{res}/ocr_image_to_data"] = summarize(
+                    time_call(
+                        lambda: pytesseract.image_to_data(screen, output_type=pytesseract.Output.DICT),
+                        max(3, repeat // 10), 1
+                    )
+                )
+            else:
+                results[f"{res}/ocr_image_to_data"] = {"skipped": "tesseract not available"}
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vision micro-benchmarks")
+    parser.add_argument("--repeat", type=int, default=20, help="measured iterations per benchmark")
+    parser.add_argument("--warmup", type=int, default=2, help="unmeasured warmup iterations")
+    parser.add_argument("--no-ocr", action="store_true", help="skip the OCR benchmark")
+    parser.add_argument("--output", help="result JSON path (default: Benchmarks/results/...)")
+    parser.add_argument("--compare", help="previous result JSON to compare p50 latency against")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.warmup, not args.no_ocr and ocr_available())
+    print_results(results)
+
+    path = write_results("vision", results, args.output)
+    print(f"\nResults written to {path}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,24 @@
 import os
 import csv
 import json
+import time
 import configparser
 from datetime import datetime
 from robot.api import logger
 from robot.libraries.BuiltIn import BuiltIn
 from Keywords.appium_keywords import appium_keywords
+from Configurations.keyword_profiler import KeywordProfiler
+from Configurations.results_history import ResultsHistory, PROJECT_ROOT
+from Configurations.logcat_capture import LogcatCapture
+from Keywords import tracing
+from Keywords.location_priors import PRIORS
+from Keywords.artifact_store import STORE
+
+SUMMARY_CSV = "execution_summary.csv"
+SUMMARY_JSONL = "execution_summary.jsonl"
+SUMMARY_JSON = "execution_summary.json"
+SUMMARY_HTML = "execution_summary.html"
+SUMMARY_FIELDS = ["test", "duts", "status", "duration", "video", "log"]
 
 
 class AutoScreenRecordingListener:
@@ -21,6 +34,9 @@ class AutoScreenRecordingListener:
         self.total_pass = 0
         self.total_fail = 0
         self.total_skip = 0
+        self.expected_tests = None
+        self.finished_tests = 0
+        self.output_dir = None
 
         # -------- Load configurations.ini --------
         cfg_path = os.path.join(os.path.dirname(__file__), "configurations.ini")
@@ -35,17 +51,101 @@ class AutoScreenRecordingListener:
             config.get("DEFAULT", "enable_execution_logs", fallback="No")
             .strip().lower()
         )
+        self.enable_keyword_profiling = (
+            config.get("DEFAULT", "enable_keyword_profiling", fallback="No")
+            .strip().lower()
+        )
+        self.enable_tracing = (
+            config.get("DEFAULT", "enable_tracing", fallback="No")
+            .strip().lower()
+        )
+        # Screenshots of vision keywords: Always | Yes (failed tests only) | No
+        self.enable_screen_artifacts = (
+            config.get("DEFAULT", "enable_screen_artifacts", fallback="Always")
+            .strip().lower()
+        )
+        STORE.configure(config)
+
+        # -------- Keyword profiling --------
+        self.profiler = KeywordProfiler()
+        self.dut_names = [
+            s.split(".", 1)[1] for s in config.sections() if s.startswith("DUT.")
+        ]
+
+        # -------- Device logcat per test: Always | Yes (failed tests only) | No --------
+        self.enable_logcat_capture = (
+            config.get("DEFAULT", "enable_logcat_capture", fallback="No")
+            .strip().lower()
+        )
+        self.logcat = LogcatCapture()
+        self.logcat.configure(config)
+        self.dut_serials = {
+            s.split(".", 1)[1]: config[s].get("device_id", "").strip()
+            for s in config.sections() if s.startswith("DUT.")
+        }
+
+        # -------- Hot-path tracing --------
+        self._trace_starts = []
+
+        # -------- Cross-run results history (SQLite) --------
+        self.enable_results_history = (
+            config.get("DEFAULT", "enable_results_history", fallback="No")
+            .strip().lower()
+        )
+        self.history = ResultsHistory(
+            os.path.join(
+                PROJECT_ROOT,
+                config.get("DEFAULT", "results_history_db", fallback="Logs/results_history.sqlite"),
+            ),
+            config.getint("DEFAULT", "results_history_batch_size", fallback=10),
+        )
+        # Running suites; keywords outside a test belong to the innermost one
+        self._suite_stack = []
 
         logger.info(
             f"📘 Listener config | "
             f"ScreenRecording={self.enable_screen_recording}, "
-            f"ExecutionLogs={self.enable_execution_logs}",
+            f"ExecutionLogs={self.enable_execution_logs}, "
+            f"KeywordProfiling={self.enable_keyword_profiling}, "
+            f"Tracing={self.enable_tracing}, "
+            f"LogcatCapture={self.enable_logcat_capture}, "
+            f"ResultsHistory={self.enable_results_history}",
         )
 
+    # ------------------------------------------------------------------
+    # SUITE START
+    # ------------------------------------------------------------------
+    def start_suite(self, data, result):
+        # Setup keywords of the parent suite ended before this suite started
+        self._history_suite_keywords()
+        self._suite_stack.append(getattr(data, "full_name", None) or data.longname)
+
+        if data.parent is not None:
+            return
+
+        # Total number of tests in the run, used to render the summary
+        # table once after the last test has finished.
+        self.expected_tests = data.test_count
+        self.output_dir = BuiltIn().get_variable_value("${OUTPUT DIR}")
+
+        # Per-test outputs are appended, so start every run from empty files
+        for name in (SUMMARY_CSV, SUMMARY_JSONL):
+            path = os.path.join(self.output_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+        if self.enable_results_history in ("yes", "always") and not BuiltIn().dry_run_active:
+            try:
+                self.history.start_run(self.output_dir)
+            except Exception as e:
+                logger.warn(f"⚠️ Results history disabled for this run: {e}")
+
     # ------------------------------------------------------------------
     # TEST START
     # ------------------------------------------------------------------
     def start_test(self, test, result):
+        self._history_suite_keywords()
+        STORE.begin_test()
         try:
             bi = BuiltIn()
 
@@ -68,9 +168,14 @@ class AutoScreenRecordingListener:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             safe_test_name = test.name.replace(" ", "_")
             log_path = os.path.join(logs_dir, f"{timestamp}_{safe_test_name}.log")
+            trace_path = os.path.join(
+                output_dir, "traces", f"{timestamp}_{safe_test_name}.trace.json"
+            )
 
-            record_video = self.enable_screen_recording in ("yes", "always")
+            # Nothing runs on the DUTs in robot --dryrun
+            record_video = self.enable_screen_recording in ("yes", "always") and not bi.dry_run_active
             record_log = self.enable_execution_logs in ("yes", "always")
+            record_logcat = self.enable_logcat_capture in ("yes", "always") and not bi.dry_run_active
 
             self.context[test.name] = {
                 "duts": {},
@@ -78,8 +183,15 @@ class AutoScreenRecordingListener:
                 "start_time": datetime.now(),
                 "record_video": record_video,
                 "record_log": record_log,
+                "trace_path": trace_path,
+                "dut_list": dut_list,
+                "record_logcat": record_logcat,
+                "logcat": {},
             }
 
+            if self.enable_tracing in ("yes", "always"):
+                tracing.start_trace(test.name)
+
             if record_log:
                 with open(log_path, "w", encoding="utf-8") as f:
                     f.write(f"Test Name   : {test.name}\n")
@@ -88,6 +200,17 @@ class AutoScreenRecordingListener:
                     f.write(f"Start Time  : {self.context[test.name]['start_time']}\n")
                     f.write("\n--- Execution Timeline ---\n")
 
+            if record_logcat:
+                for dut in dut_list:
+                    serial = self.dut_serials.get(dut)
+                    if not serial:
+                        logger.warn(f"⚠️ No device_id for DUT '{dut}'. Skipping logcat.")
+                        continue
+                    try:
+                        self.logcat.begin(dut, serial)
+                    except OSError as e:
+                        logger.warn(f"⚠️ Failed to start logcat | DUT={dut}: {e}")
+
             if record_video:
                 for dut in dut_list:
                     video_path = os.path.join(
@@ -106,12 +229,38 @@ class AutoScreenRecordingListener:
     # TEST END
     # ------------------------------------------------------------------
     def end_test(self, test, result):
+        try:
+            self._end_test(test, result)
+        finally:
+            # Render once, after the last test of the run. Finished tests are
+            # counted, not summary rows: tests without ${DUT} add no row.
+            self.finished_tests += 1
+            if self.expected_tests is not None and self.finished_tests >= self.expected_tests:
+                self._render_summary_table()
+
+    def _end_test(self, test, result):
+        # Highlight images linked by this test's keywords must exist before it ends
+        for error in STORE.flush():
+            logger.warn(f"⚠️ Failed to render artifact {error}")
+
+        # -------- Retained frames (enable_screen_artifacts = Yes) --------
+        if self.enable_screen_artifacts == "yes":
+            if result.status == "FAIL":
+                self._embed_retained_frames(STORE.persist(self.output_dir))
+            else:
+                STORE.discard()
+
         ctx = self.context.get(test.name)
+        self._record_history(test, result, ctx)
         if not ctx:
             return
 
         failed = result.status == "FAIL"
 
+        # -------- Export trace --------
+        if self.enable_tracing in ("yes", "always"):
+            self._export_trace(ctx)
+
         # -------- Stop recordings --------
         if ctx["record_video"] and (
             self.enable_screen_recording == "always"
@@ -135,10 +284,15 @@ class AutoScreenRecordingListener:
                 f.write(f"End Time    : {end_time}\n")
                 f.write(f"Duration    : {duration}\n")
 
+        # -------- Save logcat slice --------
+        if ctx["record_logcat"]:
+            self._save_logcat(ctx, failed)
+
         # -------- Embed artifacts --------
         if (
             self.enable_screen_recording in ("always", "yes")
             or self.enable_execution_logs in ("always", "yes")
+            or ctx["logcat"]
         ):
             self._embed_artifacts(ctx)
 
@@ -157,7 +311,7 @@ class AutoScreenRecordingListener:
             self.total_skip += 1
             row_class = "row-skip"
 
-        self.summary_rows.append({
+        row = {
             "test": test.name,
             "anchor": test.name.replace(" ", "_"),
             "duts": dut_names,
@@ -166,10 +320,34 @@ class AutoScreenRecordingListener:
             "row_class": row_class,
             "video": self.enable_screen_recording in ("yes", "always"),
             "log": self.enable_execution_logs in ("yes", "always"),
-        })
+        }
+        self.summary_rows.append(row)
+        self._append_summary(row)
 
-        self._render_summary_table()
+    # ------------------------------------------------------------------
+    # SUITE END
+    # ------------------------------------------------------------------
+    def end_suite(self, data, result):
+        # Suite teardown keywords
+        self._history_suite_keywords()
+        if self._suite_stack:
+            self._suite_stack.pop()
+
+    # ------------------------------------------------------------------
+    # EXECUTION END
+    # ------------------------------------------------------------------
+    def close(self):
         self._export_summary()
+        if self.enable_keyword_profiling in ("yes", "always"):
+            self.profiler.export(self.output_dir)
+        PRIORS.export_stats(self.output_dir)
+        STORE.cleanup()
+        self.logcat.stop_all()
+        try:
+            self.history.end_run(self.total_pass, self.total_fail, self.total_skip)
+        except Exception as e:
+            logger.warn(f"⚠️ Failed to write results history: {e}")
+        self.history.close()
 
     # ------------------------------------------------------------------
     # SUMMARY TABLE (TOP OF REPORT)
@@ -178,6 +356,39 @@ class AutoScreenRecordingListener:
         if self.summary_rendered:
             return
 
+        # CSV / JSON files are in OUTPUT DIR
+        base = self._link_base()
+        csv_rel = os.path.relpath(
+            os.path.join(self.output_dir, SUMMARY_CSV), base
+        ).replace("\\", "/")
+        json_rel = os.path.relpath(
+            os.path.join(self.output_dir, SUMMARY_JSON), base
+        ).replace("\\", "/")
+
+        html = f"""
+        <div id="execution-summary-container">
+        {self._summary_table_html()}
+
+        <div style="margin-top:10px">
+        <b>📦 Export Summary</b><br>
+        <a href="{csv_rel}" target="_blank">⬇️ Download CSV</a><br>
+        <a href="{json_rel}" target="_blank">⬇️ Download JSON</a>
+        </div>
+        </div>
+
+        <script>
+        (function() {{
+            var s = document.getElementById("execution-summary-container");
+            document.body.insertBefore(s, document.body.firstChild);
+        }})();
+        </script>
+        <hr>
+        """
+
+        logger.info(html, html=True)
+        self.summary_rendered = True
+
+    def _summary_table_html(self):
         rows_html = ""
         for r in self.summary_rows:
             rows_html += f"""
@@ -199,12 +410,7 @@ class AutoScreenRecordingListener:
         </tr>
         """
 
-        # CSV / JSON files are in OUTPUT DIR
-        csv_rel = "execution_summary.csv"
-        json_rel = "execution_summary.json"
-
-        html = f"""
-        <div id="execution-summary-container">
+        return f"""
         <style>
         .row-pass {{ background:#e6ffed; }}
         .row-fail {{ background:#ffe6e6; }}
@@ -231,66 +437,112 @@ class AutoScreenRecordingListener:
             {totals_row}
         </tbody>
         </table>
-
-        <div style="margin-top:10px">
-        <b>📦 Export Summary</b><br>
-        <a href="{csv_rel}" target="_blank">⬇️ Download CSV</a><br>
-        <a href="{json_rel}" target="_blank">⬇️ Download JSON</a>
-        </div>
-        </div>
-
-        <script>
-        (function() {{
-            var s = document.getElementById("execution-summary-container");
-            document.body.insertBefore(s, document.body.firstChild);
-        }})();
-        </script>
-        <hr>
         """
 
-        logger.info(html, html=True)
-        self.summary_rendered = True
-
-
     # ------------------------------------------------------------------
     # EXPORT SUMMARY
     # ------------------------------------------------------------------
-    def _export_summary(self):
-        if not self.summary_rows:
+    def _append_summary(self, row):
+        """
+        Appends one test row to the CSV and JSON Lines summaries.
+        Cost per test stays constant regardless of run length.
+        """
+        if not self.output_dir:
             return
 
-        output_dir = BuiltIn().get_variable_value("${OUTPUT DIR}")
-        csv_path = os.path.join(output_dir, "execution_summary.csv")
-        json_path = os.path.join(output_dir, "execution_summary.json")
+        csv_path = os.path.join(self.output_dir, SUMMARY_CSV)
+        jsonl_path = os.path.join(self.output_dir, SUMMARY_JSONL)
+        write_header = not os.path.exists(csv_path)
 
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f, fieldnames=["test", "duts", "status", "duration", "video", "log"]
-            )
-            writer.writeheader()
-            for r in self.summary_rows:
-                writer.writerow({
-                    "test": r["test"],
-                    "duts": r["duts"],
-                    "status": r["status"],
-                    "duration": r["duration"],
-                    "video": r["video"],
-                    "log": r["log"],
-                })
+        with open(csv_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            if write_header:
+                writer.writeheader()
+            writer.writerow({k: row[k] for k in SUMMARY_FIELDS})
+
+        with open(jsonl_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(row) + "\n")
+
+    def _export_summary(self):
+        """
+        Writes the consolidated JSON and standalone HTML summary once,
+        when the execution ends.
+        """
+        if not self.summary_rows or not self.output_dir:
+            return
+
+        json_path = os.path.join(self.output_dir, SUMMARY_JSON)
+        html_path = os.path.join(self.output_dir, SUMMARY_HTML)
 
         with open(json_path, "w", encoding="utf-8") as f:
             json.dump(self.summary_rows, f, indent=2)
 
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(
+                "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+                "<title>Execution Summary</title></head><body>"
+                f"{self._summary_table_html()}"
+                "</body></html>\n"
+            )
+
     # ------------------------------------------------------------------
     # KEYWORD / LOGGER LOGGING
     # ------------------------------------------------------------------
     def start_keyword(self, data, result):
+        if self.enable_keyword_profiling in ("yes", "always"):
+            self.profiler.start()
+        if tracing.is_enabled():
+            self._trace_starts.append(time.perf_counter_ns())
         self._write_log(f"▶ KEYWORD START: {data.name}")
 
     def end_keyword(self, data, result):
+        profiling = self.enable_keyword_profiling in ("yes", "always")
+        if profiling or self.history.run_id is not None:
+            library = getattr(result, "owner", None) or getattr(result, "libname", "")
+            dut = self._keyword_dut(result)
+        if profiling:
+            self.profiler.end(result.name, library, dut, result.status)
+        if self.history.run_id is not None:
+            self.history.add_keyword(
+                result.name, library, dut, result.status, self._elapsed_seconds(result)
+            )
+        if tracing.is_enabled() and self._trace_starts:
+            tracing.add_complete(
+                result.name, self._trace_starts.pop(), time.perf_counter_ns(),
+                cat="robot", args={"status": result.status},
+            )
         symbol = "✔" if result.status == "PASS" else "✘"
         self._write_log(f"{symbol} KEYWORD END: {data.name} ({result.status})")
 
+    def _keyword_dut(self, result):
+        """
+        Returns the DUT a keyword was called for by matching its resolved
+        arguments against the [DUT.*] sections, or '' when it has none.
+        """
+        if not self.dut_names:
+            return ""
+        try:
+            bi = BuiltIn()
+            for arg in result.args:
+                if not isinstance(arg, str):
+                    continue
+                if arg.startswith("dut_name="):
+                    arg = arg.split("=", 1)[1]
+                if "${" in arg:
+                    arg = bi.replace_variables(arg)
+                if arg in self.dut_names:
+                    return arg
+        except Exception:
+            pass
+        return ""
+
+    def _elapsed_seconds(self, result):
+        elapsed = getattr(result, "elapsed_time", None)
+        if elapsed is not None:
+            return elapsed.total_seconds()
+        # Robot Framework 6
+        return (getattr(result, "elapsedtime", 0) or 0) / 1000.0
+
     def log_message(self, message):
         self._write_log(f"{message.level}: {message.message.strip()}")
 
@@ -309,11 +561,102 @@ class AutoScreenRecordingListener:
         except Exception:
             pass
 
+    # ------------------------------------------------------------------
+    # LOGCAT
+    # ------------------------------------------------------------------
+    def _save_logcat(self, ctx, failed):
+        keep = self.enable_logcat_capture == "always" or failed
+        base = os.path.splitext(ctx["log_path"])[0]
+        for dut in ctx["dut_list"]:
+            if not keep:
+                self.logcat.discard(dut)
+                continue
+            path = f"{base}_{dut}.logcat.txt.gz"
+            try:
+                count = self.logcat.write(dut, path)
+            except OSError as e:
+                logger.warn(f"⚠️ Failed to save logcat | DUT={dut}: {e}")
+                continue
+            if count is not None:
+                ctx["logcat"][dut] = path
+                logger.info(f"📜 Logcat saved | DUT={dut} | {count} line(s)")
+
+    # ------------------------------------------------------------------
+    # RESULTS HISTORY
+    # ------------------------------------------------------------------
+    def _record_history(self, test, result, ctx):
+        if self.history.run_id is None:
+            return
+        try:
+            self.history.add_test(
+                getattr(test, "full_name", None) or test.longname,
+                ctx["dut_list"] if ctx else [],
+                result.status,
+                self._elapsed_seconds(result),
+                result.message if result.status == "FAIL" else "",
+            )
+        except Exception as e:
+            logger.warn(f"⚠️ Failed to write results history: {e}")
+
+    def _history_suite_keywords(self):
+        if self.history.run_id is None or not self._suite_stack:
+            return
+        try:
+            self.history.add_suite_keywords(self._suite_stack[-1])
+        except Exception as e:
+            logger.warn(f"⚠️ Failed to write results history: {e}")
+
+    # ------------------------------------------------------------------
+    # LINK BASE
+    # ------------------------------------------------------------------
+    def _link_base(self):
+        """
+        Folder the log links are relative to. Tools/device_farm.py sets
+        ${FARM_OUTPUT_DIR} because it merges the shard logs one level up.
+        """
+        bi = BuiltIn()
+        return (
+            bi.get_variable_value("${FARM_OUTPUT_DIR}", default=None)
+            or bi.get_variable_value("${OUTPUT DIR}")
+        )
+
+    # ------------------------------------------------------------------
+    # TRACE EXPORT
+    # ------------------------------------------------------------------
+    def _export_trace(self, ctx):
+        self._trace_starts = []
+        try:
+            trace_path = tracing.export_trace(ctx["trace_path"])
+        except Exception as e:
+            logger.warn(f"⚠️ Failed to export trace: {e}")
+            return
+        if not trace_path:
+            return
+
+        output_dir = self._link_base()
+        trace_rel = os.path.relpath(trace_path, output_dir).replace("\\", "/")
+        logger.info(
+            f"<b>🧵 Trace</b> (open in chrome://tracing or ui.perfetto.dev): "
+            f"<a href=\"{trace_rel}\">{os.path.basename(trace_path)}</a>",
+            html=True,
+        )
+
     # ------------------------------------------------------------------
     # EMBED ARTIFACTS
     # ------------------------------------------------------------------
+    def _embed_retained_frames(self, frames):
+        if not frames:
+            return
+        html = "<details open style='margin:15px 0'>"
+        html += f"<summary><b>📸 Last {len(frames)} frame(s) before the failure</b></summary>"
+        for dut, label, entry in frames:
+            title = f"{dut} | {label or entry['hash']}"
+            html += f"<div>{STORE.html(entry, title)}</div><hr>"
+        html += "</details>"
+        logger.info(html, html=True)
+
     def _embed_artifacts(self, ctx):
-        output_dir = BuiltIn().get_variable_value("${OUTPUT DIR}")
+        output_dir = self._link_base()
 
         html = "<details style='margin:15px 0'>"
         html += "<summary><b>🎬 Screen Recordings & Execution Log</b></summary>"
@@ -340,5 +683,12 @@ class AutoScreenRecordingListener:
             <a href="{log_rel}">⬇️ Download execution log</a>
             """
 
+        for dut, logcat_path in ctx["logcat"].items():
+            logcat_rel = os.path.relpath(logcat_path, output_dir).replace("\\", "/")
+            html += f"""
+            <br><b>📜 Logcat ({dut})</b><br>
+            <a href="{logcat_rel}">⬇️ Download logcat</a>
+            """
+
         html += "</details>"
         logger.info(html, html=True)
@@ -0,0 +1,153 @@
+import os
+import html
+import json
+import math
+import time
+
+
+PROFILE_JSON = "keyword_profile.json"
+PROFILE_HTML = "keyword_profile.html"
+
+
+class StreamingHistogram:
+    """
+    Log-bucketed latency histogram.
+    Keeps count/total/min/max exactly and answers percentiles from
+    buckets (~5% relative error) without storing individual samples.
+    """
+
+    MIN_VALUE = 0.0001      # 0.1 ms, everything below lands in bucket 0
+    GROWTH = 1.1            # each bucket is 10% wider than the previous one
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = {}
+
+    def _bucket(self, value):
+        if value <= self.MIN_VALUE:
+            return 0
+        return int(math.log(value / self.MIN_VALUE) / math.log(self.GROWTH)) + 1
+
+    def _bucket_value(self, index):
+        if index == 0:
+            return self.MIN_VALUE
+        # Geometric middle of the bucket
+        return self.MIN_VALUE * self.GROWTH ** (index - 0.5)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+        index = self._bucket(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, pct):
+        if not self.count:
+            return 0.0
+
+        rank = math.ceil(pct / 100.0 * self.count)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class KeywordProfiler:
+    """
+    Collects monotonic keyword durations keyed by (keyword, library, DUT)
+    and exports them as keyword_profile.json / keyword_profile.html.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.failures = {}
+        self._starts = []
+
+    def start(self):
+        self._starts.append(time.perf_counter())
+
+    def end(self, name, library, dut, status):
+        if not self._starts:
+            return
+        elapsed = time.perf_counter() - self._starts.pop()
+
+        # Keywords skipped after a failure are reported but never executed
+        if status == "NOT RUN":
+            return
+
+        key = (name, library or "", dut or "")
+        hist = self.histograms.get(key)
+        if hist is None:
+            hist = self.histograms[key] = StreamingHistogram()
+        hist.add(elapsed)
+
+        if status == "FAIL":
+            self.failures[key] = self.failures.get(key, 0) + 1
+
+    def rows(self):
+        """Returns aggregated rows sorted by total time (descending)."""
+        rows = []
+        for (name, library, dut), hist in self.histograms.items():
+            rows.append({
+                "keyword": name,
+                "library": library,
+                "dut": dut,
+                "count": hist.count,
+                "failures": self.failures.get((name, library, dut), 0),
+                "total_s": round(hist.total, 4),
+                "mean_s": round(hist.mean(), 4),
+                "p50_s": round(hist.percentile(50), 4),
+                "p95_s": round(hist.percentile(95), 4),
+                "p99_s": round(hist.percentile(99), 4),
+                "max_s": round(hist.max, 4),
+            })
+        rows.sort(key=lambda r: r["total_s"], reverse=True)
+        return rows
+
+    def export(self, output_dir):
+        if not self.histograms or not output_dir:
+            return None
+
+        rows = self.rows()
+        json_path = os.path.join(output_dir, PROFILE_JSON)
+        html_path = os.path.join(output_dir, PROFILE_HTML)
+
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+        rows_html = ""
+        for r in rows:
+            rows_html += (
+                f"<tr><td>{html.escape(r['keyword'])}</td><td>{html.escape(r['library'])}</td>"
+                f"<td>{html.escape(r['dut'])}</td>"
+                f"<td>{r['count']}</td><td>{r['failures']}</td>"
+                f"<td>{r['total_s']:.3f}</td><td>{r['mean_s']:.3f}</td>"
+                f"<td>{r['p50_s']:.3f}</td><td>{r['p95_s']:.3f}</td>"
+                f"<td>{r['p99_s']:.3f}</td><td>{r['max_s']:.3f}</td></tr>\n"
+            )
+
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Keyword Profile</title></head><body>
+<h2>⏱️ Keyword Profile (sorted by total time)</h2>
+<table border="1" cellpadding="6" cellspacing="0" style="border-collapse:collapse; width:100%">
+<thead style="background:#f0f0f0">
+<tr><th>Keyword</th><th>Library</th><th>DUT</th><th>Calls</th><th>Failures</th>
+<th>Total (s)</th><th>Mean (s)</th><th>p50 (s)</th><th>p95 (s)</th><th>p99 (s)</th><th>Max (s)</th></tr>
+</thead>
+<tbody>
+{rows_html}</tbody>
+</table>
+</body></html>
+""")
+
+        return json_path
@@ -0,0 +1,112 @@
+import gzip
+import shlex
+import threading
+import subprocess
+from collections import deque
+
+
+class _Reader:
+    """One `adb logcat` stream per DUT, read into a bounded ring of (seq, line)."""
+
+    def __init__(self, serial, filters, ring_lines):
+        self.serial = serial
+        self.lines = deque(maxlen=ring_lines)
+        self.seq = 0
+        self.lock = threading.Lock()
+
+        # -T 1: follow from now instead of dumping the whole device buffer
+        cmd = ["adb", "-s", serial, "logcat", "-v", "threadtime", "-T", "1", *filters]
+        self.proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+        )
+        self.thread = threading.Thread(
+            target=self._read, name=f"logcat-{serial}", daemon=True
+        )
+        self.thread.start()
+
+    def _read(self):
+        for line in self.proc.stdout:
+            with self.lock:
+                self.seq += 1
+                self.lines.append((self.seq, line))
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def mark(self):
+        with self.lock:
+            return self.seq
+
+    def since(self, mark):
+        """Lines read after `mark` and how many of them the ring already dropped."""
+        with self.lock:
+            lines = [line for seq, line in self.lines if seq > mark]
+            dropped = max(0, self.seq - mark - len(lines))
+        return lines, dropped
+
+    def stop(self):
+        if self.alive():
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        self.thread.join(timeout=2)
+
+
+class LogcatCapture:
+    """
+    Streams logcat of every DUT in use on a background reader for the whole
+    run. Tag / priority filters (logcat filterspecs, e.g. "ActivityManager:I
+    *:E") are applied on the device, the host keeps the last `ring_lines`
+    lines, and a test only writes the slice logged while it ran (gzipped).
+    """
+
+    def __init__(self, filters="*:W", ring_lines=20000):
+        self.filters = shlex.split(filters)
+        self.ring_lines = ring_lines
+        self._readers = {}
+        self._marks = {}
+
+    def configure(self, config):
+        self.filters = shlex.split(config.get("DEFAULT", "logcat_filters", fallback="*:W"))
+        self.ring_lines = max(100, config.getint("DEFAULT", "logcat_ring_lines", fallback=20000))
+
+    def begin(self, dut, serial):
+        """Starts (or restarts after a reboot / disconnect) the DUT's reader and marks the test start."""
+        reader = self._readers.get(dut)
+        if reader is None or not reader.alive() or reader.serial != serial:
+            if reader is not None:
+                reader.stop()
+            reader = self._readers[dut] = _Reader(serial, self.filters, self.ring_lines)
+        self._marks[dut] = reader.mark()
+
+    def discard(self, dut):
+        self._marks.pop(dut, None)
+
+    def write(self, dut, path):
+        """Writes the DUT's lines since begin() to `path` (gzip); returns the line count."""
+        reader = self._readers.get(dut)
+        mark = self._marks.pop(dut, None)
+        if reader is None or mark is None:
+            return None
+
+        lines, dropped = reader.since(mark)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(f"# logcat {reader.serial} | filters: {' '.join(self.filters) or '(none)'}\n")
+            if dropped:
+                f.write(f"# {dropped} earlier line(s) dropped (logcat_ring_lines = {self.ring_lines})\n")
+            f.writelines(lines)
+        return len(lines)
+
+    def stop_all(self):
+        for reader in self._readers.values():
+            reader.stop()
+        self._readers.clear()
+        self._marks.clear()
@@ -0,0 +1,268 @@
+import os
+import socket
+import sqlite3
+import time
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_DB = os.path.join(PROJECT_ROOT, "Logs", "results_history.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    started     REAL NOT NULL,
+    finished    REAL,
+    host        TEXT,
+    output_dir  TEXT,
+    passed      INTEGER DEFAULT 0,
+    failed      INTEGER DEFAULT 0,
+    skipped     INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id          INTEGER PRIMARY KEY,
+    run_id      INTEGER NOT NULL REFERENCES runs(id),
+    test        TEXT NOT NULL,
+    dut         TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    started     REAL NOT NULL,
+    duration    REAL NOT NULL,
+    message     TEXT
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    run_id      INTEGER NOT NULL REFERENCES runs(id),
+    test        TEXT NOT NULL,
+    started     REAL NOT NULL,
+    keyword     TEXT NOT NULL,
+    library     TEXT NOT NULL,
+    dut         TEXT NOT NULL,
+    calls       INTEGER NOT NULL,
+    failures    INTEGER NOT NULL,
+    total       REAL NOT NULL,
+    max         REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tests_test_started ON tests(test, started);
+CREATE INDEX IF NOT EXISTS tests_dut_started ON tests(dut, started);
+CREATE INDEX IF NOT EXISTS tests_started ON tests(started);
+CREATE INDEX IF NOT EXISTS keywords_started ON keywords(started);
+CREATE INDEX IF NOT EXISTS keywords_keyword ON keywords(keyword, library, started);
+"""
+
+# Nearest-rank percentiles over the durations of each (test, dut)
+PERCENTILES_SQL = """
+WITH ranked AS (
+    SELECT test, dut, duration,
+           ROW_NUMBER() OVER (PARTITION BY test, dut ORDER BY duration) AS rn,
+           COUNT(*) OVER (PARTITION BY test, dut) AS n
+    FROM tests
+    WHERE started >= ? AND status IN ('PASS', 'FAIL') {where}
+)
+SELECT test, dut, MAX(n) AS runs,
+       MIN(CASE WHEN rn * 100 >= n * 50 THEN duration END) AS p50,
+       MIN(CASE WHEN rn * 100 >= n * 90 THEN duration END) AS p90,
+       MIN(CASE WHEN rn * 100 >= n * 95 THEN duration END) AS p95,
+       MAX(duration) AS max
+FROM ranked
+GROUP BY test, dut
+ORDER BY p95 DESC
+LIMIT ?
+"""
+
+# A flip is a status change between two consecutive runs of the same (test, dut)
+FLAKINESS_SQL = """
+WITH ordered AS (
+    SELECT test, dut, status,
+           LAG(status) OVER (PARTITION BY test, dut ORDER BY started) AS previous
+    FROM tests
+    WHERE started >= ? AND status IN ('PASS', 'FAIL') {where}
+)
+SELECT test, dut, COUNT(*) AS runs,
+       SUM(status = 'FAIL') AS failures,
+       SUM(previous IS NOT NULL AND previous != status) AS flips
+FROM ordered
+GROUP BY test, dut
+HAVING runs >= ? AND failures > 0 AND failures < runs
+ORDER BY flips * 1.0 / runs DESC, failures DESC
+LIMIT ?
+"""
+
+SLOWEST_KEYWORDS_SQL = """
+SELECT keyword, library, SUM(calls) AS calls, SUM(failures) AS failures,
+       SUM(total) / SUM(calls) AS mean, MAX(max) AS max, SUM(total) AS total
+FROM keywords
+WHERE started >= ? {where}
+GROUP BY keyword, library
+ORDER BY mean DESC
+LIMIT ?
+"""
+
+
+class ResultsHistory:
+    """
+    Cross-run results store (SQLite, WAL) written by the listener.
+    Tests and per-test keyword aggregates are buffered and inserted in one
+    transaction every `batch_size` tests and when the run closes; WAL lets
+    parallel farm shards append while dashboards read. Keywords of suite
+    setups / teardowns are stored under the suite's name instead of a test.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB, batch_size=10):
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.run_id = None
+
+        self._conn = None
+        self._tests = []
+        self._keywords = []
+        self._current = {}
+
+    # ------------------------------------------------------------------
+    # CONNECTION
+    # ------------------------------------------------------------------
+    def connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            conn.row_factory = sqlite3.Row
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ------------------------------------------------------------------
+    # RECORDING (listener)
+    # ------------------------------------------------------------------
+    def start_run(self, output_dir):
+        conn = self.connect()
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (started, host, output_dir) VALUES (?, ?, ?)",
+                (time.time(), socket.gethostname(), output_dir),
+            )
+        self.run_id = cursor.lastrowid
+
+    def add_keyword(self, name, library, dut, status, elapsed):
+        """Aggregates one keyword call into the running test."""
+        if status == "NOT RUN":
+            return
+        key = (name, library or "", dut or "")
+        stats = self._current.get(key)
+        if stats is None:
+            stats = self._current[key] = [0, 0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += status == "FAIL"
+        stats[2] += elapsed
+        stats[3] = max(stats[3], elapsed)
+
+    def add_test(self, test, duts, status, duration, message=""):
+        """Queues the finished test (one row per DUT) with its keyword aggregates."""
+        if self.run_id is None:
+            self._current = {}
+            return
+        started = time.time() - duration
+        for dut in duts or [""]:
+            self._tests.append((self.run_id, test, dut, status, started, duration, message))
+        self._queue_keywords(test, started)
+
+        if len(self._tests) >= self.batch_size:
+            self.flush()
+
+    def add_suite_keywords(self, suite):
+        """Queues the keywords run outside any test (suite setup / teardown) under `suite`."""
+        if self.run_id is None:
+            self._current = {}
+            return
+        self._queue_keywords(suite, time.time())
+
+    def _queue_keywords(self, owner, started):
+        for (name, library, dut), (calls, failures, total, max_s) in self._current.items():
+            self._keywords.append(
+                (self.run_id, owner, started, name, library, dut, calls, failures, total, max_s)
+            )
+        self._current = {}
+
+    def flush(self):
+        if self.run_id is None or not (self._tests or self._keywords):
+            return
+        tests, self._tests = self._tests, []
+        keywords, self._keywords = self._keywords, []
+        conn = self.connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO tests (run_id, test, dut, status, started, duration, message) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                tests,
+            )
+            conn.executemany(
+                "INSERT INTO keywords (run_id, test, started, keyword, library, dut, "
+                "calls, failures, total, max) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                keywords,
+            )
+
+    def end_run(self, passed, failed, skipped):
+        if self.run_id is None:
+            return
+        self.flush()
+        with self.connect() as conn:
+            conn.execute(
+                "UPDATE runs SET finished = ?, passed = ?, failed = ?, skipped = ? WHERE id = ?",
+                (time.time(), passed, failed, skipped, self.run_id),
+            )
+        self.run_id = None
+
+    # ------------------------------------------------------------------
+    # QUERIES
+    # ------------------------------------------------------------------
+    def _filter(self, test=None, dut=None, column="test"):
+        where, params = "", []
+        if test:
+            where += f" AND {column} LIKE ?"
+            params.append(test)
+        if dut:
+            where += " AND dut = ?"
+            params.append(dut)
+        return where, params
+
+    def flakiness(self, days=30, min_runs=3, test=None, dut=None, limit=20):
+        """Tests that both passed and failed; flip_rate = status changes / (runs - 1)."""
+        where, params = self._filter(test, dut)
+        rows = self.connect().execute(
+            FLAKINESS_SQL.format(where=where),
+            [time.time() - days * 86400, *params, min_runs, limit],
+        ).fetchall()
+        result = []
+        for r in rows:
+            row = dict(r)
+            row["fail_rate"] = round(r["failures"] / r["runs"], 3)
+            row["flip_rate"] = round(r["flips"] / max(1, r["runs"] - 1), 3)
+            result.append(row)
+        return result
+
+    def duration_percentiles(self, days=30, test=None, dut=None, limit=20):
+        """p50 / p90 / p95 / max test duration per (test, dut), slowest p95 first."""
+        where, params = self._filter(test, dut)
+        rows = self.connect().execute(
+            PERCENTILES_SQL.format(where=where),
+            [time.time() - days * 86400, *params, limit],
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def slowest_keywords(self, days=30, keyword=None, dut=None, limit=20):
+        """Keywords by mean call duration across runs."""
+        where, params = self._filter(keyword, dut, column="keyword")
+        rows = self.connect().execute(
+            SLOWEST_KEYWORDS_SQL.format(where=where),
+            [time.time() - days * 86400, *params, limit],
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def recent_runs(self, limit=20):
+        rows = self.connect().execute(
+            "SELECT * FROM runs ORDER BY started DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [dict(r) for r in rows]
@@ -2,25 +2,44 @@ import configparser          # Used to read configuration.ini file
 import os                    # Used for file paths and running ADB commands
 import xml.etree.ElementTree as ET   # Used to parse Android UI XML
 from robot.api.deco import keyword   # Allows Robot Framework to call Python functions as keywords
-import cv2
-import numpy as np
 from robot.api import logger
 from robot.libraries.BuiltIn import BuiltIn
-from PIL import Image, ImageDraw, ImageFont
-import pytesseract
 import re
 import subprocess
 import time
 from datetime import datetime
-import sounddevice as sd
-import scipy.io.wavfile as wav
-import numpy as np
 import threading
+from Keywords.tracing import span
+from Keywords.lazy_imports import lazy_module
+from Keywords import dut_fanout
+from Keywords import shell_batch
+from Keywords import gestures
+from Keywords.coordinate_maps import MAPS, needs_screen_size, resolve_point
+from Keywords.location_priors import PRIORS
+from Keywords import screen_fingerprints
+from Keywords import feature_matching
+from Keywords.asset_bundle import BUNDLE
+from Keywords.artifact_store import STORE
+
+
+def _set_tesseract_path(module):
+    module.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+
+
+# Heavy dependencies load when a keyword first uses them, not at library import
+cv2 = lazy_module("cv2")
+np = lazy_module("numpy")
+pytesseract = lazy_module("pytesseract", on_import=_set_tesseract_path)
+sd = lazy_module("sounddevice")
+wav = lazy_module("scipy.io.wavfile")
 
 
 
 class adb_keywords:
 
+    # Screen size per DUT, shared by all library instances of the run
+    _screen_sizes = {}
+
     def __init__(self):
         """
         Constructor — runs automatically when class object is created.
@@ -38,8 +57,16 @@ class adb_keywords:
 
         # Read the INI file into memory
         self.config.read(ini_path)
-        #Set tesseract path
-        pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+        STORE.configure(self.config)
+
+        # Search near previous match locations first
+        self.use_location_priors = self.config.get(
+            "DEFAULT", "enable_location_priors", fallback="No"
+        ).strip().lower() in ("yes", "always")
+
+        # template (TM_CCOEFF_NORMED) or orb / akaze feature matching
+        self.image_match_mode = self.config.get("DEFAULT", "image_match_mode", fallback="template")
+        self.feature_min_inliers = self.config.getint("DEFAULT", "feature_min_inliers", fallback=8)
 
         #Audio Verification
         self.sessions = {}
@@ -181,25 +208,39 @@ class adb_keywords:
         Returns the local path of the image saved.
         """
         import os
+
+        # Keep one local file per device so parallel DUTs don't overwrite each other
+        local_name = f"{device_id}_{filename}" if device_id else filename
+        return self._pull_screenshot(filename, device_id, os.path.join(os.getcwd(), local_name))
+
+    def _capture_screen(self, filename, device_id=None):
+        """Screenshot for keyword-internal use, pulled into the per-run temporary folder."""
+        local_name = f"{device_id}_{filename}" if device_id else filename
+        return self._pull_screenshot(filename, device_id, STORE.temp_path(local_name))
+
+    def _pull_screenshot(self, filename, device_id, local_path):
         import subprocess
 
-        local_path = os.path.join(os.getcwd(), filename)
         device_arg = ["-s", device_id] if device_id else []
 
         # Capture screenshot on device
-        subprocess.run(["adb"] + device_arg + ["shell", "screencap", "-p", f"/sdcard/{filename}"])
+        with span("adb.screencap", device=device_id):
+            subprocess.run(["adb"] + device_arg + ["shell", "screencap", "-p", f"/sdcard/{filename}"])
 
         # Pull screenshot to PC
-        subprocess.run(["adb"] + device_arg + ["pull", f"/sdcard/{filename}", local_path])
+        with span("adb.pull", device=device_id):
+            subprocess.run(["adb"] + device_arg + ["pull", f"/sdcard/{filename}", local_path])
 
         return local_path
  
 
     @keyword
-    def verify_image(self, image_name, dut_name=None, threshold=0.90):
+    def verify_image(self, image_name, dut_name=None, threshold=0.90, mode=None):
         """
         Verifies full or partial image match AND logs both images in Robot report.
+        `mode`: template (default from configuration.ini) | orb | akaze
         """
+        mode = self._match_mode(mode)
         # device ID from DUT name
         device_id = self.get_device_id(dut_name)
 
@@ -217,56 +258,78 @@ class adb_keywords:
         if not os.path.isfile(reference_image):
             raise AssertionError(f"Reference image not found: {reference_image}")
         # Take fresh screenshot
-        captured_path = self.take_android_screenshot("verify_image_screen.png", device_id)
-
-        # Log captured image in Robot log
-        logger.info(f"<b>Captured Screen:</b><br><img src='{captured_path}' width='300px'>", html=True)
-        logger.info(f"<b>Reference Image:</b><br><img src='{reference_image}' width='300px'>", html=True)
+        captured_path = self._capture_screen("verify_image_screen.png", device_id)
 
-        screen = cv2.imread(captured_path)
-        ref = cv2.imread(reference_image)
+        with span("decode", image="screen"):
+            screen = cv2.imread(captured_path)
+        with span("decode", image=image_name):
+            ref = BUNDLE.color(reference_image)
 
         if screen is None:
             raise Exception("Failed to load captured screen.")
         if ref is None:
             raise Exception(f"Reference image not found: {reference_image}")
+
+        # Log captured image in Robot log (PNG bytes as pulled from the device)
+        output_dir = BuiltIn().get_variable_value("${OUTPUT DIR}")
+        with open(captured_path, "rb") as f:
+            captured = STORE.save_image(
+                screen, output_dir, encoded=f.read(), dut=dut_name, label=f"Verify Image {image_name}: screen"
+            )
+        STORE.log(captured, "Captured Screen:")
+        logger.info(f"<b>Reference Image:</b><br><img src='{reference_image}' width='300px'>", html=True)
         
-        screen_gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
-        ref_gray = cv2.cvtColor(ref, cv2.COLOR_BGR2GRAY)
+        with span("grayscale"):
+            screen_gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+            ref_gray = BUNDLE.gray(reference_image, ref)
 
 
-        result = cv2.matchTemplate(
-            screen_gray, ref_gray, cv2.TM_CCOEFF_NORMED
-        )
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        if mode == "template":
+            max_val, max_loc = PRIORS.match(
+                screen_gray, ref_gray, image_name, dut_name, threshold,
+                use_priors=self.use_location_priors
+            )
+            h, w = ref_gray.shape[:2]
+        else:
+            max_val, max_loc, (w, h), found = feature_matching.locate(
+                screen_gray, reference_image, mode, self.feature_min_inliers
+            )
 
         screen_h, screen_w = screen.shape[:2]
         ref_h, ref_w = ref.shape[:2]
 
-        h, w = ref_gray.shape[:2]
         top_left = max_loc
         bottom_right = (top_left[0] + w, top_left[1] + h)
 
-        # Draw RED rectangle
-        highlighted = screen.copy()
-        cv2.rectangle(
-            highlighted,
-            top_left,
-            bottom_right,
-            (0, 0, 255),
-            3
+        # RED rectangle, drawn by the artifact render workers
+        entry = STORE.save_annotated(
+            screen, [(*top_left, *bottom_right)], output_dir,
+            dut=dut_name, label=f"Verify Image {image_name}: matched area"
         )
+        STORE.log(entry, "Matched Area:")
 
-        highlighted_path = os.path.join(
-            os.getcwd(), "verify_image_highlighted.png"
-        )
-        cv2.imwrite(highlighted_path, highlighted)
-        # Log captured image in Robot log
-        logger.info(f"<b>Captured Screen:</b><br><img src='{highlighted_path}' width='300px'>", html=True)
+        if mode != "template":
+            logger.info(f"<b>Feature match ({mode}) inlier ratio:</b> {max_val:.3f}", html=True)
+            if found:
+                logger.info("<b>Image Verification: PASS</b>", html=True)
+                return True
+            logger.info("<b>Image Verification: FAIL</b>", html=True)
+            raise AssertionError(f"Image not found by {mode} feature matching (inlier ratio={max_val:.3f})")
+
+        # --- FULL MATCH (around the located area first) ---
+        similarity = 0.0
+        if self.use_location_priors:
+            x0, y0 = max(0, top_left[0] - 8), max(0, top_left[1] - 8)
+            with span("matchTemplate", mode="color/prior"):
+                result = cv2.matchTemplate(
+                    screen[y0:bottom_right[1] + 8, x0:bottom_right[0] + 8], ref, cv2.TM_CCOEFF_NORMED
+                )
+                similarity = float(np.max(result))
 
-        # --- FULL MATCH ---
-        result = cv2.matchTemplate(screen, ref, cv2.TM_CCOEFF_NORMED)
-        similarity = float(np.max(result))
+        if similarity < threshold:
+            with span("matchTemplate", mode="color"):
+                result = cv2.matchTemplate(screen, ref, cv2.TM_CCOEFF_NORMED)
+                similarity = float(np.max(result))
 
         logger.info(f"<b>Similarity Score:</b> {similarity:.3f}", html=True)
 
@@ -280,12 +343,59 @@ class adb_keywords:
             )
 
 
+    @keyword
+    def verify_current_screen_is(self, screen_name, dut_name, tolerance=None):
+        """
+        Verifies the DUT shows the named reference screen (Resources/images)
+        by perceptual-hash distance; full matching only for ambiguous cases.
+        """
+        device_id = self.get_device_id(dut_name)
+        with span("decode", image="screen"):
+            screen = cv2.imread(self._capture_screen("current_screen.png", device_id))
+        if screen is None:
+            raise AssertionError("Failed to load captured screen.")
+
+        index = screen_fingerprints.index_from_config(self.config, BuiltIn().get_variable_value("${EXECDIR}"))
+        matched, dist, method = index.verify(screen, screen_name, tolerance)
+        logger.info(screen_fingerprints.log_message(dut_name, screen_name, dist, method))
+
+        if not matched:
+            raise AssertionError(f"Current screen of {dut_name} is not '{screen_name}' (distance={dist}, {method})")
+        return dist
+
+    @keyword
+    def identify_current_screen(self, dut_name, tolerance=None):
+        """
+        Returns the name of the reference screen (screen_references) the DUT
+        currently shows, or None if no screen is within tolerance.
+        """
+        device_id = self.get_device_id(dut_name)
+        with span("decode", image="screen"):
+            screen = cv2.imread(self._capture_screen("current_screen.png", device_id))
+        if screen is None:
+            raise AssertionError("Failed to load captured screen.")
+
+        index = screen_fingerprints.index_from_config(self.config, BuiltIn().get_variable_value("${EXECDIR}"))
+        name, dist, ranked = index.identify(screen, tolerance)
+        logger.info(f"🖼️ {dut_name}: {name} (distance={dist}) | ranking: {ranked}")
+        return name
+
+    def _match_mode(self, mode):
+        mode = (mode or self.image_match_mode).strip().lower()
+        if mode not in feature_matching.MODES:
+            raise AssertionError(f"Unknown image match mode '{mode}' (use {', '.join(feature_matching.MODES)})")
+        return mode
+
     def get_screen_size(self, dut_name=None):
         """
         Gets the width and height of the connected Android device.
         If dut_name is provided, screen size is fetched for that specific device.
         """
 
+        # Cached per device, the panel resolution does not change during a run
+        if dut_name in self._screen_sizes:
+            return self._screen_sizes[dut_name]
+
         cmd = ["adb"]
 
         # Use specific device if provided
@@ -295,17 +405,19 @@ class adb_keywords:
 
         cmd += ["shell", "wm", "size"]
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True
-        ).stdout
+        with span("adb.wm_size", device=dut_name):
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True
+            ).stdout
 
         match = re.search(r"(\d+)x(\d+)", result)
         if not match:
             raise Exception("Unable to get screen size")
 
         width, height = int(match.group(1)), int(match.group(2))
+        self._screen_sizes[dut_name] = (width, height)
         return width, height
 
 
@@ -363,7 +475,8 @@ class adb_keywords:
             str(duration)
         ]
 
-        subprocess.run(cmd, check=True)
+        with span("adb.swipe", device=device_id):
+            subprocess.run(cmd, check=True)
         target = dut_name if dut_name else "default device"
         message = f"Swipe '{direction}' performed successfully on {target} using {start_x, start_y, end_x, end_y}"
 
@@ -371,12 +484,38 @@ class adb_keywords:
         return message
     
     @keyword
-    def click_by_image(self, image_name, dut_name, threshold=0.8):
+    def perform_gesture(self, steps, dut_name):
         """
-        Takes screenshot using take_android_screenshot(),
+        Runs a sequence of gesture steps as ONE `adb shell` input script.
+        Steps (list or `;` separated, coordinates in px or %):
+        tap X Y | long_press X Y [MS] | swipe X1 Y1 X2 Y2 [MS] | pause MS
+        Multi-finger steps need the Appium keyword.
+        """
+        device_id = self.get_device_id(dut_name)
+
+        screen_size = None
+        if gestures.needs_screen_size(steps):
+            screen_size = self.get_screen_size(dut_name)
+
+        parsed = gestures.parse_steps(steps, screen_size)
+        script = gestures.adb_script(parsed)
+
+        with span("adb.gesture", device=device_id, steps=len(parsed)):
+            subprocess.run(["adb", "-s", device_id, "shell", script], check=True)
+
+        message = f"Gesture on {dut_name}: {gestures.describe(parsed)}"
+        logger.info(message)
+        return message
+
+    @keyword
+    def click_by_image(self, image_name, dut_name, threshold=0.8, mode=None):
+        """
+        Takes screenshot using adb screencap,
         performs template match, clicks, and logs highlighted image on specific device.
         `dut_name`: DUT name as defined in configuration.ini
+        `mode`: template (default from configuration.ini) | orb | akaze
         """
+        mode = self._match_mode(mode)
 
         # Resolve device ID from config
         device_id = self.get_device_id(dut_name)
@@ -396,47 +535,53 @@ class adb_keywords:
             raise AssertionError(f"Reference image not found: {reference_image}")
 
         # 1. Take screenshot
-        screenshot = self.take_android_screenshot("click_temp_screen.png", device_id)
+        screenshot = self._capture_screen("click_temp_screen.png", device_id)
 
-        screen = cv2.imread(screenshot)
-        template = cv2.imread(reference_image)
+        with span("decode", image="screen"):
+            screen = cv2.imread(screenshot)
+        with span("decode", image=image_name):
+            template = BUNDLE.color(reference_image)
 
         if screen is None:
             raise AssertionError("Captured screenshot not found")
         if template is None:
             raise AssertionError(f"Template image not found: {reference_image}")
 
-        # 2. Template matching
-        result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
-
-        if max_val < threshold:
-            raise AssertionError(f"Image not found. Match score={max_val}")
+        # 2. Template / feature matching
+        if mode == "template":
+            max_val, max_loc = PRIORS.match(
+                screen, template, image_name, dut_name, threshold,
+                mode="color", use_priors=self.use_location_priors
+            )
+            if max_val < threshold:
+                raise AssertionError(f"Image not found. Match score={max_val}")
+            h, w = template.shape[:2]
+        else:
+            with span("grayscale"):
+                screen_gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+            max_val, max_loc, (w, h), found = feature_matching.locate(
+                screen_gray, reference_image, mode, self.feature_min_inliers
+            )
+            if not found:
+                raise AssertionError(f"Image not found by {mode} feature matching (inlier ratio={max_val:.3f})")
 
         # 3. Rectangle coordinates
-        h, w = template.shape[:2]
         top_left = max_loc
         bottom_right = (top_left[0] + w, top_left[1] + h)
 
-        # 4. Draw rectangle
-        highlighted = screen.copy()
-        cv2.rectangle(highlighted, top_left, bottom_right, (0, 0, 255), 3)
-
-        highlighted_path = "highlighted_match.png"
-        cv2.imwrite(highlighted_path, highlighted)
-
-        # 5. Log image in Robot report
-        logger.info(
-            f"<b>Image matched (confidence={max_val:.3f})</b><br>"
-            f"<img src='{highlighted_path}' width='40%'>",
-            html=True
+        # 4-5. Log image in Robot report (rectangle drawn by the artifact render workers)
+        entry = STORE.save_annotated(
+            screen, [(*top_left, *bottom_right)], BuiltIn().get_variable_value("${OUTPUT DIR}"),
+            dut=dut_name, label=f"Click By Image {image_name} (confidence={max_val:.3f})"
         )
+        STORE.log(entry, f"Image matched (confidence={max_val:.3f})", width="40%")
 
         # 6. Tap
         tap_x = top_left[0] + w // 2
         tap_y = top_left[1] + h // 2
 
-        subprocess.run(["adb", "-s", device_id, "shell", "input", "tap", str(tap_x), str(tap_y)])
+        with span("adb.tap", device=device_id):
+            subprocess.run(["adb", "-s", device_id, "shell", "input", "tap", str(tap_x), str(tap_y)])
 
         logger.info(f"Clicked at {tap_x},{tap_y} (match={max_val})")
         return f"Clicked at {tap_x},{tap_y} (match={max_val})"
@@ -475,6 +620,55 @@ class adb_keywords:
 
         return result.stdout.strip()
 
+    @keyword
+    def run_commands_batch(self, commands, dut_name, fail_on_error: bool = True, timeout: int = 60):
+        """
+        Runs several device shell commands in a single `adb shell` call.
+        `commands`: list or newline separated string.
+        Returns [{command, stdout, rc}] (stdout includes stderr).
+        """
+        device_id = self.get_device_id(dut_name)
+        commands = shell_batch.parse_commands(commands)
+        token = shell_batch.new_token()
+
+        with span("adb.shell_batch", count=len(commands)):
+            result = subprocess.run(
+                ["adb", "-s", device_id, "shell", shell_batch.build_script(commands, token)],
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+
+        results = shell_batch.parse_output(result.stdout, token, commands)
+        logger.info(shell_batch.results_html(dut_name, results), html=True)
+        return shell_batch.check(results, fail_on_error)
+
+    @keyword
+    def run_on_duts(self, keyword_name, duts, *args, sync_start: bool = False, max_workers: int = None,
+                    **kwargs):
+        """
+        Runs any DUT keyword of this library concurrently on several DUTs.
+        Usage: Run On DUTs    Click By Image    Phone,Main,Cluster    Games_play.png    sync_start=True
+        Other named arguments (e.g. threshold=0.9) are passed on to the keyword.
+        `sync_start`: all DUTs wait on a barrier and start the keyword together.
+        Fails with every per-DUT error if any DUT failed, otherwise returns {dut: result}.
+        """
+        method = dut_fanout.resolve_keyword(self, keyword_name)
+        results = dut_fanout.run_on_duts(
+            method, duts, args, kwargs, sync_start=sync_start, max_workers=max_workers
+        )
+
+        logger.info(dut_fanout.results_html(keyword_name, results), html=True)
+
+        failed = [r for r in results if r.status == "FAIL"]
+        if failed:
+            raise AssertionError(
+                f"'{keyword_name}' failed on {len(failed)}/{len(results)} DUT(s): "
+                + "; ".join(f"{r.dut}: {r.error}" for r in failed)
+            )
+
+        return {r.dut: r.value for r in results}
+
 
     @keyword
     def start_screen_recording(self, device_id, test_name):
@@ -516,42 +710,24 @@ class adb_keywords:
     def tap_by_coordinates(self, json_name, key_name, dut_name):
         """
         Tap on screen using X,Y coordinates from JSON key.
-        JSON is auto-loaded from Resources/Coordinates/.
+        JSON is loaded (and cached) from Resources/coordinates/;
+        normalised / reference-resolution points are scaled to the DUT screen.
         """
-        import json
-        # import os
-        # import subprocess
-        # from robot.api import logger, BuiltIn
-
         device_id = self.get_device_id(dut_name)
 
         project_root = BuiltIn().get_variable_value("${EXECDIR}")
-        json_file = os.path.join(
-            project_root,
-            "Resources",
-            "coordinates",
-            json_name
-        )
+        data = MAPS.load(project_root, json_name)
 
-        if not os.path.isfile(json_file):
-            raise AssertionError(f"JSON file not found: {json_file}")
+        screen_size = None
+        if needs_screen_size(data, key_name):
+            screen_size = self.get_screen_size(dut_name)
+        x, y = resolve_point(data, key_name, screen_size)
 
-        with open(json_file, "r") as f:
-            data = json.load(f)
-
-        if key_name not in data:
-            raise AssertionError(f"Key '{key_name}' not found in {json_name}")
-
-        x = data[key_name].get("x")
-        y = data[key_name].get("y")
-
-        if x is None or y is None:
-            raise AssertionError("JSON key must contain 'x' and 'y'")
-
-        subprocess.run(
-            ["adb", "-s", device_id, "shell", "input", "tap", str(x), str(y)],
-            check=True
-        )
+        with span("adb.tap", device=device_id):
+            subprocess.run(
+                ["adb", "-s", device_id, "shell", "input", "tap", str(x), str(y)],
+                check=True
+            )
 
         msg = f"Tapped {key_name} at ({x},{y}) on device {device_id}"
         logger.info(msg)
@@ -564,8 +740,6 @@ class adb_keywords:
         Works on any screen without XML or UI dump.
         """
 
-        import cv2
-        import pytesseract
         import subprocess
         from robot.api import logger
 
@@ -573,15 +747,17 @@ class adb_keywords:
         device_id = self.get_device_id(dut_name)
 
         # Take screenshot
-        screenshot_path = self.take_android_screenshot("ocr_screen.png", device_id)
+        screenshot_path = self._capture_screen("ocr_screen.png", device_id)
 
         # Read image
-        img = cv2.imread(screenshot_path)
+        with span("decode", image="screen"):
+            img = cv2.imread(screenshot_path)
         if img is None:
             raise AssertionError("Failed to load screenshot for OCR")
 
         # OCR text detection
-        data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
+        with span("ocr"):
+            data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
 
         found = False
         for i, t in enumerate(data['text']):
@@ -590,18 +766,21 @@ class adb_keywords:
                 tap_x = x + w // 2
                 tap_y = y + h // 2
 
-                # Draw rectangle for reporting
-                cv2.rectangle(img, (x, y), (x + w, y + h), (0, 0, 255), 3)
-                cv2.imwrite("ocr_highlighted.png", img)
+                # Rectangle for reporting, drawn by the artifact render workers
+                entry = STORE.save_annotated(
+                    img, [(x, y, x + w, y + h)], BuiltIn().get_variable_value("${OUTPUT DIR}"),
+                    dut=dut_name, label=f"Tap By Text '{text}'"
+                )
 
                 # Tap
-                subprocess.run(
-                    ["adb", "-s", device_id, "shell", "input", "tap", str(tap_x), str(tap_y)],
-                    check=True
-                )
+                with span("adb.tap", device=device_id):
+                    subprocess.run(
+                        ["adb", "-s", device_id, "shell", "input", "tap", str(tap_x), str(tap_y)],
+                        check=True
+                    )
 
                 logger.info(f"Tapped on text '{text}' at ({tap_x},{tap_y}) on device {device_id}")
-                logger.info(f"<img src='ocr_highlighted.png' width='40%'>", html=True)
+                STORE.log(entry, width="40%")
                 found = True
                 break
 
@@ -618,22 +797,22 @@ class adb_keywords:
         Highlights all matched words in report.
         """
 
-        import cv2
-        import pytesseract
         from robot.api import logger
 
         device_id = self.get_device_id(dut_name)
 
-        screenshot = self.take_android_screenshot("verify_text_full.png", device_id)
-        img = cv2.imread(screenshot)
+        screenshot = self._capture_screen("verify_text_full.png", device_id)
+        with span("decode", image="screen"):
+            img = cv2.imread(screenshot)
 
         if img is None:
             raise AssertionError("Failed to load screenshot")
 
-        data = pytesseract.image_to_data(
-            img,
-            output_type=pytesseract.Output.DICT
-        )
+        with span("ocr"):
+            data = pytesseract.image_to_data(
+                img,
+                output_type=pytesseract.Output.DICT
+            )
 
         # Normalize expected words
         expected_words = expected_text.lower().split()
@@ -669,17 +848,20 @@ class adb_keywords:
             raise AssertionError(f"Missing words: {missing_words}")
 
         # PASS CASE → Highlight all matched words
+        boxes = []
         for word in expected_words:
             x, y, w, h = word_boxes[word]
-            cv2.rectangle(img, (x, y), (x + w, y + h), (0, 0, 255), 3)
+            boxes.append((x, y, x + w, y + h))
 
-        highlighted = "verify_text_full_highlighted.png"
-        cv2.imwrite(highlighted, img)
+        entry = STORE.save_annotated(
+            img, boxes, BuiltIn().get_variable_value("${OUTPUT DIR}"),
+            dut=dut_name, label=f"Verify Text OCR '{expected_text}'"
+        )
 
         logger.info(
             f"<b style='color:green'>Text Verification PASSED</b><br>"
             f"Verified text: <b>{expected_text}</b><br>"
-            f"<img src='{highlighted}' width='40%'>",
+            f"{STORE.html(entry, width='40%')}",
             html=True
         )
 
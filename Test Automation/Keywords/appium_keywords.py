@@ -1,8 +1,4 @@
-from appium import webdriver
 from robot.api.deco import keyword
-from appium.options.android import UiAutomator2Options
-from selenium.webdriver.common.actions.action_builder import ActionBuilder
-from selenium.webdriver.common.actions.pointer_input import PointerInput
 from robot.api import logger
 from robot.libraries.BuiltIn import BuiltIn
 from datetime import datetime
@@ -11,15 +7,41 @@ import configparser
 import time
 import os 
 import json
-import cv2
-import pytesseract
+from urllib.parse import urlparse
+from Keywords.tracing import span
+from Keywords.lazy_imports import lazy_module
+from Keywords import dut_fanout
+from Keywords import shell_batch
+from Keywords import gestures
+from Keywords.coordinate_maps import MAPS, needs_screen_size, resolve_point
+from Keywords.location_priors import PRIORS
+from Keywords import screen_fingerprints
+from Keywords import feature_matching
+from Keywords.asset_bundle import BUNDLE
+from Keywords.artifact_store import STORE
+from Keywords.appium_session_pool import AppiumSessionPool, SessionPoolCloser, uses_session
+from Keywords.appium_server_manager import AppiumServerManager
+from Keywords.ui_index import UiIndex
+from Keywords.mjpeg_stream import MjpegStream
+
+
+def _set_tesseract_path(module):
+    module.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+
+
+# Heavy dependencies load when a keyword first uses them; Appium / Selenium
+# are imported inside the methods that create sessions and actions
+cv2 = lazy_module("cv2")
+np = lazy_module("numpy")
+pytesseract = lazy_module("pytesseract", on_import=_set_tesseract_path)
 
 
 class appium_keywords:
 
+    # One instance (and one session pool) for the whole run
+    ROBOT_LIBRARY_SCOPE = "GLOBAL"
+
     def __init__(self):
-        self.drivers = {}
-        # self.driver = None
         # Get folder path where this .py file exists
         base_path = os.path.dirname(os.path.abspath(__file__))
 
@@ -31,10 +53,43 @@ class appium_keywords:
 
         # Read the INI file into memory
         self.config.read(ini_path)
+        STORE.configure(self.config)
+
+        # Appium endpoint and UiAutomator2 ports per DUT (optionally spawned servers)
+        self.servers = AppiumServerManager(
+            self.config, log_dir=os.path.join(base_path, "..", "Logs", "appium")
+        )
+
+        # Appium sessions, one per DUT, quit when the library scope ends
+        self.sessions = AppiumSessionPool(
+            self._create_driver,
+            max_sessions=self.config.getint("DEFAULT", "appium_max_sessions", fallback=4),
+            idle_timeout=self.config.getfloat("DEFAULT", "appium_idle_timeout", fallback=300),
+            health_check_interval=self.config.getfloat(
+                "DEFAULT", "appium_health_check_interval", fallback=5
+            ),
+        )
+        self.ROBOT_LIBRARY_LISTENER = SessionPoolCloser(self.sessions, on_close=self._shutdown)
+
+        # Search near previous match locations first
+        self.use_location_priors = self.config.get(
+            "DEFAULT", "enable_location_priors", fallback="No"
+        ).strip().lower() in ("yes", "always")
+
+        # template (TM_CCOEFF_NORMED) or orb / akaze feature matching
+        self.image_match_mode = self.config.get("DEFAULT", "image_match_mode", fallback="template")
+        self.feature_min_inliers = self.config.getint("DEFAULT", "feature_min_inliers", fallback=8)
+
+        # Window size per DUT, valid for the session it was read from
+        self.screen_sizes = {}
+
+        # Optional MJPEG screen streams, one per DUT
+        self.streams = {}
+        self.screen_stream = self.config.get("DEFAULT", "appium_screen_stream", fallback="No")
+        self.stream_max_age = self.config.getfloat("DEFAULT", "appium_stream_max_age", fallback=0.5)
+        # Session a stream failed to start for; retried only with a new session
+        self.stream_failed = {}
 
-        #Set tesseract path
-        pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-        
     @keyword
     def get_device_id(self, dut_name):
         """
@@ -55,29 +110,146 @@ class appium_keywords:
 
     @keyword
     def start_appium_session(self, dut_name):
-        if dut_name in self.drivers:
-            return self.drivers[dut_name]
+        """
+        Returns the pooled Appium driver for the DUT.
+        A cached session is health-checked and recreated if it died.
+        """
+        driver = self.sessions.get(dut_name)
+        if (
+            self.screen_stream.lower() in ("yes", "always")
+            and dut_name not in self.streams
+            and self.stream_failed.get(dut_name) is not driver
+        ):
+            try:
+                self._start_stream(driver, dut_name)
+            except Exception as e:
+                self.stream_failed[dut_name] = driver
+                logger.warn(f"⚠️ Screen stream unavailable for {dut_name}, using screenshots: {e}")
+        return driver
+
+    def _create_driver(self, dut_name):
+        from appium import webdriver
+        from appium.options.android import UiAutomator2Options
+        from appium.webdriver.client_config import AppiumClientConfig
 
-        caps = self.get_device_id(dut_name)  # must return dict
+        self.get_device_id(dut_name)  # fails early for unknown DUTs
 
+        caps = self.servers.capabilities(dut_name)
         options = UiAutomator2Options().load_capabilities(caps)
+        url = self.servers.endpoint(dut_name)
 
-        driver = webdriver.Remote(
-            command_executor="http://127.0.0.1:4723",
-            options=options
-        )
+        # Keep-alive HTTP connection to the DUT's own server
+        client_config = AppiumClientConfig(remote_server_addr=url, keep_alive=True)
+
+        with span("appium.new_session", dut=dut_name, server=url):
+            driver = webdriver.Remote(
+                command_executor=url,
+                options=options,
+                client_config=client_config,
+            )
 
-        self.drivers[dut_name] = driver
         return driver
 
 
     @keyword
-    def stop_appium_session(self):
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+    def stop_appium_session(self, dut_name=None):
+        """
+        Quits the Appium session of `dut_name`, or every open session
+        when no DUT is given.
+        """
+        if dut_name:
+            self.stop_screen_stream(dut_name)
+            self.sessions.release(dut_name)
+        else:
+            self.stop_screen_stream()
+            self.sessions.close_all()
+
+    def _match_mode(self, mode):
+        mode = (mode or self.image_match_mode).strip().lower()
+        if mode not in feature_matching.MODES:
+            raise AssertionError(f"Unknown image match mode '{mode}' (use {', '.join(feature_matching.MODES)})")
+        return mode
+
+    def _screen_size(self, driver, dut_name):
+        """Window size of the DUT, fetched once per session."""
+        cached = self.screen_sizes.get(dut_name)
+        if cached and cached[0] is driver:
+            return cached[1]
+        size = driver.get_window_size()
+        self.screen_sizes[dut_name] = (driver, (size["width"], size["height"]))
+        return self.screen_sizes[dut_name][1]
+
+    def _shutdown(self):
+        self.stop_screen_stream()
+        self.servers.stop_all()
+
+    @keyword
+    @uses_session
+    def start_screen_stream(self, dut_name, fps=10):
+        """
+        Starts the UiAutomator2 MJPEG stream of the DUT.
+        Vision keywords then use the latest streamed frame instead of a screenshot.
+        """
+        driver = self.sessions.get(dut_name)
+        self._start_stream(driver, dut_name, fps)
+
+    @keyword
+    def stop_screen_stream(self, dut_name=None):
+        """
+        Stops the MJPEG stream of `dut_name` (or all streams);
+        vision keywords fall back to screenshots.
+        """
+        names = [dut_name] if dut_name else list(self.streams)
+        for name in names:
+            stream = self.streams.pop(name, None)
+            if stream is not None:
+                stream.stop()
+
+    def _start_stream(self, driver, dut_name, fps=10):
+        # Full resolution frames so template coordinates match the screen
+        driver.update_settings({"mjpegServerFramerate": int(fps), "mjpegScalingFactor": 100})
+
+        host = urlparse(self.servers.endpoint(dut_name)).hostname
+        port = self.servers.device_ports(dut_name)["mjpegServerPort"]
+        stream = MjpegStream(f"http://{host}:{port}").start()
+
+        if stream.latest_jpeg(max_age=None, wait=5) is None:
+            stream.stop()
+            raise AssertionError(f"No MJPEG frames from {stream.url} for DUT '{dut_name}' ({stream.error})")
+
+        self.streams[dut_name] = stream
+        logger.info(f"📡 MJPEG screen stream started for {dut_name} ({stream.url}, {fps} fps)")
+
+    def _capture_screen(self, driver, dut_name):
+        """
+        Current screen as (BGR array, encoded bytes, file extension).
+        Uses the DUT's MJPEG stream when running, else an in-memory PNG screenshot.
+        """
+        stream = self.streams.get(dut_name)
+        if stream is not None:
+            with span("mjpeg.frame"):
+                jpeg = stream.latest_jpeg(max_age=self.stream_max_age)
+            if jpeg is not None:
+                with span("decode", image="screen"):
+                    img = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+                return img, jpeg, ".jpg"
+            logger.warn(f"⚠️ No fresh MJPEG frame for {dut_name}, taking a screenshot")
+
+        with span("appium.screenshot"):
+            png = driver.get_screenshot_as_png()
+        with span("decode", image="screen"):
+            img = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_COLOR)
+        return img, png, ".png"
+
+    def _ui_index(self, driver):
+        """One page_source request, parsed into a local element index."""
+        with span("appium.page_source"):
+            source = driver.page_source
+        with span("parse_page_source"):
+            return UiIndex(source)
 
     @keyword
+    @uses_session
     def verify_text_appium_full(self, expected_text, dut_name):
         """
         Verifies FULL visible text using Appium (exact match).
@@ -88,16 +260,7 @@ class appium_keywords:
 
         logger.info(f"<b>Verifying text:</b> '{expected_text}'", html=True)
 
-        elements = driver.find_elements(
-            by="xpath",
-            value="//*[normalize-space(@text) != '']"
-        )
-
-        visible_texts = []
-        for el in elements:
-            text = el.text.strip()
-            if text:
-                visible_texts.append(text)
+        visible_texts = self._ui_index(driver).visible_texts()
 
         logger.info(
             "<b>Visible texts on screen:</b><br>" +
@@ -115,76 +278,116 @@ class appium_keywords:
         raise AssertionError(
             f"Exact text '{expected_text}' not found on screen"
         )
-    
-    
+
     @keyword
-    def tap_by_coordinates(self, json_name, key_name, dut_name):
+    @uses_session
+    def verify_element_appium(self, locator, dut_name, by="text"):
         """
-        Tap on screen using X,Y coordinates from JSON key using Appium (mobile: tap).
+        Verifies an element is displayed, looked up in the page source index.
+        `by` = text | desc | id | any. Returns the element bounds.
         """
 
         driver = self.start_appium_session(dut_name)
+        matches = self._ui_index(driver).find(locator, by)
 
-        project_root = BuiltIn().get_variable_value("${EXECDIR}")
-        json_file = os.path.join(
-            project_root,
-            "Resources",
-            "Coordinates",
-            json_name
+        if not matches:
+            raise AssertionError(f"Element '{locator}' (by {by}) not found on screen")
+
+        logger.info(
+            f"<b style='color:green'>ELEMENT VERIFIED:</b> '{locator}' (by {by}) at {matches[0].bounds}",
+            html=True
         )
+        return matches[0].bounds
+
+    @keyword
+    @uses_session
+    def tap_by_element(self, locator, dut_name, by="text"):
+        """
+        Taps the center of an element found in the page source index.
+        `by` = text | desc | id | any.
+        """
+
+        driver = self.start_appium_session(dut_name)
+        matches = self._ui_index(driver).find(locator, by)
 
-        if not os.path.isfile(json_file):
-            raise AssertionError(f"JSON file not found: {json_file}")
+        if not matches:
+            raise AssertionError(f"Element '{locator}' (by {by}) not found on screen")
 
-        with open(json_file, "r") as f:
-            data = json.load(f)
+        x, y = matches[0].center
+        with span("appium.tap"):
+            driver.execute_script("mobile: clickGesture", {"x": x, "y": y})
 
-        if key_name not in data:
-            raise AssertionError(f"Key '{key_name}' not found in {json_name}")
+        msg = f"Tapped '{locator}' (by {by}) at ({x},{y}) on DUT '{dut_name}'"
+        logger.info(f"<b>{msg}</b>", html=True)
+        return msg
 
-        x = data[key_name].get("x")
-        y = data[key_name].get("y")
+    @keyword
+    @uses_session
+    def tap_by_coordinates(self, json_name, key_name, dut_name):
+        """
+        Tap on screen using X,Y coordinates from JSON key using Appium (mobile: tap).
+        JSON is loaded (and cached) from Resources/coordinates/;
+        normalised / reference-resolution points are scaled to the DUT screen.
+        """
 
-        if x is None or y is None:
-            raise AssertionError("JSON key must contain 'x' and 'y'")
+        driver = self.start_appium_session(dut_name)
+
+        project_root = BuiltIn().get_variable_value("${EXECDIR}")
+        data = MAPS.load(project_root, json_name)
+
+        screen_size = None
+        if needs_screen_size(data, key_name):
+            screen_size = self._screen_size(driver, dut_name)
+        x, y = resolve_point(data, key_name, screen_size)
 
         # Appium-native tap
-        driver.execute_script(
-            "mobile: clickGesture",
-            {"x": int(x), "y": int(y)}
-        )
+        with span("appium.tap"):
+            driver.execute_script(
+                "mobile: clickGesture",
+                {"x": int(x), "y": int(y)}
+            )
 
         msg = f"Tapped '{key_name}' at ({x},{y}) on DUT '{dut_name}'"
         logger.info(f"<b>{msg}</b>", html=True)
         return msg
     
     @keyword
+    @uses_session
     def tap_by_text(self, expected_text, dut_name):
         """
-        Tap on visible text using OCR and Appium clickGesture.
-        Works without XML / UI dump.
+        Tap on visible text using the page source index and Appium clickGesture.
+        Falls back to OCR for text drawn outside the UI hierarchy.
         """
 
         driver = self.start_appium_session(dut_name)
 
-        # Take screenshot using Appium
-        screenshot_path = os.path.join(
-            BuiltIn().get_variable_value("${OUTPUT DIR}"),
-            "ocr_screen.png"
-        )
-        driver.save_screenshot(screenshot_path)
+        ui = self._ui_index(driver)
+        matches = ui.find(expected_text, "text") or ui.find(expected_text, "desc")
+        if matches:
+            tap_x, tap_y = matches[0].center
+            with span("appium.tap"):
+                driver.execute_script(
+                    "mobile: clickGesture",
+                    {"x": tap_x, "y": tap_y}
+                )
+            logger.info(
+                f"<b style='color:green'>Tapped on text:</b> {expected_text} at ({tap_x},{tap_y})",
+                html=True
+            )
+            return True
 
-        img = cv2.imread(screenshot_path)
+        # Not in the UI hierarchy → OCR on the current screen
+        img, _, _ = self._capture_screen(driver, dut_name)
         if img is None:
             raise AssertionError("Failed to load screenshot for OCR")
 
         # OCR
-        ocr_data = pytesseract.image_to_data(
-            img, output_type=pytesseract.Output.DICT
-        )
+        with span("ocr"):
+            ocr_data = pytesseract.image_to_data(
+                img, output_type=pytesseract.Output.DICT
+            )
 
         found = False
-        highlighted = img.copy()
 
         for i, text in enumerate(ocr_data["text"]):
             if text.strip() == expected_text:
@@ -196,33 +399,25 @@ class appium_keywords:
                 tap_x = int(x + w / 2)
                 tap_y = int(y + h / 2)
 
-                # Highlight rectangle
-                cv2.rectangle(
-                    highlighted,
-                    (x, y),
-                    (x + w, y + h),
-                    (0, 0, 255),
-                    3
-                )
-
-                highlighted_path = os.path.join(
-                    BuiltIn().get_variable_value("${OUTPUT DIR}"),
-                    "ocr_highlighted.png"
+                # Highlight rectangle, drawn by the artifact render workers
+                entry = STORE.save_annotated(
+                    img, [(x, y, x + w, y + h)], BuiltIn().get_variable_value("${OUTPUT DIR}"),
+                    dut=dut_name, label=f"Tap By Text '{expected_text}'"
                 )
-                cv2.imwrite(highlighted_path, highlighted)
 
                 # Appium tap
-                driver.execute_script(
-                    "mobile: clickGesture",
-                    {
-                        "x": tap_x,
-                        "y": tap_y
-                    }
-                )
+                with span("appium.tap"):
+                    driver.execute_script(
+                        "mobile: clickGesture",
+                        {
+                            "x": tap_x,
+                            "y": tap_y
+                        }
+                    )
 
                 logger.info(
                     f"<b style='color:green'>Tapped on text:</b> {expected_text}<br>"
-                    f"<img src='ocr_highlighted.png' width='40%'>",
+                    f"{STORE.html(entry, width='40%')}",
                     html=True
                 )
 
@@ -238,11 +433,14 @@ class appium_keywords:
     
 
     @keyword
-    def verify_image_element(self, image_name, dut_name, threshold=0.90):
+    @uses_session
+    def verify_image_element(self, image_name, dut_name, threshold=0.90, mode=None):
         """
         Verifies image on screen using Appium screenshot + OpenCV template matching.
         Logs highlighted match image in Robot report.
+        `mode`: template (default from configuration.ini) | orb | akaze
         """
+        mode = self._match_mode(mode)
 
         driver = self.start_appium_session(dut_name)
 
@@ -259,74 +457,61 @@ class appium_keywords:
         if not os.path.isfile(reference_image):
             raise AssertionError(f"Reference image not found: {reference_image}")
 
-        # ✅ Screenshot stored in output folder
-        screenshot_path = os.path.join(
-            output_dir,
-            f"appium_verify_image_{int(time.time())}.png"
-        )
-        driver.save_screenshot(screenshot_path)
+        screen, encoded, ext = self._capture_screen(driver, dut_name)
 
-        logger.info(
-            f"<b>Captured Screen:</b><br>"
-            f"<img src='{os.path.basename(screenshot_path)}' width='300px'>",
-            html=True
+        if screen is None:
+            raise AssertionError("Failed to load captured screenshot")
+
+        # ✅ Screenshot stored in output folder (encoded bytes as received)
+        captured = STORE.save_image(
+            screen, output_dir, encoded=encoded, ext=ext,
+            dut=dut_name, label=f"Verify Image Element {image_name}: screen"
         )
+        STORE.log(captured, "Captured Screen:")
         logger.info(
             f"<b>Reference Image:</b><br>"
             f"<img src='{reference_image}' width='300px'>",
             html=True
         )
 
-        screen = cv2.imread(screenshot_path)
-        ref = cv2.imread(reference_image)
+        with span("decode", image=image_name):
+            ref = BUNDLE.color(reference_image)
 
-        if screen is None:
-            raise AssertionError("Failed to load captured screenshot")
         if ref is None:
             raise AssertionError("Failed to load reference image")
 
-        screen_gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
-        ref_gray = cv2.cvtColor(ref, cv2.COLOR_BGR2GRAY)
+        with span("grayscale"):
+            screen_gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+            ref_gray = BUNDLE.gray(reference_image, ref)
 
-        result = cv2.matchTemplate(
-            screen_gray,
-            ref_gray,
-            cv2.TM_CCOEFF_NORMED
-        )
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        if mode == "template":
+            max_val, max_loc = PRIORS.match(
+                screen_gray, ref_gray, image_name, dut_name, threshold,
+                use_priors=self.use_location_priors
+            )
+            h, w = ref_gray.shape[:2]
+            found = max_val >= threshold
+        else:
+            max_val, max_loc, (w, h), found = feature_matching.locate(
+                screen_gray, reference_image, mode, self.feature_min_inliers
+            )
 
         logger.info(
-            f"<b>Similarity Score:</b> {max_val:.3f}",
+            f"<b>Similarity Score ({mode}):</b> {max_val:.3f}",
             html=True
         )
 
-        h, w = ref_gray.shape[:2]
         top_left = max_loc
         bottom_right = (top_left[0] + w, top_left[1] + h)
 
-        highlighted = screen.copy()
-        cv2.rectangle(
-            highlighted,
-            top_left,
-            bottom_right,
-            (0, 0, 255),
-            3
-        )
-
-        # ✅ Highlighted image stored in output folder
-        highlighted_path = os.path.join(
-            output_dir,
-            f"verify_image_highlighted_{int(time.time())}.png"
-        )
-        cv2.imwrite(highlighted_path, highlighted)
-
-        logger.info(
-            f"<b>Matched Area:</b><br>"
-            f"<img src='{os.path.basename(highlighted_path)}' width='300px'>",
-            html=True
+        # ✅ Highlighted image stored in output folder (rendered in the background)
+        entry = STORE.save_annotated(
+            screen, [(*top_left, *bottom_right)], output_dir,
+            dut=dut_name, label=f"Verify Image Element {image_name}: matched area"
         )
+        STORE.log(entry, "Matched Area:")
 
-        if max_val >= threshold:
+        if found:
             logger.info(
                 "<b style='color:green'>Image Verification: PASS</b>",
                 html=True
@@ -343,12 +528,52 @@ class appium_keywords:
 
     
     @keyword
-    def click_by_image(self, image_name, dut_name, threshold=0.8):
+    @uses_session
+    def verify_current_screen_is(self, screen_name, dut_name, tolerance=None):
+        """
+        Verifies the DUT shows the named reference screen (Resources/images)
+        by perceptual-hash distance; full matching only for ambiguous cases.
+        """
+        driver = self.start_appium_session(dut_name)
+        screen, _, _ = self._capture_screen(driver, dut_name)
+        if screen is None:
+            raise AssertionError("Failed to load captured screen.")
+
+        index = screen_fingerprints.index_from_config(self.config, BuiltIn().get_variable_value("${EXECDIR}"))
+        matched, dist, method = index.verify(screen, screen_name, tolerance)
+        logger.info(screen_fingerprints.log_message(dut_name, screen_name, dist, method))
+
+        if not matched:
+            raise AssertionError(f"Current screen of {dut_name} is not '{screen_name}' (distance={dist}, {method})")
+        return dist
+
+    @keyword
+    @uses_session
+    def identify_current_screen(self, dut_name, tolerance=None):
+        """
+        Returns the name of the reference screen (screen_references) the DUT
+        currently shows, or None if no screen is within tolerance.
+        """
+        driver = self.start_appium_session(dut_name)
+        screen, _, _ = self._capture_screen(driver, dut_name)
+        if screen is None:
+            raise AssertionError("Failed to load captured screen.")
+
+        index = screen_fingerprints.index_from_config(self.config, BuiltIn().get_variable_value("${EXECDIR}"))
+        name, dist, ranked = index.identify(screen, tolerance)
+        logger.info(f"🖼️ {dut_name}: {name} (distance={dist}) | ranking: {ranked}")
+        return name
+
+    @keyword
+    @uses_session
+    def click_by_image(self, image_name, dut_name, threshold=0.8, mode=None):
         """
         Takes screenshot using Appium,
         performs template match, clicks on matched area,
         and logs highlighted image in Robot report.
+        `mode`: template (default from configuration.ini) | orb | akaze
         """
+        mode = self._match_mode(mode)
 
         driver = self.start_appium_session(dut_name)
 
@@ -365,68 +590,60 @@ class appium_keywords:
         if not os.path.isfile(reference_image):
             raise AssertionError(f"Reference image not found: {reference_image}")
 
-        # ✅ Screenshot stored in bin/output folder
-        screenshot_path = os.path.join(
-            output_dir,
-            f"appium_click_image_{int(time.time())}.png"
-        )
-        driver.save_screenshot(screenshot_path)
+        screen, _, _ = self._capture_screen(driver, dut_name)
 
-        screen = cv2.imread(screenshot_path)
-        template = cv2.imread(reference_image)
+        with span("decode", image=image_name):
+            template = BUNDLE.color(reference_image)
 
         if screen is None:
             raise AssertionError("Failed to load captured screenshot")
         if template is None:
             raise AssertionError(f"Failed to load template image: {reference_image}")
 
-        screen_gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
-        template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+        with span("grayscale"):
+            screen_gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+            template_gray = BUNDLE.gray(reference_image, template)
 
-        result = cv2.matchTemplate(
-            screen_gray,
-            template_gray,
-            cv2.TM_CCOEFF_NORMED
-        )
-        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        if mode == "template":
+            max_val, max_loc = PRIORS.match(
+                screen_gray, template_gray, image_name, dut_name, threshold,
+                use_priors=self.use_location_priors
+            )
+            h, w = template_gray.shape[:2]
+            found = max_val >= threshold
+        else:
+            max_val, max_loc, (w, h), found = feature_matching.locate(
+                screen_gray, reference_image, mode, self.feature_min_inliers
+            )
 
-        logger.info(f"<b>Image Match Score:</b> {max_val:.3f}", html=True)
+        logger.info(f"<b>Image Match Score ({mode}):</b> {max_val:.3f}", html=True)
 
-        if max_val < threshold:
+        if not found:
             raise AssertionError(
                 f"Image not found. Match score={max_val:.3f}, threshold={threshold}"
             )
 
-        h, w = template_gray.shape[:2]
         top_left = max_loc
         bottom_right = (top_left[0] + w, top_left[1] + h)
 
         tap_x = top_left[0] + w // 2
         tap_y = top_left[1] + h // 2
 
-        highlighted = screen.copy()
-        cv2.rectangle(highlighted, top_left, bottom_right, (0, 0, 255), 3)
-
-        # ✅ Highlighted image stored in bin/output folder
-        highlighted_path = os.path.join(
-            output_dir,
-            f"click_image_highlighted_{int(time.time())}.png"
-        )
-        cv2.imwrite(highlighted_path, highlighted)
-
-        logger.info(
-            f"<b>Matched Image (confidence={max_val:.3f})</b><br>"
-            f"<img src='{os.path.basename(highlighted_path)}' width='40%'>",
-            html=True
-        )
-
-        driver.execute_script(
-            "mobile: clickGesture",
-            {
-                "x": int(tap_x),
-                "y": int(tap_y)
-            }
+        # ✅ Highlighted image stored in bin/output folder (rendered in the background)
+        entry = STORE.save_annotated(
+            screen, [(*top_left, *bottom_right)], output_dir,
+            dut=dut_name, label=f"Click By Image {image_name} (confidence={max_val:.3f})"
         )
+        STORE.log(entry, f"Matched Image (confidence={max_val:.3f})", width="40%")
+
+        with span("appium.tap"):
+            driver.execute_script(
+                "mobile: clickGesture",
+                {
+                    "x": int(tap_x),
+                    "y": int(tap_y)
+                }
+            )
 
         msg = f"Clicked at ({tap_x},{tap_y}) | match={max_val:.3f}"
         logger.info(msg)
@@ -434,6 +651,7 @@ class appium_keywords:
 
     
     @keyword
+    @uses_session
     def run_command(self, command, dut_name, timeout_ms=5000):
         """
         Executes shell command on a DUT using Appium mobile:shell
@@ -448,14 +666,15 @@ class appium_keywords:
 
         logger.info(f"Executing command on {dut_name}: {command}")
 
-        result = driver.execute_script(
-            "mobile: shell",
-            {
-                "command": base_cmd,
-                "args": args,
-                "timeout": timeout_ms
-            }
-        )
+        with span("appium.shell", command=base_cmd):
+            result = driver.execute_script(
+                "mobile: shell",
+                {
+                    "command": base_cmd,
+                    "args": args,
+                    "timeout": timeout_ms
+                }
+            )
 
         if isinstance(result, dict):
             stdout = result.get("stdout", "").strip()
@@ -473,9 +692,64 @@ class appium_keywords:
             return result.strip()
 
         raise AssertionError(f"Unexpected result from mobile:shell: {result}")
-    
 
     @keyword
+    @uses_session
+    def run_commands_batch(self, commands, dut_name, fail_on_error: bool = True, timeout_ms: int = 60000):
+        """
+        Runs several device shell commands in a single mobile:shell request.
+        `commands`: list or newline separated string.
+        Returns [{command, stdout, rc}] (stdout includes stderr).
+        """
+        driver = self.start_appium_session(dut_name)
+        commands = shell_batch.parse_commands(commands)
+        token = shell_batch.new_token()
+
+        # The whole script is the command line handed to the device shell
+        with span("appium.shell_batch", count=len(commands)):
+            result = driver.execute_script(
+                "mobile: shell",
+                {
+                    "command": shell_batch.build_script(commands, token),
+                    "args": [],
+                    "timeout": timeout_ms
+                }
+            )
+
+        output = result.get("stdout", "") if isinstance(result, dict) else str(result)
+        results = shell_batch.parse_output(output, token, commands)
+        logger.info(shell_batch.results_html(dut_name, results), html=True)
+        return shell_batch.check(results, fail_on_error)
+
+    @keyword
+    def run_on_duts(self, keyword_name, duts, *args, sync_start: bool = False, max_workers: int = None,
+                    **kwargs):
+        """
+        Runs any DUT keyword of this library concurrently on several DUTs.
+        Usage: Run On DUTs    Click By Image    Phone,Main,Cluster    Games_play.png    sync_start=True
+        Other named arguments (e.g. threshold=0.9) are passed on to the keyword.
+        `sync_start`: all DUTs wait on a barrier and start the keyword together.
+        Fails with every per-DUT error if any DUT failed, otherwise returns {dut: result}.
+        """
+        method = dut_fanout.resolve_keyword(self, keyword_name)
+        results = dut_fanout.run_on_duts(
+            method, duts, args, kwargs, sync_start=sync_start, max_workers=max_workers
+        )
+
+        logger.info(dut_fanout.results_html(keyword_name, results), html=True)
+
+        failed = [r for r in results if r.status == "FAIL"]
+        if failed:
+            raise AssertionError(
+                f"'{keyword_name}' failed on {len(failed)}/{len(results)} DUT(s): "
+                + "; ".join(f"{r.dut}: {r.error}" for r in failed)
+            )
+
+        return {r.dut: r.value for r in results}
+
+
+    @keyword
+    @uses_session
     def press_key(self, keycode, dut_name):
         """
         Press Android hardware/system key using keyevent.
@@ -498,6 +772,75 @@ class appium_keywords:
         )
 
     @keyword
+    @uses_session
+    def perform_gesture(self, steps, dut_name):
+        """
+        Runs a sequence of gesture steps as ONE W3C actions request.
+        Steps (list or `;` separated, coordinates in px or %):
+        tap X Y | long_press X Y [MS] | swipe X1 Y1 X2 Y2 [MS] | multi X1,Y1>X2,Y2 X1,Y1>X2,Y2 [MS] | pause MS
+        Usage: Perform Gesture    tap 50% 40%; pause 300; swipe 90% 50% 10% 50% 250    Phone
+        """
+        driver = self.start_appium_session(dut_name)
+
+        screen_size = None
+        if gestures.needs_screen_size(steps):
+            screen_size = self._screen_size(driver, dut_name)
+
+        parsed = gestures.parse_steps(steps, screen_size)
+
+        with span("appium.actions", steps=len(parsed)):
+            self._build_actions(driver, parsed).perform()
+
+        msg = f"Gesture on DUT '{dut_name}': {gestures.describe(parsed)}"
+        logger.info(msg)
+        return msg
+
+    def _build_actions(self, driver, steps):
+        """
+        One touch pointer per finger. Every step takes the same number of
+        ticks on every pointer (idle fingers pause), which keeps the step
+        timing exact inside a single actions payload.
+        """
+        from selenium.webdriver.common.actions.action_builder import ActionBuilder
+        from selenium.webdriver.common.actions.pointer_input import PointerInput
+        from selenium.webdriver.common.actions import interaction
+
+        finger_count = max([len(s["fingers"]) for s in steps] + [1])
+        builder = ActionBuilder(driver, mouse=PointerInput(interaction.POINTER_TOUCH, "finger1"))
+        pointers = [builder.pointer_inputs[0]]
+        for i in range(2, finger_count + 1):
+            pointers.append(builder.add_pointer_input(interaction.POINTER_TOUCH, f"finger{i}"))
+
+        for step in steps:
+            seconds = step["ms"] / 1000.0
+
+            if step["kind"] == "pause":
+                for pointer in pointers:
+                    pointer.create_pause(seconds)
+                continue
+
+            for i, pointer in enumerate(pointers):
+                if i >= len(step["fingers"]):
+                    # Idle finger: same 4 ticks as the active ones
+                    pointer.create_pause(0)
+                    pointer.create_pause(0)
+                    pointer.create_pause(seconds)
+                    pointer.create_pause(0)
+                    continue
+
+                x1, y1, x2, y2 = step["fingers"][i]
+                pointer.create_pointer_move(duration=0, x=x1, y=y1)
+                pointer.create_pointer_down(button=0)
+                if (x1, y1) == (x2, y2):
+                    pointer.create_pause(seconds)
+                else:
+                    pointer.create_pointer_move(duration=step["ms"], x=x2, y=y2)
+                pointer.create_pointer_up(button=0)
+
+        return builder
+
+    @keyword
+    @uses_session
     def swipe_left_right(self, dut_name, direction="left", percent=0.9):
         """
         Safe horizontal swipe avoiding Android back gestures.
@@ -536,6 +879,7 @@ class appium_keywords:
     
 
     @keyword
+    @uses_session
     def scroll_top_bottom(self, dut_name, direction="down", percent=0.9):
         """
         Safe scroll that avoids Android system gestures.
@@ -610,6 +954,11 @@ class appium_keywords:
         if self._screen_record_proc.poll() is not None:
             raise RuntimeError("❌ Screen recording failed to start")
 
+        # Keep the DUT's Appium session while it records
+        self._release_recording_lease()
+        self.sessions.acquire_lease(dut_name)
+        self._recording_lease = dut_name
+
         logger.info("✅ Screen recording started successfully")
         return device_video_path
 
@@ -627,6 +976,7 @@ class appium_keywords:
         if hasattr(self, "_screen_record_proc") and self._screen_record_proc:
             self._screen_record_proc.terminate()
             self._screen_record_proc.wait(timeout=5)
+        self._release_recording_lease()
 
         time.sleep(1)
 
@@ -642,6 +992,12 @@ class appium_keywords:
         return local_video_path
 
 
+    def _release_recording_lease(self):
+        dut_name = getattr(self, "_recording_lease", None)
+        if dut_name:
+            self.sessions.release_lease(dut_name)
+            self._recording_lease = None
+
     def _resolve_dut_name(self, device_info):
         """
         Convert Robot SectionProxy / variable into a usable string.
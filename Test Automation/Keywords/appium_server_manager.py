@@ -0,0 +1,177 @@
+import os
+import time
+import shutil
+import threading
+import subprocess
+import urllib.request
+
+from robot.api import logger
+
+
+DEFAULT_SERVER_URL = "http://127.0.0.1:4723"
+
+# Port of the first [DUT.*] section for each kind; the n-th DUT gets base + n
+BASE_PORTS = {
+    "appium": 4723,
+    "systemPort": 8200,
+    "mjpegServerPort": 7810,
+}
+
+# [DUT.*] keys that configure the server and must not be sent as capabilities
+SERVER_KEYS = {"appium_server_url", "appium_auto_start", "appium_port", "systemport", "mjpegserverport"}
+
+
+class AppiumServerManager:
+    """
+    Resolves the Appium endpoint and device-side ports for every DUT.
+
+    Per [DUT.*] section:
+        appium_server_url  explicit server (e.g. a remote Appium)
+        appium_auto_start  Yes → spawn a local `appium` on its own port
+        appium_port        port of the spawned server (default: 4723 + DUT index)
+        systemPort / mjpegServerPort   UiAutomator2 ports (default: 8200 / 7810 + DUT index)
+    Without any of these the DEFAULT appium_server_url (or 127.0.0.1:4723) is used;
+    the APPIUM_SERVER_URL environment variable replaces that shared server.
+    The DUT index is the position of its section in configurations.ini, so
+    parallel farm shards (separate processes) never pick the same port.
+    """
+
+    def __init__(self, config, log_dir=None, startup_timeout=60):
+        self.config = config
+        self.log_dir = log_dir
+        self.startup_timeout = startup_timeout
+
+        self._ports = {}
+        self._servers = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # PUBLIC
+    # ------------------------------------------------------------------
+    def endpoint(self, dut_name):
+        section = self.config[f"DUT.{dut_name}"]
+
+        url = section.get("appium_server_url")
+        shared_url = self.config.defaults().get("appium_server_url")
+
+        # A DUT-specific URL wins over auto start, the DEFAULT one does not
+        if url and url != shared_url:
+            return url.rstrip("/")
+
+        if section.get("appium_auto_start", "no").strip().lower() in ("yes", "true", "always"):
+            return self._ensure_server(dut_name)
+
+        return (os.environ.get("APPIUM_SERVER_URL") or url or DEFAULT_SERVER_URL).rstrip("/")
+
+    def device_ports(self, dut_name):
+        """Distinct systemPort / mjpegServerPort for the DUT's UiAutomator2 session."""
+        section = self.config[f"DUT.{dut_name}"]
+        return {
+            "systemPort": self._port(dut_name, "systemPort", section.get("systemPort")),
+            "mjpegServerPort": self._port(dut_name, "mjpegServerPort", section.get("mjpegServerPort")),
+        }
+
+    def capabilities(self, dut_name):
+        """
+        Capabilities from the [DUT.*] section without DEFAULT and server keys,
+        plus udid (device_id) and the DUT's UiAutomator2 ports.
+        """
+        section = self.config[f"DUT.{dut_name}"]
+        defaults = self.config.defaults()
+        caps = {
+            k: v for k, v in section.items()
+            if k not in defaults and k not in SERVER_KEYS
+        }
+        if "udid" not in caps and section.get("device_id"):
+            caps["udid"] = section.get("device_id")
+        for name, port in self.device_ports(dut_name).items():
+            caps[name] = port
+        return caps
+
+    def stop_all(self):
+        with self._lock:
+            servers = list(self._servers.items())
+            self._servers.clear()
+        for dut_name, (proc, url, log_file) in servers:
+            logger.info(f"🛑 Stopping Appium server for {dut_name} ({url})")
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+            if log_file:
+                log_file.close()
+
+    # ------------------------------------------------------------------
+    # INTERNAL
+    # ------------------------------------------------------------------
+    def _port(self, dut_name, kind, configured=None):
+        with self._lock:
+            key = (dut_name, kind)
+            if key in self._ports:
+                return self._ports[key]
+
+            if configured:
+                port = int(configured)
+            else:
+                port = BASE_PORTS[kind] + self._dut_index(dut_name)
+
+            self._ports[key] = port
+            return port
+
+    def _dut_index(self, dut_name):
+        duts = [s.split(".", 1)[1] for s in self.config.sections() if s.startswith("DUT.")]
+        return duts.index(dut_name)
+
+    def _ensure_server(self, dut_name):
+        with self._lock:
+            if dut_name in self._servers:
+                proc, url, _ = self._servers[dut_name]
+                if proc.poll() is None:
+                    return url
+
+        section = self.config[f"DUT.{dut_name}"]
+        port = self._port(dut_name, "appium", section.get("appium_port"))
+        url = f"http://127.0.0.1:{port}"
+
+        if self._is_up(url):
+            return url
+
+        appium = shutil.which("appium")
+        if not appium:
+            raise RuntimeError("❌ 'appium' executable not found on PATH (appium_auto_start = Yes)")
+
+        log_file = None
+        if self.log_dir:
+            os.makedirs(self.log_dir, exist_ok=True)
+            log_file = open(
+                os.path.join(self.log_dir, f"appium_{dut_name}_{port}.log"), "w", encoding="utf-8"
+            )
+
+        logger.info(f"🚀 Starting Appium server for {dut_name} on port {port}")
+        proc = subprocess.Popen(
+            [appium, "--address", "127.0.0.1", "--port", str(port),
+             "--allow-insecure", "uiautomator2:adb_shell"],
+            stdout=log_file or subprocess.DEVNULL,
+            stderr=subprocess.STDOUT,
+        )
+
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if proc.poll() is not None:
+                raise RuntimeError(f"❌ Appium server for {dut_name} exited with code {proc.returncode}")
+            if self._is_up(url):
+                with self._lock:
+                    self._servers[dut_name] = (proc, url, log_file)
+                return url
+            time.sleep(0.5)
+
+        proc.terminate()
+        raise RuntimeError(f"❌ Appium server for {dut_name} did not start within {self.startup_timeout}s")
+
+    def _is_up(self, url):
+        try:
+            with urllib.request.urlopen(f"{url}/status", timeout=2) as response:
+                return response.status == 200
+        except Exception:
+            return False
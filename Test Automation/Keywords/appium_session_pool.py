@@ -0,0 +1,277 @@
+import time
+import inspect
+import functools
+import threading
+from contextlib import contextmanager
+
+from robot.api import logger
+
+
+class _PooledSession:
+    def __init__(self, driver=None):
+        self.driver = driver
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.last_checked = self.created
+
+    @property
+    def pending(self):
+        # Slot reserved while the factory creates the driver
+        return self.driver is None
+
+
+class AppiumSessionPool:
+    """
+    One Appium session per DUT, shared between keywords.
+
+    - A cached session is validated with a cheap status call (GET timeouts)
+      before reuse and recreated transparently when it is dead.
+    - Keywords lease the DUT's session while they run (see `uses_session`);
+      leased sessions are never quit by the pool and their idle time
+      starts when the last lease ends.
+    - Sessions idle longer than `idle_timeout` seconds are quit.
+    - At most `max_sessions` sessions exist: the slot is reserved before the
+      driver is created, the least recently used idle session is quit to
+      make room, and when all are leased get() waits up to `slot_timeout`.
+    """
+
+    def __init__(self, factory, max_sessions=4, idle_timeout=300.0, health_check_interval=5.0,
+                 slot_timeout=120.0):
+        self._factory = factory
+        self.max_sessions = max(1, int(max_sessions))
+        self.idle_timeout = float(idle_timeout)
+        self.health_check_interval = float(health_check_interval)
+        self.slot_timeout = float(slot_timeout)
+
+        self._sessions = {}
+        self._leases = {}
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._dut_locks = {}
+        self._reaper = None
+        self._closed = threading.Event()
+
+    # ------------------------------------------------------------------
+    # PUBLIC
+    # ------------------------------------------------------------------
+    def get(self, dut_name):
+        """Returns a live driver for the DUT, creating one if needed."""
+        with self._dut_lock(dut_name):
+            self.evict_idle()
+
+            with self._lock:
+                session = self._sessions.get(dut_name)
+
+            if session is not None:
+                if self._is_alive(session):
+                    session.last_used = time.monotonic()
+                    return session.driver
+                logger.warn(f"⚠️ Appium session for {dut_name} is dead, recreating it")
+                self.release(dut_name)
+
+            self._reserve(dut_name)
+            try:
+                driver = self._factory(dut_name)
+            except BaseException:
+                # Give the reserved slot back
+                with self._lock:
+                    session = self._sessions.get(dut_name)
+                    if session is not None and session.pending:
+                        del self._sessions[dut_name]
+                    self._slot_freed.notify_all()
+                raise
+
+            with self._lock:
+                self._sessions[dut_name] = _PooledSession(driver)
+            self._start_reaper()
+            return driver
+
+    def release(self, dut_name):
+        """Quits and forgets the DUT's session (if any)."""
+        with self._lock:
+            session = self._sessions.get(dut_name)
+            if session is None or session.pending:
+                return
+            del self._sessions[dut_name]
+            self._slot_freed.notify_all()
+        self._quit(dut_name, session)
+
+    def acquire_lease(self, dut_name):
+        """Marks the DUT's session in use; eviction skips it until release_lease()."""
+        with self._lock:
+            self._leases[dut_name] = self._leases.get(dut_name, 0) + 1
+
+    def release_lease(self, dut_name):
+        with self._lock:
+            count = self._leases.get(dut_name, 0) - 1
+            if count > 0:
+                self._leases[dut_name] = count
+                return
+            self._leases.pop(dut_name, None)
+            session = self._sessions.get(dut_name)
+            if session is not None:
+                session.last_used = time.monotonic()
+            self._slot_freed.notify_all()
+
+    @contextmanager
+    def lease(self, dut_name):
+        self.acquire_lease(dut_name)
+        try:
+            yield
+        finally:
+            self.release_lease(dut_name)
+
+    def evict_idle(self):
+        if self.idle_timeout <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                self._take_idle(dut) for dut, s in list(self._sessions.items())
+                if now - s.last_used > self.idle_timeout
+            ]
+        for taken in filter(None, idle):
+            logger.info(f"Evicting idle Appium session for {taken[0]}")
+            self._quit_taken(*taken)
+
+    def close_all(self):
+        self._closed.set()
+        with self._lock:
+            self._reaper = None
+            self._closed = threading.Event()
+            sessions = [(d, s) for d, s in self._sessions.items() if not s.pending]
+            for dut, _ in sessions:
+                del self._sessions[dut]
+            self._slot_freed.notify_all()
+        for dut, session in sessions:
+            self._quit(dut, session)
+
+    def duts(self):
+        with self._lock:
+            return [d for d, s in self._sessions.items() if not s.pending]
+
+    # ------------------------------------------------------------------
+    # INTERNAL
+    # ------------------------------------------------------------------
+    def _dut_lock(self, dut_name):
+        with self._lock:
+            return self._dut_locks.setdefault(dut_name, threading.Lock())
+
+    def _is_alive(self, session):
+        now = time.monotonic()
+        if now - session.last_checked < self.health_check_interval:
+            return True
+        try:
+            session.driver.timeouts
+        except Exception:
+            return False
+        session.last_checked = now
+        return True
+
+    def _take_idle(self, dut_name):
+        """
+        Removes the DUT's session from the pool if nobody uses it: not
+        leased, not being created and its DUT lock free. Returns
+        (dut, session, held DUT lock) or None. Caller holds `_lock`.
+        """
+        session = self._sessions.get(dut_name)
+        if session is None or session.pending or self._leases.get(dut_name):
+            return None
+        dut_lock = self._dut_locks.setdefault(dut_name, threading.Lock())
+        if not dut_lock.acquire(blocking=False):
+            return None
+        del self._sessions[dut_name]
+        self._slot_freed.notify_all()
+        return dut_name, session, dut_lock
+
+    def _quit_taken(self, dut_name, session, dut_lock):
+        try:
+            self._quit(dut_name, session)
+        finally:
+            dut_lock.release()
+
+    def _reserve(self, dut_name):
+        """Reserves a session slot for the DUT, quitting the LRU idle session when full."""
+        deadline = time.monotonic() + self.slot_timeout
+        while True:
+            with self._lock:
+                if len(self._sessions) < self.max_sessions:
+                    self._sessions[dut_name] = _PooledSession()
+                    return
+
+                candidates = sorted(
+                    (d for d in self._sessions if d != dut_name),
+                    key=lambda d: self._sessions[d].last_used,
+                )
+                taken = next(filter(None, map(self._take_idle, candidates)), None)
+                if taken is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise AssertionError(
+                            f"❌ All {self.max_sessions} Appium sessions are in use, "
+                            f"no slot for {dut_name} after {self.slot_timeout:g}s"
+                        )
+                    self._slot_freed.wait(min(remaining, 1.0))
+                    continue
+
+            logger.info(f"Appium session limit ({self.max_sessions}) reached, closing {taken[0]}")
+            self._quit_taken(*taken)
+
+    def _quit(self, dut_name, session):
+        try:
+            session.driver.quit()
+        except Exception as e:
+            logger.debug(f"Ignoring error while quitting session for {dut_name}: {e}")
+
+    def _start_reaper(self):
+        if self._reaper is not None or self.idle_timeout <= 0:
+            return
+
+        closed = self._closed
+
+        def reap():
+            while not closed.wait(max(1.0, self.idle_timeout / 2)):
+                self.evict_idle()
+
+        self._reaper = threading.Thread(target=reap, name="appium-session-reaper", daemon=True)
+        self._reaper.start()
+
+
+def uses_session(method):
+    """
+    Keyword decorator: leases the `dut_name` session for the whole call,
+    so idle eviction and the session limit never quit it mid-keyword.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            dut_name = signature.bind(self, *args, **kwargs).arguments.get("dut_name")
+        except TypeError:
+            dut_name = None
+        if not dut_name:
+            return method(self, *args, **kwargs)
+        with self.sessions.lease(dut_name):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class SessionPoolCloser:
+    """
+    Library listener that quits every pooled session when the
+    keyword library goes out of scope, then runs `on_close`
+    (e.g. stopping spawned Appium servers).
+    """
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, pool, on_close=None):
+        self.pool = pool
+        self.on_close = on_close
+
+    def close(self):
+        self.pool.close_all()
+        if self.on_close:
+            self.on_close()
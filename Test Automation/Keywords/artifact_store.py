@@ -0,0 +1,319 @@
+"""
+Content-addressed screenshots for the Robot log.
+
+    ${OUTPUT DIR}/artifacts/<hash>.png          full resolution original
+    ${OUTPUT DIR}/artifacts/<hash>.thumb.jpg    small preview embedded in log.html
+
+The hash covers the pixels, so an identical frame is written once however
+many keywords log it, and names never collide between keywords or DUTs.
+Highlighted frames are drawn and encoded by background render workers
+(save_annotated); the listener flush()es them before a test ends.
+
+With enable_screen_artifacts = Yes nothing is written while a test runs:
+the last artifact_ring_size frames per DUT stay in memory and the listener
+persist()s them only when the test fails (Always: write every frame,
+No: keep none).
+Screenshots pulled from devices go to a per-run temporary folder that the
+listener removes when the run ends.
+"""
+
+import os
+import shutil
+import hashlib
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from robot.api import logger
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+
+from Keywords.lazy_imports import lazy_module
+from Keywords.tracing import span
+
+cv2 = lazy_module("cv2")
+np = lazy_module("numpy")
+
+
+ARTIFACTS_DIR = "artifacts"
+THUMB_FORMATS = ("jpg", "webp")
+POLICIES = ("always", "yes", "no")
+
+# Returned instead of an entry when a frame is only kept in memory
+RETAINED = {"hash": None, "path": None, "thumb": None, "href": None, "thumb_href": None, "new": False}
+
+
+class ArtifactStore:
+
+    def __init__(self, thumb_width=360, thumb_format="jpg", thumb_quality=80, render_workers=2,
+                 policy="always", ring_size=5):
+        self.thumb_width = thumb_width
+        self.thumb_format = thumb_format
+        self.thumb_quality = thumb_quality
+        self.render_workers = render_workers
+        self.policy = policy
+        self.ring_size = ring_size
+
+        self.saved = 0
+        self.deduplicated = 0
+        self._temp_dir = None
+        self._pool = None
+        self._pending = {}
+        self._errors = []
+        self._rings = {}
+        self._lock = threading.Lock()
+
+    def configure(self, config):
+        """Thumbnail settings from configurations.ini (artifact_thumbnail_*)."""
+        self.thumb_width = config.getint("DEFAULT", "artifact_thumbnail_width", fallback=360)
+        self.thumb_format = config.get("DEFAULT", "artifact_thumbnail_format", fallback="jpg").strip().lower()
+        if self.thumb_format not in THUMB_FORMATS:
+            raise AssertionError(
+                f"Unknown artifact_thumbnail_format '{self.thumb_format}' (use {', '.join(THUMB_FORMATS)})"
+            )
+        # 0 renders highlights synchronously inside the keyword
+        self.render_workers = config.getint("DEFAULT", "artifact_render_workers", fallback=2)
+
+        self.policy = config.get("DEFAULT", "enable_screen_artifacts", fallback="Always").strip().lower()
+        if self.policy not in POLICIES:
+            raise AssertionError(f"Unknown enable_screen_artifacts '{self.policy}' (use Always, Yes or No)")
+        self.ring_size = max(1, config.getint("DEFAULT", "artifact_ring_size", fallback=5))
+
+    # ------------------------------------------------------------------
+    # PUBLIC
+    # ------------------------------------------------------------------
+    def save_image(self, image, output_dir, encoded=None, ext=".png", dut=None, label=None):
+        """
+        Stores a BGR image (or its already `encoded` bytes) plus thumbnail.
+        Returns {"hash", "path", "thumb", "href", "thumb_href", "new"}, or
+        RETAINED when the policy keeps the frame in the DUT's ring instead.
+        """
+        if self._retain(dut, label, image, encoded=encoded, ext=ext):
+            return RETAINED
+        entry = self._entry(self._hash(image), output_dir, ext)
+        if self._exists(entry):
+            return entry
+        self._store(entry, image, encoded)
+        return entry
+
+    def save_annotated(self, image, boxes, output_dir, color=(0, 0, 255), thickness=3,
+                       dut=None, label=None):
+        """
+        save_image() of `image` with `boxes` [(x1, y1, x2, y2)] drawn on it.
+        Copying, drawing and encoding run on the render workers, so the entry
+        (and its log links) is returned at once; flush() waits for the files.
+        `image` must not be modified afterwards.
+        """
+        boxes = [tuple(int(v) for v in box) for box in boxes]
+        if self._retain(dut, label, image, boxes=boxes, color=color, thickness=thickness):
+            return RETAINED
+        entry = self._entry(self._hash(image, (boxes, color, thickness)), output_dir, ".png")
+        if self._exists(entry):
+            return entry
+
+        if self.render_workers <= 0:
+            self._render(entry, image, boxes, color, thickness)
+            return entry
+
+        with self._lock:
+            if entry["hash"] in self._pending:
+                self.deduplicated += 1
+                return entry
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.render_workers, thread_name_prefix="artifact-render"
+                )
+            future = self._pool.submit(self._render, entry, image, boxes, color, thickness)
+            self._pending[entry["hash"]] = future
+        future.add_done_callback(lambda f, key=entry["hash"]: self._done(key, f))
+        return entry
+
+    def flush(self, timeout=None):
+        """Waits for queued renders; returns the errors collected since the last flush."""
+        with self._lock:
+            futures = list(self._pending.values())
+        if futures:
+            with span("artifact.flush", pending=len(futures)):
+                wait(futures, timeout=timeout)
+        with self._lock:
+            errors, self._errors = self._errors, []
+        return errors
+
+    def html(self, entry, label=None, width="300px"):
+        """Thumbnail linking to the full resolution original ("" for RETAINED)."""
+        if not entry["href"]:
+            return ""
+        title = f"<b>{label}</b><br>" if label else ""
+        return (
+            f"{title}<a href='{entry['href']}' target='_blank'>"
+            f"<img src='{entry['thumb_href']}' width='{width}'></a>"
+        )
+
+    def log(self, entry, label=None, width="300px"):
+        """Logs the thumbnail unless the frame was only retained."""
+        if entry["href"]:
+            logger.info(self.html(entry, label, width), html=True)
+
+    # ------------------------------------------------------------------
+    # FAILURE-ONLY RETENTION (listener)
+    # ------------------------------------------------------------------
+    def begin_test(self):
+        with self._lock:
+            self._rings.clear()
+
+    def discard(self):
+        self.begin_test()
+
+    def persist(self, output_dir):
+        """
+        Writes the retained frames of the current test.
+        Returns [(dut, label, entry)] oldest first.
+        """
+        with self._lock:
+            rings, self._rings = self._rings, {}
+
+        persisted = []
+        for dut, ring in rings.items():
+            for item in ring:
+                image, boxes = item["image"], item["boxes"]
+                if boxes is None:
+                    entry = self._entry(self._hash(image), output_dir, item["ext"])
+                    if not self._exists(entry):
+                        self._store(entry, image, item["encoded"])
+                else:
+                    extra = (boxes, item["color"], item["thickness"])
+                    entry = self._entry(self._hash(image, extra), output_dir, ".png")
+                    if not self._exists(entry):
+                        self._render(entry, image, *extra)
+                persisted.append((dut, item["label"], entry))
+        return persisted
+
+    def temp_path(self, file_name):
+        """Path in the per-run temporary folder (removed by cleanup())."""
+        with self._lock:
+            if self._temp_dir is None or not os.path.isdir(self._temp_dir):
+                self._temp_dir = tempfile.mkdtemp(prefix="rf_artifacts_")
+            return os.path.join(self._temp_dir, file_name)
+
+    def cleanup(self):
+        self.flush()
+        with self._lock:
+            pool, self._pool = self._pool, None
+            temp_dir, self._temp_dir = self._temp_dir, None
+        if pool:
+            pool.shutdown(wait=True)
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # INTERNAL
+    # ------------------------------------------------------------------
+    def _retain(self, dut, label, image, encoded=None, ext=".png", boxes=None, color=None, thickness=None):
+        """True when the policy keeps (Yes) or drops (No) the frame instead of writing it."""
+        if self.policy == "always":
+            return False
+        if self.policy == "yes":
+            with self._lock:
+                ring = self._rings.setdefault(dut, deque(maxlen=self.ring_size))
+                ring.append({
+                    "label": label, "image": image, "encoded": encoded, "ext": ext,
+                    "boxes": boxes, "color": color, "thickness": thickness,
+                })
+        return True
+
+    def _hash(self, image, extra=None):
+        with span("artifact.hash"):
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(str(image.shape).encode())
+            digest.update(np.ascontiguousarray(image).data)
+            if extra is not None:
+                digest.update(repr(extra).encode())
+            return digest.hexdigest()
+
+    def _link_base(self, output_dir):
+        """
+        Folder the log links are relative to (same as the listener's):
+        Tools/device_farm.py merges the shard logs one level up.
+        """
+        try:
+            farm_dir = BuiltIn().get_variable_value("${FARM_OUTPUT_DIR}", default=None)
+        except RobotNotRunningError:
+            farm_dir = None
+        return farm_dir or output_dir
+
+    def _entry(self, key, output_dir, ext):
+        folder = os.path.join(output_dir, ARTIFACTS_DIR)
+        name, thumb_name = f"{key}{ext}", f"{key}.thumb.{self.thumb_format}"
+        path, thumb = os.path.join(folder, name), os.path.join(folder, thumb_name)
+        base = self._link_base(output_dir)
+        return {
+            "hash": key,
+            "path": path,
+            "thumb": thumb,
+            "href": os.path.relpath(path, base).replace("\\", "/"),
+            "thumb_href": os.path.relpath(thumb, base).replace("\\", "/"),
+            "new": False,
+        }
+
+    def _exists(self, entry):
+        if os.path.isfile(entry["path"]) and os.path.isfile(entry["thumb"]):
+            with self._lock:
+                self.deduplicated += 1
+            return True
+        return False
+
+    def _store(self, entry, image, encoded=None):
+        os.makedirs(os.path.dirname(entry["path"]), exist_ok=True)
+        if encoded is None:
+            ext = os.path.splitext(entry["path"])[1]
+            with span("imencode", ext=ext):
+                ok, buffer = cv2.imencode(ext, image)
+            if not ok:
+                raise AssertionError(f"Failed to encode artifact as {ext}")
+            encoded = buffer.tobytes()
+        with span("imwrite"):
+            self._write(entry["path"], encoded)
+            self._write(entry["thumb"], self._thumbnail(image))
+
+        entry["new"] = True
+        with self._lock:
+            self.saved += 1
+
+    def _render(self, entry, image, boxes, color, thickness):
+        with span("highlight", boxes=len(boxes)):
+            annotated = image.copy()
+            for x1, y1, x2, y2 in boxes:
+                cv2.rectangle(annotated, (x1, y1), (x2, y2), color, thickness)
+        self._store(entry, annotated)
+
+    def _done(self, key, future):
+        with self._lock:
+            self._pending.pop(key, None)
+            if future.exception() is not None:
+                self._errors.append(f"{key}: {future.exception()}")
+
+    def _thumbnail(self, image):
+        h, w = image.shape[:2]
+        if w > self.thumb_width:
+            size = (self.thumb_width, max(1, round(h * self.thumb_width / w)))
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+        if self.thumb_format == "webp":
+            params = [cv2.IMWRITE_WEBP_QUALITY, self.thumb_quality]
+        else:
+            params = [cv2.IMWRITE_JPEG_QUALITY, self.thumb_quality]
+        with span("imencode", ext=self.thumb_format):
+            ok, buffer = cv2.imencode(f".{self.thumb_format}", image, params)
+        if not ok:
+            raise AssertionError(f"Failed to encode thumbnail as {self.thumb_format}")
+        return buffer.tobytes()
+
+    def _write(self, path, data):
+        # Parallel DUTs may store the same frame at once
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+STORE = ArtifactStore()
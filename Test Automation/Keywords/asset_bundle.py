@@ -0,0 +1,250 @@
+"""
+Precompiled reference assets (Resources/bundle), built offline by
+`python -m Tools.build_asset_bundle` from Resources/images.
+
+    index.json                            source PNG → arrays, size, mtime, sha1
+    <stem>.<sha1[:10]>.color.npy          BGR, as cv2.imread returns it
+    <stem>.<sha1[:10]>.gray.npy           cv2.cvtColor(color, BGR2GRAY)
+    <stem>.<sha1[:10]>.<algo>.points.npy  optional feature descriptors
+    <stem>.<sha1[:10]>.<algo>.descriptors.npy
+
+Arrays are opened with np.load(mmap_mode="r"): no PNG decode, and every
+Robot process on the machine shares the same pages from the page cache.
+A bundled asset is only used while its source PNG is unchanged; anything
+stale or missing is decoded from the PNG as before.
+"""
+
+import os
+import json
+import hashlib
+import threading
+
+from Keywords.lazy_imports import lazy_module
+
+cv2 = lazy_module("cv2")
+np = lazy_module("numpy")
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+IMAGES_DIR = os.path.join(PROJECT_ROOT, "Resources", "images")
+BUNDLE_DIR = os.path.join(PROJECT_ROOT, "Resources", "bundle")
+INDEX_JSON = "index.json"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssetBundle:
+    """Read side of the bundle; the index is re-read when index.json changes."""
+
+    def __init__(self, bundle_dir=BUNDLE_DIR):
+        self.bundle_dir = bundle_dir
+
+        self._index = {}
+        self._index_mtime = None
+        self._arrays = {}
+        self._fresh = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # PUBLIC
+    # ------------------------------------------------------------------
+    def color(self, image_path):
+        """BGR reference image (read-only when bundled); None if unreadable."""
+        array = self.array(image_path, "color")
+        return array if array is not None else cv2.imread(image_path)
+
+    def gray(self, image_path, color=None):
+        """Grayscale reference; `color` avoids a second decode when not bundled."""
+        array = self.array(image_path, "gray")
+        if array is not None:
+            return array
+        color = self.color(image_path) if color is None else color
+        return None if color is None else cv2.cvtColor(color, cv2.COLOR_BGR2GRAY)
+
+    def features(self, image_path, algo):
+        """(points, descriptors, (w, h)) when the bundle holds `algo` descriptors."""
+        points = self.array(image_path, f"{algo}.points")
+        descriptors = self.array(image_path, f"{algo}.descriptors")
+        if points is None or descriptors is None:
+            return None
+        h, w = self._entry(image_path)[1]["shape"][:2]
+        return points, descriptors, (w, h)
+
+    def array(self, image_path, kind):
+        """Memory-mapped array of `kind` for `image_path`, or None if absent / stale."""
+        found = self._entry(image_path)
+        if found is None:
+            return None
+        key, entry = found
+        file_name = entry["arrays"].get(kind)
+        if file_name is None or not self._is_fresh(image_path, key, entry):
+            return None
+
+        path = os.path.join(self.bundle_dir, file_name)
+        with self._lock:
+            array = self._arrays.get(path)
+        if array is None:
+            try:
+                array = np.load(path, mmap_mode="r")
+            except (OSError, ValueError):
+                return None
+            with self._lock:
+                self._arrays[path] = array
+        return array
+
+    def stale(self, images_dir=IMAGES_DIR):
+        """Source images that are missing from the bundle or changed since the build."""
+        result = []
+        for name in sorted(os.listdir(images_dir)):
+            if not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            path = os.path.join(images_dir, name)
+            found = self._entry(path)
+            if found is None or not self._is_fresh(path, *found):
+                result.append(name)
+        return result
+
+    # ------------------------------------------------------------------
+    # INTERNAL
+    # ------------------------------------------------------------------
+    def _load_index(self):
+        path = os.path.join(self.bundle_dir, INDEX_JSON)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        with self._lock:
+            if mtime == self._index_mtime:
+                return self._index
+
+        index = {}
+        if mtime is not None:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = {}
+
+        with self._lock:
+            self._index, self._index_mtime = index, mtime
+            self._arrays.clear()
+            self._fresh.clear()
+        return index
+
+    def _entry(self, image_path):
+        index = self._load_index()
+        if not index:
+            return None
+        source_dir = os.path.normpath(os.path.join(self.bundle_dir, index.get("source_dir", "")))
+        key = os.path.relpath(os.path.abspath(image_path), source_dir).replace(os.sep, "/")
+        entry = index.get("assets", {}).get(key)
+        return (key, entry) if entry else None
+
+    def _is_fresh(self, image_path, key, entry):
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return False
+        if stat.st_size != entry["bytes"]:
+            return False
+        if stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+
+        # mtime moved (checkout, copy): compare content once per mtime
+        with self._lock:
+            cached = self._fresh.get(key)
+        if cached and cached[0] == stat.st_mtime_ns:
+            return cached[1]
+        fresh = file_sha1(image_path) == entry["sha1"]
+        with self._lock:
+            self._fresh[key] = (stat.st_mtime_ns, fresh)
+        return fresh
+
+
+# ----------------------------------------------------------------------
+# BUILD
+# ----------------------------------------------------------------------
+def _save(bundle_dir, file_name, array):
+    path = os.path.join(bundle_dir, file_name)
+    if os.path.isfile(path):
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(array))
+    os.replace(tmp_path, path)
+
+
+def build(images_dir=IMAGES_DIR, bundle_dir=BUNDLE_DIR, descriptors=()):
+    """
+    Compiles every image in `images_dir` into `bundle_dir` and returns the index.
+    Array files are named after the source content, so unchanged images are
+    skipped and files mapped by running processes are never overwritten.
+    """
+    from Keywords import feature_matching
+
+    os.makedirs(bundle_dir, exist_ok=True)
+    assets = {}
+
+    for name in sorted(os.listdir(images_dir)):
+        if not name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        path = os.path.join(images_dir, name)
+        color = cv2.imread(path)
+        if color is None:
+            continue
+
+        sha1 = file_sha1(path)
+        stem = f"{os.path.splitext(name)[0]}.{sha1[:10]}"
+        arrays = {"color": f"{stem}.color.npy", "gray": f"{stem}.gray.npy"}
+
+        gray = cv2.cvtColor(color, cv2.COLOR_BGR2GRAY)
+        _save(bundle_dir, arrays["color"], color)
+        _save(bundle_dir, arrays["gray"], gray)
+
+        for algo in descriptors:
+            points, desc, _ = feature_matching.compute_features(path, algo)
+            arrays[f"{algo}.points"] = f"{stem}.{algo}.points.npy"
+            arrays[f"{algo}.descriptors"] = f"{stem}.{algo}.descriptors.npy"
+            _save(bundle_dir, arrays[f"{algo}.points"], points)
+            _save(bundle_dir, arrays[f"{algo}.descriptors"], desc)
+
+        stat = os.stat(path)
+        assets[name] = {
+            "bytes": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha1": sha1,
+            "shape": list(color.shape),
+            "arrays": arrays,
+        }
+
+    index = {
+        "version": 1,
+        "source_dir": os.path.relpath(images_dir, bundle_dir).replace(os.sep, "/"),
+        "descriptors": list(descriptors),
+        "assets": assets,
+    }
+    index_path = os.path.join(bundle_dir, INDEX_JSON)
+    with open(f"{index_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(f"{index_path}.tmp", index_path)
+
+    # Arrays of replaced images; still mapped files (Windows) stay until next build
+    used = {f for entry in assets.values() for f in entry["arrays"].values()}
+    for file_name in os.listdir(bundle_dir):
+        if file_name.endswith(".npy") and file_name not in used:
+            try:
+                os.remove(os.path.join(bundle_dir, file_name))
+            except OSError:
+                pass
+    return index
+
+
+BUNDLE = AssetBundle()
@@ -0,0 +1,113 @@
+"""
+Coordinate maps (Resources/coordinates/<name>.json).
+
+    {
+        "_reference": {"width": 1440, "height": 3120},    optional
+        "search_icon": {"x": 625, "y": 2593},
+        "play_button": {"x": 0.5, "y": 0.82}
+    }
+
+Points are scaled to the device screen:
+  - floats between 0 and 1 are normalised (fraction of width / height)
+  - other values are pixels on the `_reference` resolution, or absolute
+    pixels when the map has no `_reference`.
+"""
+
+import os
+import json
+import threading
+
+
+REFERENCE_KEY = "_reference"
+
+
+class CoordinateMapCache:
+    """Parsed coordinate maps, re-read only when the file's mtime changes."""
+
+    def __init__(self):
+        self._maps = {}
+        self._dirs = {}
+        self._lock = threading.Lock()
+
+    def resolve_dir(self, project_root):
+        """Resources/coordinates, matched case-insensitively (Linux is case-sensitive)."""
+        with self._lock:
+            if project_root in self._dirs:
+                return self._dirs[project_root]
+
+        resources = os.path.join(project_root, "Resources")
+        folder = os.path.join(resources, "coordinates")
+        if os.path.isdir(resources):
+            for name in os.listdir(resources):
+                if name.lower() == "coordinates" and os.path.isdir(os.path.join(resources, name)):
+                    folder = os.path.join(resources, name)
+                    break
+
+        with self._lock:
+            self._dirs[project_root] = folder
+        return folder
+
+    def load(self, project_root, json_name):
+        folder = self.resolve_dir(project_root)
+        path = os.path.join(folder, json_name)
+
+        if not os.path.isfile(path) and os.path.isdir(folder):
+            for name in os.listdir(folder):
+                if name.lower() == json_name.lower():
+                    path = os.path.join(folder, name)
+                    break
+
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            raise AssertionError(f"JSON file not found: {path}")
+
+        with self._lock:
+            cached = self._maps.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        with self._lock:
+            self._maps[path] = (mtime, data)
+        return data
+
+
+def _is_normalised(value):
+    return isinstance(value, float) and 0.0 <= value <= 1.0
+
+
+def needs_screen_size(data, key_name):
+    point = data.get(key_name) or {}
+    return REFERENCE_KEY in data or _is_normalised(point.get("x")) or _is_normalised(point.get("y"))
+
+
+def resolve_point(data, key_name, screen_size=None):
+    """(x, y) in device pixels for `key_name`; screen_size = (width, height)."""
+    if key_name not in data or key_name == REFERENCE_KEY:
+        raise AssertionError(f"Key '{key_name}' not found in coordinate map")
+
+    x = data[key_name].get("x")
+    y = data[key_name].get("y")
+    if x is None or y is None:
+        raise AssertionError("JSON key must contain 'x' and 'y'")
+
+    if screen_size is None:
+        return int(x), int(y)
+
+    width, height = screen_size
+    reference = data.get(REFERENCE_KEY) or {}
+
+    def scale(value, size, ref_size):
+        if _is_normalised(value):
+            return int(round(value * size))
+        if ref_size:
+            return int(round(value * size / ref_size))
+        return int(value)
+
+    return scale(x, width, reference.get("width")), scale(y, height, reference.get("height"))
+
+
+MAPS = CoordinateMapCache()
@@ -0,0 +1,194 @@
+import html
+import time
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from robot.api import TypeInfo, logger
+from robot.output import librarylogger
+
+
+class DutResult:
+    """Outcome of one keyword call on one DUT."""
+
+    def __init__(self, dut, status, value=None, error=None, elapsed=0.0):
+        self.dut = dut
+        self.status = status
+        self.value = value
+        self.error = error
+        self.elapsed = elapsed
+        # (msg, level, html) logged by the call, see replay_logs
+        self.logs = []
+
+
+# ----------------------------------------------------------------------
+# WORKER LOGS
+# ----------------------------------------------------------------------
+# Robot drops logger calls made outside the main thread; fan-out workers
+# collect theirs here and run_on_duts replays them afterwards.
+_capture = threading.local()
+_capture_lock = threading.Lock()
+
+
+def _install_capture():
+    with _capture_lock:
+        if getattr(librarylogger.write, "_dut_fanout", False):
+            return
+        original = librarylogger.write
+
+        def write(msg, level="INFO", html=False, *args, **kwargs):
+            records = getattr(_capture, "records", None)
+            if records is None:
+                return original(msg, level, html, *args, **kwargs)
+            records.append((msg, level, html))
+
+        write._dut_fanout = True
+        librarylogger.write = write
+
+
+def replay_logs(results):
+    """Writes each DUT's captured log messages to the Robot log, one section per DUT."""
+    for r in results:
+        if not r.logs:
+            continue
+        logger.info(f"<b>── {html.escape(r.dut)} ──</b>", html=True)
+        for msg, level, is_html in r.logs:
+            logger.write(msg, level, is_html)
+
+
+def parse_duts(duts):
+    """Accepts 'Phone, Main' or a list and returns ['Phone', 'Main']."""
+    if isinstance(duts, str):
+        duts = duts.split(",")
+    return [str(d).strip() for d in duts if str(d).strip()]
+
+
+def resolve_keyword(library, keyword_name):
+    """
+    Maps a Robot keyword name ('Click By Image', 'adb_keywords.Click By Image'
+    or 'click_by_image') to the bound library method.
+    The keyword must take a `dut_name` argument.
+    """
+    name = keyword_name.split(".")[-1].strip().lower().replace(" ", "_")
+    method = getattr(library, name, None)
+    if name.startswith("_") or not callable(method):
+        raise AssertionError(f"Keyword '{keyword_name}' not found in {type(library).__name__}")
+    if "dut_name" not in inspect.signature(method).parameters:
+        raise AssertionError(f"Keyword '{keyword_name}' does not take a dut_name argument")
+    return method
+
+
+def _convert(param, value):
+    """Robot's argument conversion, which a direct method call skips ('0.9' → 0.9)."""
+    if not isinstance(value, str):
+        return value
+    if param.annotation is not param.empty:
+        hint = param.annotation
+    elif param.default is not param.empty and param.default is not None:
+        hint = type(param.default)
+    else:
+        return value
+    if hint is str:
+        return value
+    try:
+        return TypeInfo.from_type_hint(hint).convert(value, name=param.name)
+    except (ValueError, TypeError) as e:
+        raise AssertionError(str(e))
+
+
+def bind_dut(method, dut, args=(), kwargs=None):
+    """
+    Returns (args, kwargs) for calling `method` on `dut`. dut_name goes into
+    its positional slot when the positional args reach it (e.g. Click By
+    Image    img.png    0.9), otherwise it is passed by name.
+    """
+    signature = inspect.signature(method)
+    args, kwargs = list(args), dict(kwargs or {})
+    names = [
+        p.name for p in signature.parameters.values()
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+    ]
+    index = names.index("dut_name")
+    if len(args) > index:
+        args.insert(index, dut)
+    else:
+        kwargs["dut_name"] = dut
+    try:
+        bound = signature.bind(*args, **kwargs)
+    except TypeError as e:
+        raise AssertionError(f"Invalid arguments for {method.__name__}: {e}")
+
+    for name, value in bound.arguments.items():
+        param = signature.parameters[name]
+        if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY):
+            bound.arguments[name] = _convert(param, value)
+    return list(bound.args), bound.kwargs
+
+
+def run_on_duts(method, duts, args=(), kwargs=None, sync_start=False,
+                max_workers=None, start_timeout=60):
+    """
+    Calls `method` with dut_name=<dut> (see bind_dut) for every DUT on a
+    thread pool and returns a DutResult per DUT (input order). With
+    sync_start all calls wait on a barrier so the device actions start at
+    the same moment; the pool then gets one thread per DUT. What the calls
+    log is written to the Robot log per DUT once all of them finished.
+    """
+    duts = parse_duts(duts)
+    if not duts:
+        return []
+
+    # Fail on bad arguments once, before anything runs on a device
+    calls = {dut: bind_dut(method, dut, args, kwargs) for dut in duts}
+
+    barrier = threading.Barrier(len(duts)) if sync_start and len(duts) > 1 else None
+    if barrier:
+        # Every party must hold a thread or the barrier never fills
+        max_workers = max(max_workers or 0, len(duts))
+
+    def call(dut):
+        try:
+            if barrier:
+                barrier.wait(start_timeout)
+        except threading.BrokenBarrierError:
+            return DutResult(dut, "FAIL", error="Start barrier broken (another DUT failed to start)")
+
+        call_args, call_kwargs = calls[dut]
+        _capture.records = records = []
+        start = time.perf_counter()
+        try:
+            value = method(*call_args, **call_kwargs)
+            result = DutResult(dut, "PASS", value=value, elapsed=time.perf_counter() - start)
+        except Exception as e:
+            result = DutResult(
+                dut, "FAIL", error=f"{type(e).__name__}: {e}",
+                elapsed=time.perf_counter() - start
+            )
+        finally:
+            _capture.records = None
+        result.logs = records
+        return result
+
+    _install_capture()
+    with ThreadPoolExecutor(max_workers=max_workers or len(duts)) as pool:
+        results = list(pool.map(call, duts))
+    replay_logs(results)
+    return results
+
+
+def results_html(keyword_name, results):
+    """HTML table with one row per DUT for the Robot log."""
+    rows = ""
+    for r in results:
+        color = "#e6ffed" if r.status == "PASS" else "#ffe6e6"
+        detail = r.error if r.error else ("" if r.value is None else r.value)
+        rows += (
+            f"<tr style='background:{color}'><td>{html.escape(r.dut)}</td><td>{r.status}</td>"
+            f"<td>{r.elapsed:.3f}s</td><td>{html.escape(str(detail))}</td></tr>"
+        )
+    return (
+        f"<b>🔀 {html.escape(keyword_name)} on {len(results)} DUT(s)</b>"
+        "<table border='1' cellpadding='4' cellspacing='0' style='border-collapse:collapse'>"
+        "<tr><th>DUT</th><th>Status</th><th>Duration</th><th>Result / Error</th></tr>"
+        f"{rows}</table>"
+    )
@@ -0,0 +1,140 @@
+import os
+import threading
+
+from Keywords.lazy_imports import lazy_module
+from Keywords.tracing import span
+from Keywords.asset_bundle import BUNDLE
+
+cv2 = lazy_module("cv2")
+np = lazy_module("numpy")
+
+
+MODES = ("template", "orb", "akaze")
+MIN_TEMPLATE_SIDE = 128     # small icons are upscaled so they yield enough keypoints
+RATIO = 0.75                # Lowe ratio test
+MIN_INLIERS = 8
+SCALE_RANGE = (0.25, 4.0)
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _detector(algo, nfeatures):
+    if algo == "orb":
+        return cv2.ORB_create(
+            nfeatures=nfeatures, scaleFactor=1.2, nlevels=8,
+            edgeThreshold=15, patchSize=15, fastThreshold=10
+        )
+    if algo == "akaze":
+        if not hasattr(cv2, "AKAZE_create"):
+            raise AssertionError("AKAZE is not available in this OpenCV build, use image_match_mode = orb")
+        return cv2.AKAZE_create()
+    raise AssertionError(f"Unknown image match mode '{algo}' (use {', '.join(MODES)})")
+
+
+def available(algo):
+    """False for algorithms the installed OpenCV build lacks (AKAZE in some wheels)."""
+    return algo == "orb" or (algo == "akaze" and hasattr(cv2, "AKAZE_create"))
+
+
+def features_path(image_path, algo):
+    """Descriptors are persisted next to the image: <image>.<algo>.npz"""
+    return f"{image_path}.{algo}.npz"
+
+
+def reference_features(image_path, algo):
+    """
+    (points, descriptors, (w, h)) of a reference image. Taken from the asset
+    bundle or the persisted .npz when they match the image, otherwise computed and saved.
+    """
+    source_mtime = os.stat(image_path).st_mtime_ns
+    key = (image_path, algo)
+    with _lock:
+        cached = _cache.get(key)
+    if cached and cached[0] == source_mtime:
+        return cached[1]
+
+    path = features_path(image_path, algo)
+    features = BUNDLE.features(image_path, algo)
+    if features is None and os.path.isfile(path):
+        with np.load(path) as data:
+            if int(data["source_mtime"]) == source_mtime:
+                features = (data["points"], data["descriptors"], tuple(data["size"]))
+
+    if features is None:
+        with span("features", image=os.path.basename(image_path), algo=algo):
+            features = compute_features(image_path, algo)
+        # Unique per process and thread: parallel shards may write the same file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f, points=features[0], descriptors=features[1],
+                size=np.array(features[2]), source_mtime=np.array(source_mtime)
+            )
+        os.replace(tmp_path, path)
+
+    with _lock:
+        _cache[key] = (source_mtime, features)
+    return features
+
+
+def compute_features(image_path, algo):
+    gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        raise AssertionError(f"Failed to load template image: {image_path}")
+    h, w = gray.shape[:2]
+
+    up = max(1.0, MIN_TEMPLATE_SIDE / min(h, w))
+    if up > 1.0:
+        gray = cv2.resize(gray, None, fx=up, fy=up, interpolation=cv2.INTER_CUBIC)
+
+    keypoints, descriptors = _detector(algo, 1000).detectAndCompute(gray, None)
+    points = np.float32([k.pt for k in keypoints]).reshape(-1, 2) / up
+    if descriptors is None:
+        descriptors = np.zeros((0, 32), np.uint8)
+    return points, descriptors, (w, h)
+
+
+def locate(screen_gray, image_path, algo="orb", min_inliers=MIN_INLIERS):
+    """
+    Finds the reference image in the screen by feature matching.
+    Returns (score, top_left, (w, h), found): score is the RANSAC inlier
+    ratio, the box is the projected reference outline in screen pixels.
+    """
+    points, ref_desc, (w, h) = reference_features(image_path, algo)
+
+    with span("features", image="screen", algo=algo):
+        keypoints, descriptors = _detector(algo, 5000).detectAndCompute(screen_gray, None)
+
+    not_found = (0.0, (0, 0), (w, h), False)
+    if descriptors is None or len(ref_desc) < 2 or len(descriptors) < 2:
+        return not_found
+
+    with span("match", algo=algo):
+        pairs = cv2.BFMatcher(cv2.NORM_HAMMING).knnMatch(ref_desc, descriptors, k=2)
+        good = [p[0] for p in pairs if len(p) == 2 and p[0].distance < RATIO * p[1].distance]
+    if len(good) < 3:
+        return not_found
+
+    src = points[[m.queryIdx for m in good]]
+    dst = np.float32([keypoints[m.trainIdx].pt for m in good])
+
+    # Similarity transform (scale + rotation + shift) as a constrained homography:
+    # far more robust than 8 DoF with the few matches small icons give
+    with span("homography", matches=len(good)):
+        affine, mask = cv2.estimateAffinePartial2D(
+            src, dst, method=cv2.RANSAC, ransacReprojThreshold=4.0
+        )
+    if affine is None:
+        return not_found
+
+    inliers = int(mask.sum())
+    scale = float(np.hypot(affine[0, 0], affine[1, 0]))
+    homography = np.vstack([affine, [0, 0, 1]])
+    corners = cv2.perspectiveTransform(
+        np.float32([[[0, 0]], [[w, 0]], [[w, h]], [[0, h]]]), homography
+    ).reshape(-1, 2)
+
+    x, y, box_w, box_h = cv2.boundingRect(corners.astype(np.int32))
+    found = inliers >= int(min_inliers) and SCALE_RANGE[0] <= scale <= SCALE_RANGE[1]
+    return inliers / len(good), (max(0, x), max(0, y)), (box_w, box_h), found
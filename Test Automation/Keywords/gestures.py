@@ -0,0 +1,114 @@
+import re
+
+
+TAP_HOLD_MS = 50
+
+# Step grammar (one step per entry, coordinates in px or % of the screen):
+#   tap X Y
+#   long_press X Y [MS]
+#   swipe X1 Y1 X2 Y2 [MS]
+#   multi X1,Y1>X2,Y2 X1,Y1>X2,Y2 ... [MS]     (one start>end pair per finger)
+#   pause MS
+STEP_ARGS = {
+    "tap": (2, 2),
+    "long_press": (2, 3),
+    "swipe": (4, 5),
+    "pause": (1, 1),
+}
+
+
+def split_steps(steps):
+    """Accepts a list or a `;` / newline separated string."""
+    if isinstance(steps, str):
+        steps = re.split(r"[;\n]", steps)
+    return [str(s).strip() for s in steps if str(s).strip()]
+
+
+def _coord(value, size):
+    value = value.strip()
+    if value.endswith("%"):
+        return int(size * float(value[:-1]) / 100.0)
+    return int(float(value))
+
+
+def needs_screen_size(steps):
+    return any("%" in step for step in split_steps(steps))
+
+
+def parse_steps(steps, screen_size=None):
+    """
+    Parses the step strings into dicts:
+    {"kind": tap|long_press|swipe|pause|multi, "fingers": [(x1, y1, x2, y2)], "ms": int}
+    """
+    width, height = screen_size or (0, 0)
+    parsed = []
+
+    for step in split_steps(steps):
+        kind, *args = step.split()
+        kind = kind.lower().replace("-", "_")
+
+        if kind == "multi":
+            pairs = [a for a in args if ">" in a]
+            rest = [a for a in args if ">" not in a]
+            if len(pairs) < 2 or len(rest) > 1:
+                raise AssertionError(f"Invalid gesture step '{step}' (multi needs 2+ X1,Y1>X2,Y2 pairs)")
+            fingers = []
+            for pair in pairs:
+                (x1, y1), (x2, y2) = (p.split(",") for p in pair.split(">"))
+                fingers.append((
+                    _coord(x1, width), _coord(y1, height), _coord(x2, width), _coord(y2, height)
+                ))
+            parsed.append({"kind": kind, "fingers": fingers, "ms": int(rest[0]) if rest else 400})
+            continue
+
+        if kind not in STEP_ARGS:
+            raise AssertionError(f"Unknown gesture step '{step}' (use tap, long_press, swipe, multi or pause)")
+        low, high = STEP_ARGS[kind]
+        if not low <= len(args) <= high:
+            raise AssertionError(f"Invalid gesture step '{step}'")
+
+        if kind == "pause":
+            parsed.append({"kind": kind, "fingers": [], "ms": int(args[0])})
+        elif kind == "tap":
+            x, y = _coord(args[0], width), _coord(args[1], height)
+            parsed.append({"kind": kind, "fingers": [(x, y, x, y)], "ms": TAP_HOLD_MS})
+        elif kind == "long_press":
+            x, y = _coord(args[0], width), _coord(args[1], height)
+            ms = int(args[2]) if len(args) > 2 else 1000
+            parsed.append({"kind": kind, "fingers": [(x, y, x, y)], "ms": ms})
+        else:
+            x1, x2 = _coord(args[0], width), _coord(args[2], width)
+            y1, y2 = _coord(args[1], height), _coord(args[3], height)
+            ms = int(args[4]) if len(args) > 4 else 300
+            parsed.append({"kind": kind, "fingers": [(x1, y1, x2, y2)], "ms": ms})
+
+    return parsed
+
+
+def adb_script(steps):
+    """
+    One device-side `input` script. Multi-finger steps are not possible
+    with `input`; timing between steps includes `input` start-up time.
+    """
+    commands = []
+    for step in steps:
+        if step["kind"] == "multi":
+            raise AssertionError("Multi-finger gesture steps need Appium (Perform Gesture in appium_keywords)")
+        if step["kind"] == "pause":
+            commands.append(f"sleep {step['ms'] / 1000.0:.3f}")
+            continue
+
+        x1, y1, x2, y2 = step["fingers"][0]
+        if step["kind"] == "tap":
+            commands.append(f"input tap {x1} {y1}")
+        else:
+            commands.append(f"input swipe {x1} {y1} {x2} {y2} {step['ms']}")
+    return "; ".join(commands)
+
+
+def describe(steps):
+    return " → ".join(
+        f"{s['kind']}({s['ms']}ms)" if s["kind"] == "pause"
+        else f"{s['kind']}{s['fingers'] if len(s['fingers']) > 1 else s['fingers'][0]}"
+        for s in steps
+    )
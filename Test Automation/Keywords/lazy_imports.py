@@ -0,0 +1,44 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access, so
+    `cv2 = lazy_module("cv2")` keeps every `cv2.xxx` call site unchanged
+    while library import (and robot --dryrun) does not pay for OpenCV.
+    Import errors (e.g. sounddevice without PortAudio) surface in the
+    keyword that first needs the module instead of failing the library.
+    """
+
+    def __init__(self, name, on_import=None):
+        self.__dict__["_name"] = name
+        self.__dict__["_on_import"] = on_import
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is not None:
+            return module
+        with self.__dict__["_lock"]:
+            if self.__dict__["_module"] is None:
+                module = importlib.import_module(self._name)
+                if self._on_import:
+                    self._on_import(module)
+                self.__dict__["_module"] = module
+        return self.__dict__["_module"]
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name, on_import=None):
+    return LazyModule(name, on_import)
@@ -0,0 +1,184 @@
+import os
+import json
+import atexit
+import threading
+
+from Keywords.lazy_imports import lazy_module
+from Keywords.tracing import span
+
+cv2 = lazy_module("cv2")
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PRIORS_DIR = os.path.join(PROJECT_ROOT, "Logs", "location_priors")
+STATS_JSON = "location_priors.json"
+
+
+class LocationPriors:
+    """
+    Per-DUT store of recent template match locations, keyed by template
+    and screen resolution (Logs/location_priors/<DUT>.json).
+
+    Matching first searches a small window around the known locations and
+    falls back to a full-screen search only when that misses the threshold.
+    Updates stay in memory and are written by flush() (listener close /
+    interpreter exit), never on the keyword's path.
+    """
+
+    def __init__(self, directory=PRIORS_DIR, max_locations=4, min_margin=16):
+        self.directory = directory
+        self.max_locations = max_locations
+        self.min_margin = min_margin
+
+        self._stores = {}
+        self._run = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # PUBLIC
+    # ------------------------------------------------------------------
+    def match(self, screen, template, image_name, dut_name, threshold,
+              method=None, mode="gray", use_priors=True):
+        """Returns (score, top_left) like cv2.minMaxLoc's max for `method` (default TM_CCOEFF_NORMED)."""
+        threshold = float(threshold)
+        method = cv2.TM_CCOEFF_NORMED if method is None else method
+        if not use_priors:
+            return self._full_search(screen, template, method, mode)
+
+        screen_h, screen_w = screen.shape[:2]
+        t_h, t_w = template.shape[:2]
+        key = f"{image_name}@{screen_w}x{screen_h}"
+        margin = max(self.min_margin, max(t_w, t_h) // 2)
+
+        for x, y in self._entry(dut_name, key)["locations"]:
+            x0, y0 = max(0, x - margin), max(0, y - margin)
+            x1, y1 = min(screen_w, x + t_w + margin), min(screen_h, y + t_h + margin)
+            if x1 - x0 < t_w or y1 - y0 < t_h:
+                continue
+
+            with span("matchTemplate", mode=f"{mode}/prior"):
+                result = cv2.matchTemplate(screen[y0:y1, x0:x1], template, method)
+                _, score, _, loc = cv2.minMaxLoc(result)
+
+            if score >= threshold:
+                top_left = (x0 + loc[0], y0 + loc[1])
+                self._record(dut_name, key, top_left, prior_hit=True)
+                return score, top_left
+
+        score, top_left = self._full_search(screen, template, method, mode)
+        self._record(dut_name, key, top_left if score >= threshold else None, prior_hit=False)
+        return score, top_left
+
+    def stats(self):
+        """Hit-rate rows for this run plus the stored lifetime counters."""
+        rows = []
+        with self._lock:
+            for (dut, key), run in sorted(self._run.items()):
+                entry = self._stores.get(dut, {}).get(key, {})
+                searches = run["prior_hits"] + run["full_searches"]
+                total = entry.get("prior_hits", 0) + entry.get("full_searches", 0)
+                rows.append({
+                    "dut": dut,
+                    "template": key,
+                    "searches": searches,
+                    "prior_hits": run["prior_hits"],
+                    "full_searches": run["full_searches"],
+                    "hit_rate": round(run["prior_hits"] / searches, 3) if searches else 0.0,
+                    "lifetime_hit_rate": round(entry.get("prior_hits", 0) / total, 3) if total else 0.0,
+                    "locations": entry.get("locations", []),
+                })
+        return rows
+
+    def flush(self):
+        """Writes the stores of every DUT updated since the last flush."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            for dut_name in dirty:
+                try:
+                    self._save(dut_name)
+                except OSError:
+                    self._dirty.add(dut_name)
+
+    def set_directory(self, directory):
+        """Writes pending updates, then keeps the priors in `directory` (e.g. a scratch folder)."""
+        self.flush()
+        with self._lock:
+            self.directory = directory
+            self._stores.clear()
+
+    def export_stats(self, output_dir):
+        self.flush()
+        rows = self.stats()
+        if not rows or not output_dir:
+            return None
+        path = os.path.join(output_dir, STATS_JSON)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        return path
+
+    # ------------------------------------------------------------------
+    # INTERNAL
+    # ------------------------------------------------------------------
+    def _full_search(self, screen, template, method, mode):
+        with span("matchTemplate", mode=mode):
+            result = cv2.matchTemplate(screen, template, method)
+            _, score, _, top_left = cv2.minMaxLoc(result)
+        return score, top_left
+
+    def _path(self, dut_name):
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(dut_name))
+        return os.path.join(self.directory, f"{safe}.json")
+
+    def _store(self, dut_name):
+        store = self._stores.get(dut_name)
+        if store is None:
+            store = {}
+            path = self._path(dut_name)
+            if os.path.isfile(path):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        store = json.load(f)
+                except (OSError, ValueError):
+                    store = {}
+            self._stores[dut_name] = store
+        return store
+
+    def _entry(self, dut_name, key):
+        with self._lock:
+            return self._store(dut_name).setdefault(
+                key, {"locations": [], "prior_hits": 0, "full_searches": 0}
+            )
+
+    def _record(self, dut_name, key, top_left, prior_hit):
+        counter = "prior_hits" if prior_hit else "full_searches"
+        with self._lock:
+            entry = self._store(dut_name)[key]
+            entry[counter] += 1
+
+            run = self._run.setdefault((dut_name, key), {"prior_hits": 0, "full_searches": 0})
+            run[counter] += 1
+
+            if top_left is not None:
+                x, y = int(top_left[0]), int(top_left[1])
+                # Most recent first, near-duplicates collapse into one
+                others = [
+                    loc for loc in entry["locations"]
+                    if abs(loc[0] - x) > 4 or abs(loc[1] - y) > 4
+                ]
+                entry["locations"] = ([[x, y]] + others)[:self.max_locations]
+
+            self._dirty.add(dut_name)
+
+    def _save(self, dut_name):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(dut_name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._stores[dut_name], f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+
+PRIORS = LocationPriors()
+# Runs without the listener still keep what they learned
+atexit.register(PRIORS.flush)
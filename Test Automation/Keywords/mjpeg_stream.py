@@ -0,0 +1,94 @@
+import time
+import threading
+import urllib.request
+
+from robot.api import logger
+
+
+SOI = b"\xff\xd8"
+EOI = b"\xff\xd9"
+
+
+class MjpegStream:
+    """
+    Reads an MJPEG stream (UiAutomator2 mjpegServer) on a background thread
+    and keeps only the latest JPEG frame; decoding is left to the caller.
+    """
+
+    def __init__(self, url, timeout=10, chunk_size=65536):
+        self.url = url
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+
+        self.frames = 0
+        self.error = None
+        self._jpeg = None
+        self._received = 0.0
+        self._cond = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"mjpeg-{self.url}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def latest_jpeg(self, max_age=0.5, wait=1.0):
+        """
+        Latest JPEG bytes no older than `max_age` seconds (None = any age),
+        waiting up to `wait` seconds for one. Returns None if there is none.
+        """
+        deadline = time.monotonic() + wait
+        with self._cond:
+            while True:
+                fresh = self._jpeg is not None and (
+                    max_age is None or time.monotonic() - self._received <= max_age
+                )
+                if fresh:
+                    return self._jpeg
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stopped.is_set():
+                    return None
+                self._cond.wait(remaining)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                with urllib.request.urlopen(self.url, timeout=self.timeout) as response:
+                    self._read_frames(response)
+            except Exception as e:
+                self.error = e
+                logger.debug(f"MJPEG stream {self.url} interrupted: {e}")
+            self._stopped.wait(0.5)
+
+    def _read_frames(self, response):
+        read = getattr(response, "read1", response.read)
+        buffer = b""
+        while not self._stopped.is_set():
+            chunk = read(self.chunk_size)
+            if not chunk:
+                return
+            buffer += chunk
+
+            # Keep only the newest complete frame in the buffer
+            end = buffer.rfind(EOI)
+            if end < 0:
+                continue
+            start = buffer.rfind(SOI, 0, end)
+            if start < 0:
+                buffer = buffer[end + 2:]
+                continue
+
+            jpeg = buffer[start:end + 2]
+            buffer = buffer[end + 2:]
+            with self._cond:
+                self._jpeg = jpeg
+                self._received = time.monotonic()
+                self.frames += 1
+                self._cond.notify_all()
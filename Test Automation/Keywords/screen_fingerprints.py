@@ -0,0 +1,159 @@
+import os
+import threading
+
+from Keywords.lazy_imports import lazy_module
+from Keywords.tracing import span
+from Keywords.asset_bundle import BUNDLE
+
+cv2 = lazy_module("cv2")
+np = lazy_module("numpy")
+
+
+HASH_BITS = 128            # 64-bit dHash + 64-bit pHash
+FULL_MATCH_THRESHOLD = 0.90
+DHASH_DEADZONE = 2         # gray levels
+
+# (path, mtime) → fingerprint, shared by every library instance of the run
+_references = {}
+_lock = threading.Lock()
+
+
+def _gray(image):
+    return image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def _pack(bits):
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def dhash(gray):
+    """
+    64-bit difference hash of a 9x8 downscale. Near-equal neighbours
+    (flat UI backgrounds) always give 0 so noise does not flip them.
+    """
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA).astype(np.int16)
+    return _pack(small[:, 1:] - small[:, :-1] > DHASH_DEADZONE)
+
+
+def phash(gray):
+    """64-bit perceptual hash: 8x8 low frequencies of a 32x32 DCT vs. their median."""
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8].ravel()
+    return _pack(low > np.median(low[1:]))
+
+
+def fingerprint(image):
+    gray = _gray(image)
+    return dhash(gray), phash(gray)
+
+
+def distance(a, b):
+    """Hamming distance between two fingerprints (0..128)."""
+    return bin(a[0] ^ b[0]).count("1") + bin(a[1] ^ b[1]).count("1")
+
+
+def full_match(screen, reference):
+    """Full-resolution TM_CCOEFF_NORMED score of the reference screen."""
+    screen_gray, ref_gray = _gray(screen), _gray(reference)
+    if ref_gray.shape != screen_gray.shape:
+        ref_gray = cv2.resize(ref_gray, (screen_gray.shape[1], screen_gray.shape[0]))
+    with span("matchTemplate", mode="screen"):
+        return float(cv2.matchTemplate(screen_gray, ref_gray, cv2.TM_CCOEFF_NORMED).max())
+
+
+class ScreenIndex:
+    """
+    Fingerprints of named reference screens (Resources/images/<name>.png),
+    computed once per file version. Screens are identified by Hamming
+    distance; only ambiguous cases fall back to full template matching.
+    """
+
+    def __init__(self, images_dir, references=(), tolerance=16):
+        self.images_dir = images_dir
+        self.references = [self._name(r) for r in references]
+        self.tolerance = int(tolerance)
+
+    def _name(self, name):
+        return os.path.splitext(name.strip())[0]
+
+    def _path(self, name):
+        name = self._name(name)
+        for ext in (".png", ".jpg", ".jpeg"):
+            path = os.path.join(self.images_dir, name + ext)
+            if os.path.isfile(path):
+                return path
+        raise AssertionError(f"Reference screen '{name}' not found in {self.images_dir}")
+
+    def reference(self, name):
+        path = self._path(name)
+        key = (path, os.path.getmtime(path))
+        with _lock:
+            if key in _references:
+                return _references[key]
+
+        with span("fingerprint", image=os.path.basename(path)):
+            image = BUNDLE.gray(path)
+            if image is None:
+                raise AssertionError(f"Failed to load reference screen: {path}")
+            entry = {"name": self._name(name), "path": path, "hash": fingerprint(image)}
+
+        with _lock:
+            _references[key] = entry
+        return entry
+
+    def verify(self, screen, name, tolerance=None):
+        """Returns (matched, distance, method)."""
+        tolerance = self.tolerance if tolerance is None else int(tolerance)
+        with span("fingerprint", image="screen"):
+            current = fingerprint(screen)
+        ref = self.reference(name)
+        dist = distance(current, ref["hash"])
+
+        if dist <= tolerance:
+            return True, dist, "hash"
+        if dist > 2 * tolerance:
+            return False, dist, "hash"
+
+        # Ambiguous band → confirm with a full match
+        score = full_match(screen, BUNDLE.color(ref["path"]))
+        return score >= FULL_MATCH_THRESHOLD, dist, f"full match ({score:.3f})"
+
+    def identify(self, screen, tolerance=None):
+        """
+        Returns (name or None, distance, ranked [(name, distance)]).
+        Several candidates within tolerance are separated by a full match.
+        """
+        tolerance = self.tolerance if tolerance is None else int(tolerance)
+        if not self.references:
+            raise AssertionError("No reference screens configured (screen_references in configurations.ini)")
+
+        with span("fingerprint", image="screen"):
+            current = fingerprint(screen)
+        ranked = sorted(
+            ((name, distance(current, self.reference(name)["hash"])) for name in self.references),
+            key=lambda item: item[1]
+        )
+
+        candidates = [(n, d) for n, d in ranked if d <= tolerance]
+        if not candidates:
+            return None, ranked[0][1], ranked
+        if len(candidates) == 1:
+            return candidates[0][0], candidates[0][1], ranked
+
+        scores = {n: full_match(screen, BUNDLE.color(self.reference(n)["path"])) for n, _ in candidates}
+        best = max(scores, key=scores.get)
+        return best, dict(candidates)[best], ranked
+
+
+def index_from_config(config, project_root):
+    """ScreenIndex over Resources/images with screen_references / screen_hash_tolerance."""
+    references = config.get("DEFAULT", "screen_references", fallback="")
+    return ScreenIndex(
+        os.path.join(project_root, "Resources", "images"),
+        references=[r for r in references.split(",") if r.strip()],
+        tolerance=config.getint("DEFAULT", "screen_hash_tolerance", fallback=16),
+    )
+
+
+def log_message(dut_name, screen_name, dist, method):
+    return f"🖼️ {dut_name}: '{screen_name}' distance={dist}/{HASH_BITS} via {method}"
@@ -0,0 +1,83 @@
+import re
+import html
+import uuid
+
+
+def parse_commands(commands):
+    """Accepts a list or a newline separated string, drops empty lines."""
+    if isinstance(commands, str):
+        commands = commands.splitlines()
+    return [str(c).strip() for c in commands if str(c).strip()]
+
+
+def new_token():
+    return f"__BATCH_{uuid.uuid4().hex[:12]}__"
+
+
+def build_script(commands, token):
+    """
+    One device-side sh script; every command's output (stdout + stderr)
+    sits between begin / end markers, the end marker carries its exit code.
+    """
+    lines = []
+    for i, command in enumerate(commands):
+        lines.append(f"echo '{token} B {i}'")
+        lines.append(f"{{ {command}\n}} 2>&1")
+        lines.append(f"echo \"{token} E {i} $?\"")
+    return "\n".join(lines)
+
+
+def parse_output(output, token, commands):
+    """
+    Returns [{'command', 'stdout', 'rc'}]; commands without an end marker get
+    rc None. The first of them (e.g. an `exit` that ended the script) keeps
+    whatever it printed after its begin marker.
+    """
+    found = {}
+    pattern = re.compile(
+        rf"{re.escape(token)} B (\d+)\r?\n(.*?){re.escape(token)} E \1 (-?\d+)", re.S
+    )
+    for match in pattern.finditer(output):
+        found[int(match.group(1))] = (match.group(2).strip(), int(match.group(3)))
+
+    unfinished = next((i for i in range(len(commands)) if i not in found), None)
+    if unfinished is not None:
+        begin = re.search(rf"{re.escape(token)} B {unfinished}\r?\n", output)
+        if begin:
+            rest = output[begin.end():]
+            # Stop at a later marker, if the device printed one anyway
+            rest = rest.split(token, 1)[0]
+            found[unfinished] = (rest.strip(), None)
+
+    results = []
+    for i, command in enumerate(commands):
+        stdout, rc = found.get(i, ("", None))
+        results.append({"command": command, "stdout": stdout, "rc": rc})
+    return results
+
+
+def results_html(dut_name, results):
+    rows = ""
+    for r in results:
+        color = "#e6ffed" if r["rc"] == 0 else "#ffe6e6"
+        rows += (
+            f"<tr style='background:{color}'><td>{html.escape(r['command'])}</td>"
+            f"<td>{r['rc']}</td><td><pre>{html.escape(r['stdout'])}</pre></td></tr>"
+        )
+    return (
+        f"<b>📦 {len(results)} command(s) on {dut_name} in one round trip</b>"
+        "<table border='1' cellpadding='4' cellspacing='0' style='border-collapse:collapse'>"
+        "<tr><th>Command</th><th>Exit code</th><th>Output</th></tr>"
+        f"{rows}</table>"
+    )
+
+
+def check(results, fail_on_error=True):
+    """Raises AssertionError listing the failed commands (unless disabled)."""
+    failed = [r for r in results if r["rc"] != 0]
+    if failed and fail_on_error:
+        raise AssertionError(
+            f"{len(failed)}/{len(results)} batched command(s) failed: "
+            + "; ".join(f"'{r['command']}' (rc={r['rc']}): {r['stdout']}" for r in failed)
+        )
+    return results
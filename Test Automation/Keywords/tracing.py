@@ -0,0 +1,128 @@
+import os
+import json
+import time
+import threading
+
+
+class _NoopSpan:
+    """Returned by span() while tracing is disabled. Does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        add_complete(self.name, self.start, time.perf_counter_ns(), self.cat, self.args)
+        return False
+
+
+class _Trace:
+    def __init__(self):
+        self.enabled = False
+        self.name = None
+        self.origin_ns = 0
+        self.events = []
+        self.lock = threading.Lock()
+
+
+_trace = _Trace()
+
+
+def is_enabled():
+    return _trace.enabled
+
+
+def start_trace(name):
+    """
+    Starts collecting spans for one trace (normally one test).
+    Spans recorded before this call or after export_trace() are dropped.
+    """
+    with _trace.lock:
+        _trace.name = name
+        _trace.origin_ns = time.perf_counter_ns()
+        _trace.events = []
+        _trace.enabled = True
+
+
+def span(name, cat="keyword", **args):
+    """
+    Context manager timing one stage of a keyword:
+
+        with span("matchTemplate", template=image_name):
+            result = cv2.matchTemplate(...)
+
+    Costs a single attribute check when tracing is disabled.
+    """
+    if not _trace.enabled:
+        return _NOOP
+    return _Span(name, cat, args)
+
+
+def add_complete(name, start_ns, end_ns, cat="keyword", args=None):
+    """Records a finished span given perf_counter_ns() start/end values."""
+    if not _trace.enabled:
+        return
+    event = {
+        "name": name,
+        "cat": cat,
+        "ph": "X",
+        "ts": (start_ns - _trace.origin_ns) / 1000.0,
+        "dur": (end_ns - start_ns) / 1000.0,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+    }
+    if args:
+        event["args"] = {k: str(v) for k, v in args.items()}
+    with _trace.lock:
+        _trace.events.append(event)
+
+
+def stop_trace():
+    """Stops tracing and returns the recorded events (Chrome trace dicts)."""
+    with _trace.lock:
+        events = _trace.events
+        _trace.events = []
+        _trace.enabled = False
+    return events
+
+
+def export_trace(path):
+    """
+    Writes the collected spans as Chrome / Perfetto trace JSON
+    (open with chrome://tracing or ui.perfetto.dev) and stops tracing.
+    Returns the path, or None when nothing was recorded.
+    """
+    name = _trace.name
+    events = stop_trace()
+
+    if not events:
+        return None
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"test": name},
+        }, f)
+    return path
@@ -0,0 +1,97 @@
+import re
+import xml.etree.ElementTree as ET
+
+
+BOUNDS_RE = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+# Locator strategies → page source attribute
+ATTRIBUTES = {
+    "text": "text",
+    "desc": "content-desc",
+    "id": "resource-id",
+}
+
+
+class UiElement:
+    """One node of the page source with its bounds."""
+
+    def __init__(self, attrib):
+        self.text = (attrib.get("text") or "").strip()
+        self.desc = (attrib.get("content-desc") or "").strip()
+        self.resource_id = attrib.get("resource-id") or ""
+        self.class_name = attrib.get("class") or ""
+        self.displayed = attrib.get("displayed", "true") != "false"
+        self.clickable = attrib.get("clickable") == "true"
+
+        match = BOUNDS_RE.search(attrib.get("bounds", ""))
+        self.bounds = tuple(int(v) for v in match.groups()) if match else None
+
+    @property
+    def center(self):
+        x1, y1, x2, y2 = self.bounds
+        return (x1 + x2) // 2, (y1 + y2) // 2
+
+    def __repr__(self):
+        label = self.text or self.desc or self.resource_id or self.class_name
+        return f"<UiElement '{label}' {self.bounds}>"
+
+
+class UiIndex:
+    """
+    Local index over one page source snapshot (Appium or uiautomator dump):
+    elements by text, content-desc and resource-id, so lookups need no
+    further requests to the device.
+    """
+
+    def __init__(self, xml):
+        self.elements = []
+        self.by_text = {}
+        self.by_desc = {}
+        self.by_id = {}
+
+        root = ET.fromstring(xml.encode("utf-8") if isinstance(xml, str) else xml)
+        for node in root.iter():
+            if "bounds" not in node.attrib:
+                continue
+            element = UiElement(node.attrib)
+            if element.bounds is None:
+                continue
+
+            self.elements.append(element)
+            if element.text:
+                self.by_text.setdefault(element.text, []).append(element)
+            if element.desc:
+                self.by_desc.setdefault(element.desc, []).append(element)
+            if element.resource_id:
+                self.by_id.setdefault(element.resource_id, []).append(element)
+
+    def visible_texts(self):
+        return [e.text for e in self.elements if e.text and e.displayed]
+
+    def find(self, locator, by="text"):
+        """
+        Returns the displayed elements matching `locator` exactly.
+        `by` is text, desc, id or any (text, then desc, then id).
+        """
+        by = by.strip().lower()
+        if by == "any":
+            for strategy in ATTRIBUTES:
+                found = self.find(locator, strategy)
+                if found:
+                    return found
+            return []
+
+        if by not in ATTRIBUTES:
+            raise AssertionError(f"Unknown locator strategy '{by}' (use text, desc, id or any)")
+
+        index = {"text": self.by_text, "desc": self.by_desc, "id": self.by_id}[by]
+        matches = index.get(locator, [])
+
+        # Short resource ids ('title') match 'com.android.settings:id/title'
+        if by == "id" and not matches and ":" not in locator:
+            matches = [
+                e for rid, elements in self.by_id.items()
+                if rid.endswith(f":id/{locator}") for e in elements
+            ]
+
+        return [e for e in matches if e.displayed]
@@ -0,0 +1,50 @@
+"""
+Compiles Resources/images into the memory-mapped asset bundle
+(Resources/bundle) read by the vision keywords, see Keywords/asset_bundle.py.
+
+Re-run after adding or changing reference images; images changed since the
+last build are decoded from their PNG until then.
+
+Usage (from the project root):
+    python -m Tools.build_asset_bundle
+    python -m Tools.build_asset_bundle --descriptors orb,akaze
+    python -m Tools.build_asset_bundle --check
+"""
+
+import sys
+import time
+import argparse
+
+from Keywords.asset_bundle import IMAGES_DIR, BUNDLE_DIR, AssetBundle, build
+from Keywords import feature_matching
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the reference image asset bundle")
+    parser.add_argument("--images", default=IMAGES_DIR, help="source image folder")
+    parser.add_argument("--output", default=BUNDLE_DIR, help="bundle folder")
+    parser.add_argument("--descriptors", default="", help="comma separated feature algorithms (orb, akaze)")
+    parser.add_argument("--check", action="store_true", help="only report stale images, exit 1 if any")
+    args = parser.parse_args()
+
+    if args.check:
+        stale = AssetBundle(args.output).stale(args.images)
+        for name in stale:
+            print(f"⚠️ stale: {name}")
+        print(f"{len(stale)} stale image(s) in {args.output}")
+        sys.exit(1 if stale else 0)
+
+    start = time.perf_counter()
+    descriptors = [d.strip().lower() for d in args.descriptors.split(",") if d.strip()]
+    for algo in [d for d in descriptors if not feature_matching.available(d)]:
+        print(f"⚠️ {algo} is not available in this OpenCV build, skipping its descriptors")
+        descriptors.remove(algo)
+    index = build(args.images, args.output, descriptors)
+    print(
+        f"📦 {len(index['assets'])} image(s) → {args.output} "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
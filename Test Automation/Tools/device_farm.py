@@ -0,0 +1,218 @@
+"""
+Device-farm runner: shards TestSuite/*.robot across every [DUT.*] device
+from configurations.ini and runs one Robot process per leased device.
+
+- A lease table hands out free DUTs; a suite only starts once a DUT is free.
+- Suites are started longest-first using durations measured by earlier
+  farm runs (Logs/farm_history.json), so long suites don't end up last.
+- Each process gets its DUT through --variable DUT:<name> / DUTS:<name>.
+- Shard outputs are merged with rebot into Logs/Farm_<timestamp>/.
+
+Usage (from the project root):
+    python -m Tools.device_farm
+    python -m Tools.device_farm --duts Phone,Main TestSuite/test02.robot TestSuite/test03.robot
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+import threading
+import subprocess
+import configparser
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from robot import rebot
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CONFIG_PATH = os.path.join(PROJECT_ROOT, "Configurations", "configurations.ini")
+LOGS_DIR = os.path.join(PROJECT_ROOT, "Logs")
+HISTORY_PATH = os.path.join(LOGS_DIR, "farm_history.json")
+LISTENER = "Configurations.auto_screen_record_listener.AutoScreenRecordingListener"
+
+# Weight of the newest measurement in the moving average
+HISTORY_ALPHA = 0.5
+
+_print_lock = threading.Lock()
+
+
+def log(message):
+    with _print_lock:
+        print(message, flush=True)
+
+
+class LeaseTable:
+    """Tracks which DUTs are free or busy; acquire() blocks until one is free."""
+
+    def __init__(self, duts):
+        self.free = list(duts)
+        self.busy = {}
+        self.cond = threading.Condition()
+
+    def acquire(self, job):
+        with self.cond:
+            while not self.free:
+                self.cond.wait()
+            dut = self.free.pop(0)
+            self.busy[dut] = job
+            return dut
+
+    def release(self, dut):
+        with self.cond:
+            self.busy.pop(dut, None)
+            self.free.append(dut)
+            self.cond.notify()
+
+
+def configured_duts():
+    config = configparser.ConfigParser()
+    config.read(CONFIG_PATH)
+    return [s.split(".", 1)[1] for s in config.sections() if s.startswith("DUT.")]
+
+
+def load_history():
+    if not os.path.isfile(HISTORY_PATH):
+        return {}
+    with open(HISTORY_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_history(history, measured):
+    for suite, seconds in measured.items():
+        old = history.get(suite)
+        history[suite] = round(
+            seconds if old is None else HISTORY_ALPHA * seconds + (1 - HISTORY_ALPHA) * old, 3
+        )
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    with open(HISTORY_PATH, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+
+
+def schedule(suites, history):
+    """
+    Longest-processing-time-first order. Suites never run before are
+    assumed to be as long as the longest known suite so they start early.
+    """
+    longest = max(history.values(), default=0.0)
+    return sorted(suites, key=lambda s: history.get(s, longest), reverse=True)
+
+
+def run_shard(suite, leases, run_dir, extra_args):
+    dut = leases.acquire(suite)
+    name = os.path.splitext(os.path.basename(suite))[0]
+    shard_dir = os.path.join(run_dir, f"{dut}_{name}")
+    os.makedirs(shard_dir, exist_ok=True)
+
+    cmd = [
+        sys.executable, "-m", "robot",
+        "--variable", f"DUT:{dut}",
+        "--variable", f"DUTS:{dut}",
+        "--variable", f"FARM_OUTPUT_DIR:{run_dir}",
+        "--listener", LISTENER,
+        "--outputdir", shard_dir,
+        "--output", "output.xml",
+        "--log", "NONE",
+        "--report", "NONE",
+        *extra_args,
+        os.path.join(PROJECT_ROOT, suite),
+    ]
+    env = dict(os.environ)
+    env["PYTHONPATH"] = PROJECT_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+
+    log(f"▶ {suite} → {dut}")
+    start = time.perf_counter()
+    try:
+        with open(os.path.join(shard_dir, "console.log"), "w", encoding="utf-8") as console:
+            rc = subprocess.run(
+                cmd, cwd=PROJECT_ROOT, env=env, stdout=console, stderr=subprocess.STDOUT
+            ).returncode
+    finally:
+        leases.release(dut)
+
+    elapsed = time.perf_counter() - start
+    log(f"{'✔' if rc == 0 else '✘'} {suite} on {dut} | rc={rc} | {elapsed:.1f}s")
+    return {
+        "suite": suite,
+        "dut": dut,
+        "rc": rc,
+        "seconds": elapsed,
+        "output": os.path.join(shard_dir, "output.xml"),
+    }
+
+
+def merge_summaries(run_dir, shards):
+    """Concatenates the per-shard execution summaries into the run folder."""
+    for name in ("execution_summary.jsonl", "execution_summary.csv"):
+        header_written = False
+        with open(os.path.join(run_dir, name), "w", encoding="utf-8", newline="") as out:
+            for shard in shards:
+                path = os.path.join(os.path.dirname(shard["output"]), name)
+                if not os.path.isfile(path):
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    lines = f.readlines()
+                if name.endswith(".csv") and lines:
+                    if header_written:
+                        lines = lines[1:]
+                    header_written = True
+                out.writelines(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run suites in parallel across all configured DUTs")
+    parser.add_argument("suites", nargs="*", help="suite files (default: TestSuite/*.robot)")
+    parser.add_argument("--duts", help="comma separated DUT names (default: every [DUT.*] section)")
+    parser.add_argument("--robot-arg", action="append", default=[], help="extra argument passed to every robot process")
+    args = parser.parse_args()
+
+    os.chdir(PROJECT_ROOT)
+    suites = args.suites or sorted(
+        os.path.relpath(p, PROJECT_ROOT).replace("\\", "/")
+        for p in glob.glob(os.path.join(PROJECT_ROOT, "TestSuite", "*.robot"))
+    )
+    duts = [d.strip() for d in args.duts.split(",")] if args.duts else configured_duts()
+    if not duts:
+        raise SystemExit("No [DUT.*] sections found in configurations.ini")
+
+    history = load_history()
+    ordered = schedule(suites, history)
+    run_dir = os.path.join(LOGS_DIR, f"Farm_{datetime.now().strftime('%d-%m-%Y-%H-%M-%S')}")
+    os.makedirs(run_dir, exist_ok=True)
+
+    print(f"🧪 {len(ordered)} suite(s) on {len(duts)} DUT(s): {', '.join(duts)}")
+    leases = LeaseTable(duts)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(duts)) as pool:
+        shards = list(pool.map(lambda s: run_shard(s, leases, run_dir, args.robot_arg), ordered))
+    wall = time.perf_counter() - start
+
+    save_history(history, {s["suite"]: s["seconds"] for s in shards})
+    merge_summaries(run_dir, shards)
+
+    outputs = [s["output"] for s in shards if os.path.isfile(s["output"])]
+    rc = max((s["rc"] for s in shards), default=0)
+    if outputs:
+        rebot(
+            *outputs,
+            name="Device Farm",
+            outputdir=run_dir,
+            output="output.xml",
+            log="log.html",
+            report="report.html",
+            stdout=sys.stdout,
+        )
+
+    serial = sum(s["seconds"] for s in shards)
+    print(
+        f"\n⏱️ Wall {wall:.1f}s vs {serial:.1f}s serial "
+        f"(speed-up x{serial / wall if wall else 0:.2f}) → {run_dir}"
+    )
+    sys.exit(min(rc, 250))
+
+
+if __name__ == "__main__":
+    main()
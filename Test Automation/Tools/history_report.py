@@ -0,0 +1,111 @@
+"""
+Queries the cross-run results history the listener writes to
+Logs/results_history.sqlite (enable_results_history = Yes).
+
+    flaky       tests that both passed and failed, by status flip rate
+    durations   p50 / p90 / p95 / max test duration per test and DUT
+    keywords    slowest keywords by mean call duration
+    runs        most recent runs with their totals
+
+Usage (from the project root):
+    python -m Tools.history_report
+    python -m Tools.history_report flaky --days 14 --min-runs 5
+    python -m Tools.history_report durations --test "*Settings*" --dut Phone
+    python -m Tools.history_report keywords --top 30 --json Logs/slow_keywords.json
+"""
+
+import os
+import json
+import argparse
+from datetime import datetime
+
+from Configurations.results_history import ResultsHistory, DEFAULT_DB
+
+
+def _time(epoch):
+    return datetime.fromtimestamp(epoch).strftime("%Y-%m-%d %H:%M") if epoch else "—"
+
+
+def print_flaky(rows):
+    print(f"\n🎲 Flaky tests: {len(rows)}")
+    for r in rows:
+        print(
+            f"  {r['test'][:60]:60} {r['dut'] or '—':12} runs {r['runs']:4}  "
+            f"fail {r['fail_rate']:6.1%}  flips {r['flip_rate']:6.1%}"
+        )
+
+
+def print_durations(rows):
+    print(f"\n⏱️ Test durations (s): {len(rows)}")
+    print(f"  {'test':60} {'dut':12} {'runs':>4} {'p50':>8} {'p90':>8} {'p95':>8} {'max':>8}")
+    for r in rows:
+        print(
+            f"  {r['test'][:60]:60} {r['dut'] or '—':12} {r['runs']:4} "
+            f"{r['p50']:8.2f} {r['p90']:8.2f} {r['p95']:8.2f} {r['max']:8.2f}"
+        )
+
+
+def print_keywords(rows):
+    print(f"\n🐢 Slowest keywords (s): {len(rows)}")
+    for r in rows:
+        name = f"{r['library']}.{r['keyword']}" if r["library"] else r["keyword"]
+        print(
+            f"  {name[:60]:60} calls {r['calls']:6}  fail {r['failures']:4}  "
+            f"mean {r['mean']:7.3f}  max {r['max']:7.3f}"
+        )
+
+
+def print_runs(rows):
+    print(f"\n📋 Recent runs: {len(rows)}")
+    for r in rows:
+        print(
+            f"  #{r['id']:<5} {_time(r['started'])} → {_time(r['finished'])}  "
+            f"✅ {r['passed']} | ❌ {r['failed']} | ⚠️ {r['skipped']}  {r['host'] or ''}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the cross-run results history")
+    parser.add_argument(
+        "report", nargs="?", default="all", choices=["all", "flaky", "durations", "keywords", "runs"]
+    )
+    parser.add_argument("--db", default=DEFAULT_DB, help="results history database")
+    parser.add_argument("--days", type=float, default=30, help="only runs from the last N days")
+    parser.add_argument("--test", help="test (or keyword) name, SQL LIKE pattern; * works as %%")
+    parser.add_argument("--dut", help="only this DUT")
+    parser.add_argument("--min-runs", type=int, default=3, help="minimum runs for the flaky report")
+    parser.add_argument("--top", type=int, default=20, help="rows per report")
+    parser.add_argument("--json", help="also write the reports to this JSON file")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.db):
+        print(f"❌ No results history at {args.db}")
+        return
+
+    history = ResultsHistory(args.db)
+    pattern = args.test.replace("*", "%") if args.test else None
+    wanted = lambda name: args.report in ("all", name)
+    reports = {}
+
+    if wanted("runs"):
+        reports["runs"] = history.recent_runs(args.top)
+        print_runs(reports["runs"])
+    if wanted("flaky"):
+        reports["flaky"] = history.flakiness(args.days, args.min_runs, pattern, args.dut, args.top)
+        print_flaky(reports["flaky"])
+    if wanted("durations"):
+        reports["durations"] = history.duration_percentiles(args.days, pattern, args.dut, args.top)
+        print_durations(reports["durations"])
+    if wanted("keywords"):
+        reports["keywords"] = history.slowest_keywords(args.days, pattern, args.dut, args.top)
+        print_keywords(reports["keywords"])
+    history.close()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+        print(f"\nReports written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Trend report over many Robot runs: scans Logs/Report_*/output.xml, streams
+every file with iterparse (elements are cleared as soon as they are read,
+so memory stays flat on very large outputs) and parses the runs in a
+process pool.
+
+For every test and every keyword it compares the median duration of the
+recent runs (last --recent-days, relative to the newest run) with the
+older runs and lists what got slower, plus pass rates and last status.
+
+Usage (from the project root):
+    python -m Tools.results_trend
+    python -m Tools.results_trend --recent-days 7 --top 20 --output Logs/results_trend.json
+    python -m Tools.results_trend --pattern "Farm_*" --workers 8
+"""
+
+import os
+import json
+import glob
+import argparse
+import statistics
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LOGS_DIR = os.path.join(PROJECT_ROOT, "Logs")
+DEFAULT_OUTPUT = os.path.join(LOGS_DIR, "results_trend.json")
+
+# Slower than this ratio (recent / baseline median) is reported
+SLOWDOWN_RATIO = 1.2
+RF6_TIME = "%Y%m%d %H:%M:%S.%f"
+
+
+def _status_times(status):
+    """(start datetime or None, elapsed seconds) for RF 7 and RF 6 <status> elements."""
+    if "elapsed" in status.attrib:
+        start = status.get("start")
+        return (datetime.fromisoformat(start) if start else None), float(status.get("elapsed"))
+
+    start, end = status.get("starttime"), status.get("endtime")
+    if not start or start == "N/A":
+        return None, 0.0
+    start = datetime.strptime(start, RF6_TIME)
+    if not end or end == "N/A":
+        return start, 0.0
+    return start, (datetime.strptime(end, RF6_TIME) - start).total_seconds()
+
+
+def parse_output(path):
+    """
+    Streams one output.xml. Returns
+    {"run", "path", "start", "tests": [{"name", "status", "elapsed"}],
+     "keywords": {name: {"count", "total", "max", "fail"}}}
+    """
+    suites = []
+    stack = []
+    tests = []
+    keywords = {}
+    run_start = None
+
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        tag = elem.tag
+
+        if event == "start":
+            if tag in ("suite", "test", "kw"):
+                stack.append(elem)
+                if tag == "suite":
+                    suites.append(elem.get("name", ""))
+            continue
+
+        if tag == "status" and stack and elem in list(stack[-1]):
+            owner = stack[-1]
+            start, elapsed = _status_times(elem)
+            status = elem.get("status")
+
+            if owner.tag == "test":
+                tests.append({
+                    "name": ".".join(suites + [owner.get("name", "")]),
+                    "status": status,
+                    "elapsed": round(elapsed, 3),
+                })
+            elif owner.tag == "kw":
+                library = owner.get("owner") or owner.get("library")
+                name = f"{library}.{owner.get('name')}" if library else owner.get("name", "")
+                stats = keywords.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0, "fail": 0})
+                stats["count"] += 1
+                stats["total"] += elapsed
+                stats["max"] = max(stats["max"], elapsed)
+                stats["fail"] += status == "FAIL"
+            elif owner.tag == "suite" and len(suites) == 1 and start:
+                run_start = start
+
+        elif tag in ("suite", "test", "kw"):
+            stack.pop()
+            if tag == "suite":
+                suites.pop()
+            elem.clear()
+            # Detach from the parent too, or every cleared element stays in the tree
+            if stack and elem in list(stack[-1]):
+                stack[-1].remove(elem)
+
+        elif tag in ("msg", "arg", "doc", "tag", "var", "value", "statistics", "errors"):
+            elem.clear()
+
+    for stats in keywords.values():
+        stats["total"] = round(stats["total"], 3)
+        stats["max"] = round(stats["max"], 3)
+
+    if run_start is None:
+        run_start = datetime.fromtimestamp(os.path.getmtime(path))
+
+    return {
+        "run": os.path.basename(os.path.dirname(path)),
+        "path": path,
+        "start": run_start.isoformat(timespec="seconds"),
+        "tests": tests,
+        "keywords": keywords,
+    }
+
+
+def _safe_parse(path):
+    try:
+        return parse_output(path)
+    except (ET.ParseError, OSError, ValueError) as e:
+        return {"run": os.path.basename(os.path.dirname(path)), "path": path, "error": str(e)}
+
+
+def scan(logs_dir=LOGS_DIR, pattern="Report_*", workers=None):
+    """Parses every <logs_dir>/<pattern>/output.xml in parallel, oldest run first."""
+    paths = sorted(glob.glob(os.path.join(logs_dir, pattern, "output.xml")))
+    if not paths:
+        return [], []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parsed = list(pool.map(_safe_parse, paths, chunksize=4))
+
+    runs = sorted((r for r in parsed if "error" not in r), key=lambda r: r["start"])
+    errors = [r for r in parsed if "error" in r]
+    return runs, errors
+
+
+def _trend(samples, cutoff):
+    """samples: [(start, seconds)] → recent / baseline medians and their ratio."""
+    recent = [s for t, s in samples if t >= cutoff]
+    baseline = [s for t, s in samples if t < cutoff]
+    row = {
+        "recent_median_s": round(statistics.median(recent), 3) if recent else None,
+        "baseline_median_s": round(statistics.median(baseline), 3) if baseline else None,
+        "ratio": None,
+    }
+    if recent and baseline and row["baseline_median_s"]:
+        row["ratio"] = round(row["recent_median_s"] / row["baseline_median_s"], 2)
+    return row
+
+
+def aggregate(runs, recent_days=7):
+    """Per-test and per-keyword trend rows over all parsed runs."""
+    if not runs:
+        return {"runs": 0, "tests": [], "keywords": []}
+
+    newest = datetime.fromisoformat(runs[-1]["start"])
+    cutoff = (newest - timedelta(days=recent_days)).isoformat(timespec="seconds")
+
+    tests = {}
+    keywords = {}
+    for run in runs:
+        for test in run["tests"]:
+            entry = tests.setdefault(test["name"], {"samples": [], "statuses": []})
+            entry["samples"].append((run["start"], test["elapsed"]))
+            entry["statuses"].append(test["status"])
+        for name, stats in run["keywords"].items():
+            entry = keywords.setdefault(name, {"samples": [], "calls": 0, "fail": 0, "max": 0.0})
+            entry["samples"].append((run["start"], stats["total"] / stats["count"]))
+            entry["calls"] += stats["count"]
+            entry["fail"] += stats["fail"]
+            entry["max"] = max(entry["max"], stats["max"])
+
+    test_rows = []
+    for name, entry in tests.items():
+        statuses = entry["statuses"]
+        row = {
+            "test": name,
+            "runs": len(statuses),
+            "pass_rate": round(statuses.count("PASS") / len(statuses), 3),
+            "last_status": statuses[-1],
+        }
+        row.update(_trend(entry["samples"], cutoff))
+        test_rows.append(row)
+
+    keyword_rows = []
+    for name, entry in keywords.items():
+        row = {
+            "keyword": name,
+            "runs": len(entry["samples"]),
+            "calls": entry["calls"],
+            "fail": entry["fail"],
+            "max_s": round(entry["max"], 3),
+        }
+        row.update(_trend(entry["samples"], cutoff))
+        keyword_rows.append(row)
+
+    by_ratio = lambda r: (r["ratio"] is not None, r["ratio"] or 0.0)
+    return {
+        "runs": len(runs),
+        "first_run": runs[0]["start"],
+        "last_run": runs[-1]["start"],
+        "recent_since": cutoff,
+        "tests": sorted(test_rows, key=by_ratio, reverse=True),
+        "keywords": sorted(keyword_rows, key=by_ratio, reverse=True),
+    }
+
+
+def print_report(report, top):
+    print(
+        f"📊 {report['runs']} run(s) {report.get('first_run', '')} → {report.get('last_run', '')}, "
+        f"recent since {report.get('recent_since', '')}"
+    )
+    for kind, key in (("tests", "test"), ("keywords", "keyword")):
+        slower = [r for r in report[kind] if r["ratio"] and r["ratio"] >= SLOWDOWN_RATIO][:top]
+        print(f"\n🐢 Slower {kind} (recent vs. baseline median, x{SLOWDOWN_RATIO}+): {len(slower)}")
+        for r in slower:
+            print(
+                f"  {r[key][:70]:70} {r['baseline_median_s']:8.3f}s → {r['recent_median_s']:8.3f}s "
+                f"x{r['ratio']:.2f}"
+            )
+
+    flaky = [r for r in report["tests"] if 0 < r["pass_rate"] < 1][:top]
+    if flaky:
+        print(f"\n⚠️ Unstable tests: {len(flaky)}")
+        for r in flaky:
+            print(f"  {r['test'][:70]:70} pass rate {r['pass_rate']:.0%} (last {r['last_status']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate timings and statuses over many Robot runs")
+    parser.add_argument("--logs", default=LOGS_DIR, help="folder holding the run folders")
+    parser.add_argument("--pattern", default="Report_*", help="run folder glob inside --logs")
+    parser.add_argument("--recent-days", type=float, default=7, help="window compared against older runs")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument("--top", type=int, default=15, help="rows printed per section")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="trend report JSON")
+    args = parser.parse_args()
+
+    runs, errors = scan(args.logs, args.pattern, args.workers)
+    for e in errors:
+        print(f"⚠️ Skipped {e['path']}: {e['error']}")
+
+    report = aggregate(runs, args.recent_days)
+    print_report(report, args.top)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nTrend report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+@echo off
+set PYTHONPATH=%CD%
+
+if not exist Logs mkdir Logs
+
+rem Reference images (and orb / akaze descriptors) to the memory-mapped asset bundle,
+rem only changed images are rebuilt
+python -m Tools.build_asset_bundle --descriptors orb,akaze
+
+python -m Tools.device_farm %*
+
+pause
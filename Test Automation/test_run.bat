@@ -7,6 +7,10 @@ for /f "tokens=1-5 delims=:/ " %%d in ("%date% %time%") do (
 
 if not exist Logs mkdir Logs
 
+rem Reference images (and orb / akaze descriptors) to the memory-mapped asset bundle,
+rem only changed images are rebuilt
+python -m Tools.build_asset_bundle --descriptors orb,akaze
+
 robot ^
 --listener Configurations.auto_screen_record_listener.AutoScreenRecordingListener ^
 --outputdir Logs\Report_%timestamp% ^